@@ -34,6 +34,20 @@ subroutine f90wrap_destroy(this)
     deallocate(this_ptr%p)
 end subroutine f90wrap_destroy
 
+subroutine f90wrap_set_num_threads(this, num_threads_)
+    use cd06stuff, only: set_num_threads, cd06
+    implicit none
+    
+    type cd06_ptr_type
+        type(cd06), pointer :: p => NULL()
+    end type cd06_ptr_type
+    type(cd06_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    integer, intent(in) :: num_threads_
+    this_ptr = transfer(this, this_ptr)
+    call set_num_threads(this=this_ptr%p, num_threads_=num_threads_)
+end subroutine f90wrap_set_num_threads
+
 subroutine f90wrap_dd1(this, f, df, na, nb, n0, n1, n2, n3, n4, n5)
     use cd06stuff, only: dd1, cd06
     implicit none
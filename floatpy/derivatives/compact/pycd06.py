@@ -8,7 +8,7 @@ class Cd06Stuff(f90wrap.runtime.FortranModule):
     Module cd06stuff
     
     
-    Defined at cd06.F90 lines 4-852
+    Defined at cd06.F90 lines 4-887
     
     """
     @f90wrap.runtime.register_class("cd06")
@@ -17,7 +17,7 @@ class Cd06Stuff(f90wrap.runtime.FortranModule):
         Type(name=cd06)
         
         
-        Defined at cd06.F90 lines 70-119
+        Defined at cd06.F90 lines 71-121
         
         """
         def __init__(self, n_, dx_, periodic_, bc1_, bcn_, handle=None):
@@ -25,7 +25,7 @@ class Cd06Stuff(f90wrap.runtime.FortranModule):
             self = Cd06(n_, dx_, periodic_, bc1_, bcn_)
             
             
-            Defined at cd06.F90 lines 129-200
+            Defined at cd06.F90 lines 131-204
             
             Parameters
             ----------
@@ -49,7 +49,7 @@ class Cd06Stuff(f90wrap.runtime.FortranModule):
             Destructor for class Cd06
             
             
-            Defined at cd06.F90 lines 202-218
+            Defined at cd06.F90 lines 206-222
             
             Parameters
             ----------
@@ -59,12 +59,27 @@ class Cd06Stuff(f90wrap.runtime.FortranModule):
             if self._alloc:
                 _pycd06.f90wrap_destroy(this=self._handle)
         
+        def set_num_threads(self, num_threads_):
+            """
+            set_num_threads(self, num_threads_)
+            
+            
+            Defined at cd06.F90 lines 224-237
+            
+            Parameters
+            ----------
+            this : Cd06
+            num_threads_ : int
+            
+            """
+            _pycd06.f90wrap_set_num_threads(this=self._handle, num_threads_=num_threads_)
+        
         def dd1(self, f, df, na, nb):
             """
             dd1(self, f, df, na, nb)
             
             
-            Defined at cd06.F90 lines 774-794
+            Defined at cd06.F90 lines 809-829
             
             Parameters
             ----------
@@ -82,7 +97,7 @@ class Cd06Stuff(f90wrap.runtime.FortranModule):
             dd2(self, f, df, na, nb)
             
             
-            Defined at cd06.F90 lines 796-816
+            Defined at cd06.F90 lines 831-851
             
             Parameters
             ----------
@@ -100,7 +115,7 @@ class Cd06Stuff(f90wrap.runtime.FortranModule):
             dd3(self, f, df, na, nb)
             
             
-            Defined at cd06.F90 lines 818-838
+            Defined at cd06.F90 lines 853-873
             
             Parameters
             ----------
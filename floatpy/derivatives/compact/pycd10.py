@@ -8,7 +8,7 @@ class Cd10Stuff(f90wrap.runtime.FortranModule):
     Module cd10stuff
     
     
-    Defined at cd10.F90 lines 4-2500
+    Defined at cd10.F90 lines 4-2549
     
     """
     @f90wrap.runtime.register_class("cd10")
@@ -17,7 +17,7 @@ class Cd10Stuff(f90wrap.runtime.FortranModule):
         Type(name=cd10)
         
         
-        Defined at cd10.F90 lines 108-185
+        Defined at cd10.F90 lines 109-187
         
         """
         def __init__(self, n_, dx_, periodic_, bc1_, bcn_, handle=None):
@@ -25,7 +25,7 @@ class Cd10Stuff(f90wrap.runtime.FortranModule):
             self = Cd10(n_, dx_, periodic_, bc1_, bcn_)
             
             
-            Defined at cd10.F90 lines 195-315
+            Defined at cd10.F90 lines 197-319
             
             Parameters
             ----------
@@ -49,7 +49,7 @@ class Cd10Stuff(f90wrap.runtime.FortranModule):
             Destructor for class Cd10
             
             
-            Defined at cd10.F90 lines 317-349
+            Defined at cd10.F90 lines 321-353
             
             Parameters
             ----------
@@ -59,12 +59,27 @@ class Cd10Stuff(f90wrap.runtime.FortranModule):
             if self._alloc:
                 _pycd10.f90wrap_destroy(this=self._handle)
         
+        def set_num_threads(self, num_threads_):
+            """
+            set_num_threads(self, num_threads_)
+            
+            
+            Defined at cd10.F90 lines 355-368
+            
+            Parameters
+            ----------
+            this : Cd10
+            num_threads_ : int
+            
+            """
+            _pycd10.f90wrap_set_num_threads(this=self._handle, num_threads_=num_threads_)
+        
         def dd1(self, f, df, na, nb, bc1_=None, bcn_=None):
             """
             dd1(self, f, df, na, nb[, bc1_, bcn_])
             
             
-            Defined at cd10.F90 lines 2081-2149
+            Defined at cd10.F90 lines 2130-2198
             
             Parameters
             ----------
@@ -85,7 +100,7 @@ class Cd10Stuff(f90wrap.runtime.FortranModule):
             dd2(self, f, df, na, nb[, bc1_, bcn_])
             
             
-            Defined at cd10.F90 lines 2151-2219
+            Defined at cd10.F90 lines 2200-2268
             
             Parameters
             ----------
@@ -106,7 +121,7 @@ class Cd10Stuff(f90wrap.runtime.FortranModule):
             dd3(self, f, df, na, nb[, bc1_, bcn_])
             
             
-            Defined at cd10.F90 lines 2221-2289
+            Defined at cd10.F90 lines 2270-2338
             
             Parameters
             ----------
@@ -127,7 +142,7 @@ class Cd10Stuff(f90wrap.runtime.FortranModule):
             d2d1(self, f, df, na, nb[, bc1_, bcn_])
             
             
-            Defined at cd10.F90 lines 2291-2359
+            Defined at cd10.F90 lines 2340-2408
             
             Parameters
             ----------
@@ -148,7 +163,7 @@ class Cd10Stuff(f90wrap.runtime.FortranModule):
             d2d2(self, f, df, na, nb[, bc1_, bcn_])
             
             
-            Defined at cd10.F90 lines 2361-2429
+            Defined at cd10.F90 lines 2410-2478
             
             Parameters
             ----------
@@ -169,7 +184,7 @@ class Cd10Stuff(f90wrap.runtime.FortranModule):
             d2d3(self, f, df, na, nb[, bc1_, bcn_])
             
             
-            Defined at cd10.F90 lines 2431-2500
+            Defined at cd10.F90 lines 2480-2549
             
             Parameters
             ----------
@@ -2,7 +2,7 @@ import numpy
 import compact.pycd06 as pycd06
 import compact.pycd10 as pycd10
 
-from floatpy.parallel import t3dmod
+from floatpy.parallel import pencil_workspace, t3dmod
 from floatpy.utilities import data_reshaper
 
 class CompactDifferentiator(object):
@@ -10,7 +10,8 @@ class CompactDifferentiator(object):
     Class to perform derivatives with compact finite difference schemes.
     """
     
-    def __init__(self, grid_partition, grid_spacing, order, dimension=3, periodic_dimensions=(False, False, False)):
+    def __init__(self, grid_partition, grid_spacing, order, dimension=3, periodic_dimensions=(False, False, False), \
+                 num_threads=None):
         """
         Constructor of the class.
         
@@ -20,6 +21,12 @@ class CompactDifferentiator(object):
                 in each direction
         dimension : dimension of problem
         periodic_dimensions : iterable of boolean descibing whether the periodicity in each direction
+        num_threads : number of OpenMP threads of each process for the solves over the independent lines of the
+                      pencils. None for the OpenMP default
+        
+        The work buffers are cached in the pencil workspace shared by all the objects using the same grid partition
+        and are kept as long as the grid partition. Call clearWorkspace() to free them, e.g. between the phases of
+        an analysis.
         """
         
         if not isinstance(grid_partition, t3dmod.t3d):
@@ -118,8 +125,48 @@ class CompactDifferentiator(object):
             elif self._order[2] == 10:
                 self._der_z = pycd10.cd10stuff.cd10( self._nz, grid_spacing[2], self._periodic[2], 0, 0 )
         
+        self.setNumThreads(num_threads)
+        
         # Initialize the data reshaper.
         self._data_reshaper = data_reshaper.DataReshaper(self._dim, data_order='F')
+        
+        # Get the pencil workspace shared by all the objects using the same grid partition.
+        self._workspace = pencil_workspace.getPencilWorkspace(self._grid_partition)
+    
+    
+    @property
+    def num_threads(self):
+        """
+        Return the number of OpenMP threads used for the solves. None if the OpenMP default is used.
+        """
+        
+        return self._num_threads
+    
+    
+    def setNumThreads(self, num_threads=None):
+        """
+        Set the number of OpenMP threads of each process for the solves over the independent lines of the pencils.
+        
+        num_threads : positive integer number of threads. None for the OpenMP default
+        """
+        
+        if num_threads is not None and num_threads < 1:
+            raise RuntimeError("Number of threads should be at least 1!")
+        
+        self._num_threads = num_threads
+        
+        for der in [self._der_x, self._der_y, self._der_z]:
+            if der is not None:
+                der.set_num_threads(0 if num_threads is None else num_threads)
+    
+    
+    def clearWorkspace(self):
+        """
+        Free the work buffers cached in the pencil workspace. The workspace is shared by all the objects using the same
+        grid partition, so their buffers are freed as well. The buffers are allocated again when they are needed.
+        """
+        
+        self._workspace.clear()
     
     
     def ddx(self, data, der=None, component_idx=None, bc=(0,0)):
@@ -168,8 +215,8 @@ class CompactDifferentiator(object):
         else:
             return_der = False
         
-        data_x = numpy.empty(self._chunk_x_size, dtype=numpy.float64, order='F')
-        der_x  = numpy.empty(self._chunk_x_size, dtype=numpy.float64, order='F')
+        data_x = self._workspace.getBuffer(0, tag='input')
+        der_x  = self._workspace.getBuffer(0, tag='output')
         
         data_3d = []
         if component_idx is None:
@@ -236,8 +283,8 @@ class CompactDifferentiator(object):
         else:
             return_der = False
         
-        data_y = numpy.empty(self._chunk_y_size, dtype=numpy.float64, order='F')
-        der_y  = numpy.empty(self._chunk_y_size, dtype=numpy.float64, order='F')
+        data_y = self._workspace.getBuffer(1, tag='input')
+        der_y  = self._workspace.getBuffer(1, tag='output')
         
         data_3d = []
         if component_idx is None:
@@ -300,8 +347,8 @@ class CompactDifferentiator(object):
         else:
             return_der = False
         
-        data_z = numpy.empty(self._chunk_z_size, dtype=numpy.float64, order='F')
-        der_z  = numpy.empty(self._chunk_z_size, dtype=numpy.float64, order='F')
+        data_z = self._workspace.getBuffer(2, tag='input')
+        der_z  = self._workspace.getBuffer(2, tag='output')
         
         data_3d = []
         if component_idx is None:
@@ -369,8 +416,8 @@ class CompactDifferentiator(object):
         else:
             return_der = False
         
-        data_x = numpy.empty(self._chunk_x_size, dtype=numpy.float64, order='F')
-        der_x  = numpy.empty(self._chunk_x_size, dtype=numpy.float64, order='F')
+        data_x = self._workspace.getBuffer(0, tag='input')
+        der_x  = self._workspace.getBuffer(0, tag='output')
         
         data_3d = []
         if component_idx is None:
@@ -436,8 +483,8 @@ class CompactDifferentiator(object):
         else:
             return_der = False
         
-        data_y = numpy.empty(self._chunk_y_size, dtype=numpy.float64, order='F')
-        der_y  = numpy.empty(self._chunk_y_size, dtype=numpy.float64, order='F')
+        data_y = self._workspace.getBuffer(1, tag='input')
+        der_y  = self._workspace.getBuffer(1, tag='output')
         
         data_3d = []
         if component_idx is None:
@@ -499,8 +546,8 @@ class CompactDifferentiator(object):
         else:
             return_der = False
         
-        data_z = numpy.empty(self._chunk_z_size, dtype=numpy.float64, order='F')
-        der_z  = numpy.empty(self._chunk_z_size, dtype=numpy.float64, order='F')
+        data_z = self._workspace.getBuffer(2, tag='input')
+        der_z  = self._workspace.getBuffer(2, tag='output')
         
         data_3d = []
         if component_idx is None:
@@ -523,18 +570,31 @@ class CompactDifferentiator(object):
     
     def gradient(self, data, component_idx=None, x_bc=(0,0), y_bc=(0,0), z_bc=(0,0)):
         """
-        Method to compute the gradient of data.
+        Method to compute the gradient of data. If data has multiple components and component_idx is None, the
+        gradient of all the components is computed with each component transposed to each pencil only once.
 
         data : input numpy array in Fortran contiguous layout. This array must be consistent with the 3D decomposition
                and the problem dimension
         component_idx : index of component in data for taking derivative. None if there is only one component in the
-                        data
+                        data or if the gradient of all the components is computed
         *_bc : integer tuple of size 2 with the boundary condition at the left and right.
                0 is general, 1 is symmetric, -1 is anti-symmetric. Only required if non-periodic
         gradient_* : returned output numpy array in Fortran contiguous layout. This array must be consistent with the
-                     3D decomposition and the problem dimension
+                     3D decomposition and the problem dimension. The derivatives of all the components are stacked in
+                     the last dimension if the gradient of all the components is computed
         """
         
+        if component_idx is None and data.ndim == self._dim + 1:
+            component_indices = range(data.shape[-1])
+            
+            gradient = tuple([self._differentiateComponents(data, direction, component_indices, bc) \
+                              for direction, bc in zip(range(self._dim), (x_bc, y_bc, z_bc))])
+            
+            if self._dim == 1:
+                return gradient[0]
+            
+            return gradient
+        
         if self._dim == 1:
             return self.ddx(data, component_idx=component_idx, bc=x_bc)
         
@@ -570,11 +630,11 @@ class CompactDifferentiator(object):
         if self._dim == 3 and len(data_shape) != 4:
             raise RuntimeError("Make sure data is 3D and has enough number of components!")
         
-        divergence = self.ddx(data, component_idx=0, bc=x_bc)
+        divergence = self._differentiateComponents(data, 0, (0,), x_bc)[..., 0]
         if self._dim >= 2:
-            divergence = divergence + self.ddy(data, component_idx=1, bc=y_bc)
+            divergence += self._differentiateComponents(data, 1, (1,), y_bc)[..., 0]
         if self._dim == 3:
-            divergence = divergence + self.ddz(data, component_idx=2, bc=z_bc)
+            divergence += self._differentiateComponents(data, 2, (2,), z_bc)[..., 0]
         
         return divergence
     
@@ -602,28 +662,25 @@ class CompactDifferentiator(object):
         if self._dim == 3 and len(data_shape) != 4:
             raise RuntimeError("Make sure data is 3D and has enough number of components!")
         
+        # The components needed in each pencil are transposed together to and from the pencil.
+        
         curl = None
         if self._dim == 2:
-            dvdx = self.ddx(data, component_idx=1, bc=x_bc)
-            dudy = self.ddy(data, component_idx=0, bc=y_bc)
+            dvdx = self._differentiateComponents(data, 0, (1,), x_bc)[..., 0]
+            dudy = self._differentiateComponents(data, 1, (0,), y_bc)[..., 0]
             
             curl = dvdx - dudy
             
         if self._dim == 3:
-            dvdx = self.ddx(data, component_idx=1, bc=x_bc)
-            dwdx = self.ddx(data, component_idx=2, bc=x_bc)
-            
-            dudy = self.ddy(data, component_idx=0, bc=y_bc)
-            dwdy = self.ddy(data, component_idx=2, bc=y_bc)
-            
-            dudz = self.ddz(data, component_idx=0, bc=z_bc)
-            dvdz = self.ddz(data, component_idx=1, bc=z_bc)
+            der_x = self._differentiateComponents(data, 0, (1, 2), x_bc)
+            der_y = self._differentiateComponents(data, 1, (0, 2), y_bc)
+            der_z = self._differentiateComponents(data, 2, (0, 1), z_bc)
             
             curl = numpy.empty( (data_shape[0], data_shape[1], data_shape[2], 3), dtype=numpy.float64, order='F' )
             
-            curl[:, :, :, 0] = dwdy - dvdz
-            curl[:, :, :, 1] = dudz - dwdx
-            curl[:, :, :, 2] = dvdx - dudy
+            numpy.subtract(der_y[:, :, :, 1], der_z[:, :, :, 1], out=curl[:, :, :, 0])
+            numpy.subtract(der_z[:, :, :, 0], der_x[:, :, :, 1], out=curl[:, :, :, 1])
+            numpy.subtract(der_x[:, :, :, 0], der_y[:, :, :, 0], out=curl[:, :, :, 2])
         
         return curl
     
@@ -649,3 +706,487 @@ class CompactDifferentiator(object):
             laplacian = laplacian + self.d2dz2(data, component_idx=component_idx, bc=z_bc)
         
         return laplacian
+    
+    
+    def velocity_gradient_tensor(self, data, tensor=None, x_bc=(0,0), y_bc=(0,0), z_bc=(0,0)):
+        """
+        Method to compute the velocity gradient tensor. All the velocity components are transposed to and from each
+        pencil together, so only two all-to-all communications are needed in each direction.
+        
+        data : input numpy array in Fortran contiguous layout. This array must be consistent with the 3D decomposition
+               and the problem dimension. The number of components should be as same as the number of dimensions
+        tensor : optional output numpy array in Fortran contiguous layout with the shape of data and an additional last
+                 dimension of size of the number of dimensions. tensor[..., i, j] is the derivative of the i-th
+                 component in the j-th direction. This method will return tensor if tensor is None
+        *_bc : integer tuple of size 2 with the boundary condition at the left and right.
+               0 is general, 1 is symmetric, -1 is anti-symmetric. Only required if non-periodic
+        """
+        
+        self._checkVectorShape(data)
+        
+        tensor_shape = data.shape + (self._dim,)
+        
+        return_tensor = True
+        if tensor is None:
+            tensor = numpy.empty(tensor_shape, dtype=numpy.float64, order='F')
+        else:
+            if tensor.shape != tensor_shape:
+                raise RuntimeError("Make sure shape of tensor is consistent with that of data!")
+            return_tensor = False
+        
+        for direction, bc in zip(range(self._dim), (x_bc, y_bc, z_bc)):
+            self._differentiateComponents(data, direction, range(self._dim), bc, der=tensor[..., direction])
+        
+        if return_tensor:
+            return tensor
+    
+    
+    def q_criterion(self, data, x_bc=(0,0), y_bc=(0,0), z_bc=(0,0)):
+        """
+        Method to compute the Q-criterion of a velocity field, Q = -A_ij*A_ji/2 where A is the velocity gradient
+        tensor. The full tensor is never stored: the derivatives in each direction are accumulated into Q as soon as
+        they are computed and only the derivatives needed by the later directions are kept.
+        
+        data : input numpy array in Fortran contiguous layout. This array must be consistent with the 3D decomposition
+               and the problem dimension. The number of components should be as same as the number of dimensions
+        *_bc : integer tuple of size 2 with the boundary condition at the left and right.
+               0 is general, 1 is symmetric, -1 is anti-symmetric. Only required if non-periodic
+        q : returned output numpy array in Fortran contiguous layout. This array is in the 3D decomposition
+        """
+        
+        self._checkVectorShape(data)
+        
+        bcs = (x_bc, y_bc, z_bc)
+        
+        q = numpy.zeros(data.shape[0:-1], dtype=numpy.float64, order='F')
+        
+        # der_kept[k] stores A_ik for i > k.
+        der_kept = []
+        
+        for j in range(self._dim):
+            der = self._differentiateComponents(data, j, range(self._dim), bcs[j])
+            
+            q -= 0.5*der[..., j]*der[..., j]
+            
+            for k in range(j):
+                q -= der_kept[k][..., j-k-1]*der[..., k]
+            
+            der_kept.append(der[..., j+1:].copy(order='F'))
+        
+        return q
+    
+    
+    def enstrophy(self, data, x_bc=(0,0), y_bc=(0,0), z_bc=(0,0)):
+        """
+        Method to compute the enstrophy of a velocity field, which is half of the square of the vorticity magnitude.
+        Only the off-diagonal derivatives are computed and, as in q_criterion, the full velocity gradient tensor is
+        never stored.
+        
+        data : input numpy array in Fortran contiguous layout. This array must be consistent with the 3D decomposition
+               and the problem dimension. The number of components should be as same as the number of dimensions
+        *_bc : integer tuple of size 2 with the boundary condition at the left and right.
+               0 is general, 1 is symmetric, -1 is anti-symmetric. Only required if non-periodic
+        enstrophy : returned output numpy array in Fortran contiguous layout. This array is in the 3D decomposition
+        """
+        
+        if self._dim == 1:
+            raise RuntimeError("There is no enstrophy for 1D problem!")
+        
+        self._checkVectorShape(data)
+        
+        bcs = (x_bc, y_bc, z_bc)
+        
+        enstrophy = numpy.zeros(data.shape[0:-1], dtype=numpy.float64, order='F')
+        
+        # der_kept[k] stores A_ik for i > k.
+        der_kept = []
+        
+        for j in range(self._dim):
+            component_indices = [i for i in range(self._dim) if i != j]
+            der = self._differentiateComponents(data, j, component_indices, bcs[j])
+            
+            for k in range(j):
+                vorticity = der_kept[k][..., j-k-1] - der[..., k]
+                enstrophy += 0.5*vorticity*vorticity
+            
+            der_kept.append(der[..., j:].copy(order='F'))
+        
+        return enstrophy
+    
+    
+    def lambda2(self, data, x_bc=(0,0), y_bc=(0,0), z_bc=(0,0)):
+        """
+        Method to compute the lambda2 criterion of a velocity field, which is the second largest eigenvalue of
+        S^2 + W^2 where S and W are the symmetric and anti-symmetric parts of the velocity gradient tensor. Unlike
+        q_criterion and enstrophy, this needs all nine components of the tensor at each point, so the full tensor is
+        held at full size while the eigenvalues are computed. It is kept in local arrays of the derivatives in each
+        direction that are freed on return, not in the shared pencil workspace.
+        
+        data : input numpy array in Fortran contiguous layout. This array must be consistent with the 3D decomposition
+               and the problem dimension. The number of components should be as same as the number of dimensions
+        *_bc : integer tuple of size 2 with the boundary condition at the left and right.
+               0 is general, 1 is symmetric, -1 is anti-symmetric. Only required if non-periodic
+        lambda2 : returned output numpy array in Fortran contiguous layout. This array is in the 3D decomposition
+        """
+        
+        if self._dim != 3:
+            raise RuntimeError("lambda2 is only defined for 3D problem!")
+        
+        self._checkVectorShape(data)
+        
+        bcs = (x_bc, y_bc, z_bc)
+        
+        # der_kept[j] stores A_ij for all i.
+        der_kept = []
+        
+        for j in range(3):
+            der_kept.append(self._differentiateComponents(data, j, range(3), bcs[j]))
+        
+        lambda2 = numpy.empty(data.shape[0:-1], dtype=numpy.float64, order='F')
+        
+        # S^2 + W^2 = (A^2 + (A^2)^T)/2.
+        
+        for k in range(data.shape[2]):
+            tensor = numpy.stack([der[:, :, k, :] for der in der_kept], axis=-1)
+            
+            tensor_squared = numpy.matmul(tensor, tensor)
+            tensor_squared = 0.5*(tensor_squared + numpy.swapaxes(tensor_squared, -1, -2))
+            
+            lambda2[:, :, k] = numpy.linalg.eigvalsh(tensor_squared)[..., 1]
+        
+        return lambda2
+    
+    
+    def d2dxdy(self, data, der=None, component_idx=None, x_bc=(0,0), y_bc=(0,0)):
+        """
+        Method to compute the mixed second order derivative of data in the first and second directions.
+        
+        data : input numpy array in Fortran contiguous layout. This array must be consistent with the 3D decomposition
+               and the problem dimension
+        der : optional output numpy array in Fortran contiguous layout. This array must be consistent with the 3D
+              decomposition and the problem dimension. This method will return der if der is None
+        component_idx : index of component in data for taking derivative. None if there is only one component in the
+                        data
+        *_bc : integer tuple of size 2 with the boundary condition at the left and right.
+               0 is general, 1 is symmetric, -1 is anti-symmetric. Only required if non-periodic
+        """
+        
+        return self._mixedDerivative(data, (0, 1), der, component_idx, (x_bc, y_bc))
+    
+    
+    def d2dxdz(self, data, der=None, component_idx=None, x_bc=(0,0), z_bc=(0,0)):
+        """
+        Method to compute the mixed second order derivative of data in the first and third directions.
+        
+        data : input numpy array in Fortran contiguous layout. This array must be consistent with the 3D decomposition
+               and the problem dimension
+        der : optional output numpy array in Fortran contiguous layout. This array must be consistent with the 3D
+              decomposition and the problem dimension. This method will return der if der is None
+        component_idx : index of component in data for taking derivative. None if there is only one component in the
+                        data
+        *_bc : integer tuple of size 2 with the boundary condition at the left and right.
+               0 is general, 1 is symmetric, -1 is anti-symmetric. Only required if non-periodic
+        """
+        
+        return self._mixedDerivative(data, (0, 2), der, component_idx, (x_bc, z_bc))
+    
+    
+    def d2dydz(self, data, der=None, component_idx=None, y_bc=(0,0), z_bc=(0,0)):
+        """
+        Method to compute the mixed second order derivative of data in the second and third directions.
+        
+        data : input numpy array in Fortran contiguous layout. This array must be consistent with the 3D decomposition
+               and the problem dimension
+        der : optional output numpy array in Fortran contiguous layout. This array must be consistent with the 3D
+              decomposition and the problem dimension. This method will return der if der is None
+        component_idx : index of component in data for taking derivative. None if there is only one component in the
+                        data
+        *_bc : integer tuple of size 2 with the boundary condition at the left and right.
+               0 is general, 1 is symmetric, -1 is anti-symmetric. Only required if non-periodic
+        """
+        
+        return self._mixedDerivative(data, (1, 2), der, component_idx, (y_bc, z_bc))
+    
+    
+    def hessian(self, data, tensor=None, component_idx=None, x_bc=(0,0), y_bc=(0,0), z_bc=(0,0)):
+        """
+        Method to compute the Hessian of data. Each direction costs a single transpose to the pencil and a single
+        transpose back: the data is transposed to the pencil together with its first order derivatives in the previous
+        directions, so the mixed derivatives are computed on the pencil that is already resident, and all the new
+        derivatives are transposed back together.
+        
+        data : input numpy array in Fortran contiguous layout. This array must be consistent with the 3D decomposition
+               and the problem dimension
+        tensor : optional output numpy array in Fortran contiguous layout with the shape of the component's data and
+                 two additional last dimensions of size of the number of dimensions. tensor[..., i, j] is the second
+                 order derivative in the i-th and j-th directions. This method will return tensor if tensor is None
+        component_idx : index of component in data for taking derivative. None if there is only one component in the
+                        data
+        *_bc : integer tuple of size 2 with the boundary condition at the left and right.
+               0 is general, 1 is symmetric, -1 is anti-symmetric. Only required if non-periodic
+        """
+        
+        data_shape = data.shape
+        
+        if component_idx is not None:
+            data_shape = data_shape[0:-1]
+        
+        if len(data_shape) != self._dim:
+            raise RuntimeError("Make sure data is %dD!" % self._dim)
+        
+        if numpy.any(numpy.array(data_shape) != self._chunk_3d_size[0:self._dim]):
+            raise RuntimeError("Make sure data is of the same size as in grid_partition!")
+        
+        tensor_shape = tuple(data_shape) + (self._dim, self._dim)
+        
+        return_tensor = True
+        if tensor is None:
+            tensor = numpy.empty(tensor_shape, dtype=numpy.float64, order='F')
+        else:
+            if tensor.shape != tensor_shape:
+                raise RuntimeError("Make sure shape of tensor is consistent with that of data!")
+            if not tensor.flags.f_contiguous:
+                raise RuntimeError("Make sure tensor is in Fortran contiguous layout!")
+            return_tensor = False
+        
+        bcs = (x_bc, y_bc, z_bc)
+        
+        shape_3d = tuple(self._chunk_3d_size)
+        tensor_3d = numpy.reshape(tensor, shape_3d + (self._dim, self._dim), order='F')
+        
+        # Stack of the data and its first order derivatives in the directions already visited.
+        
+        stack_3d = self._workspace.getBuffer(None, num_components=self._dim, tag='hessian_input')
+        stack_3d = numpy.reshape(stack_3d, shape_3d + (self._dim,), order='F')
+        
+        if component_idx is None:
+            stack_3d[:, :, :, 0] = numpy.reshape(data, shape_3d, order='F')
+        else:
+            stack_3d[:, :, :, 0] = numpy.reshape(data[..., component_idx], shape_3d, order='F')
+        
+        # At most self._dim components are transposed in each direction, so a single buffer of that size is kept for
+        # each tag and the components needed in each direction are sliced from it.
+        
+        der_3d_all = self._workspace.getBuffer(None, num_components=self._dim, tag='hessian_output')
+        der_3d_all = numpy.reshape(der_3d_all, shape_3d + (self._dim,), order='F')
+        
+        for j in range(self._dim):
+            # The first order derivative in this direction is only needed by the later directions.
+            
+            num_inputs = j + 1
+            num_outputs = j + 1
+            if j < self._dim - 1:
+                num_outputs += 1
+            
+            data_pencil = self._workspace.getBuffer(j, num_components=self._dim, tag='input')
+            der_pencil  = self._workspace.getBuffer(j, num_components=self._dim, tag='output')
+            
+            if self._dim == 1:
+                data_pencil = data_pencil[:, :, :, numpy.newaxis]
+                der_pencil = der_pencil[:, :, :, numpy.newaxis]
+            
+            data_pencil = data_pencil[:, :, :, 0:num_inputs]
+            der_pencil = der_pencil[:, :, :, 0:num_outputs]
+            
+            self._transposeToPencilBatched(j, stack_3d[:, :, :, 0:num_inputs], data_pencil)
+            
+            # Output components: d2f/dxj2, d2f/dxidxj for i < j and df/dxj.
+            
+            self._differentiateInPencil(j, data_pencil[:, :, :, 0], der_pencil[:, :, :, 0], bcs[j], \
+                                        second_derivative=True)
+            
+            for i in range(j):
+                self._differentiateInPencil(j, data_pencil[:, :, :, i+1], der_pencil[:, :, :, i+1], bcs[j])
+            
+            if num_outputs > num_inputs:
+                self._differentiateInPencil(j, data_pencil[:, :, :, 0], der_pencil[:, :, :, j+1], bcs[j])
+            
+            der_3d = der_3d_all[:, :, :, 0:num_outputs]
+            
+            self._transposeFromPencilBatched(j, der_pencil, der_3d)
+            
+            tensor_3d[:, :, :, j, j] = der_3d[:, :, :, 0]
+            
+            for i in range(j):
+                tensor_3d[:, :, :, i, j] = der_3d[:, :, :, i+1]
+                tensor_3d[:, :, :, j, i] = der_3d[:, :, :, i+1]
+            
+            if num_outputs > num_inputs:
+                stack_3d[:, :, :, j+1] = der_3d[:, :, :, j+1]
+        
+        if return_tensor:
+            return tensor
+    
+    
+    def _checkVectorShape(self, data):
+        """
+        Check whether data is a vector consistent with the 3D decomposition and the problem dimension.
+        """
+        
+        if data.ndim != self._dim + 1 or data.shape[-1] != self._dim:
+            raise RuntimeError("Make sure data is %dD and has enough number of components!" % self._dim)
+        
+        if numpy.any(numpy.array(data.shape[0:-1]) != self._chunk_3d_size[0:self._dim]):
+            raise RuntimeError("Make sure data is of the same size as in grid_partition!")
+    
+    
+    def _differentiateComponents(self, data, direction, component_indices, bc=(0,0), der=None):
+        """
+        Method to compute the first order derivatives of several components of data in a direction. All the components
+        are transposed to the pencil together with a single all-to-all communication and the derivatives are
+        transposed back together in the same way.
+        
+        data : input numpy array in Fortran contiguous layout. This array must be consistent with the 3D decomposition
+               and the problem dimension
+        direction : direction of the derivatives
+        component_indices : iterable of the indices of the components in data. None if there is only one component
+                            in the data
+        bc : integer iterable of size 2 with the boundary condition at the left and right.
+             0 is general, 1 is symmetric, -1 is anti-symmetric. Only required if non-periodic
+        der : optional output numpy array in Fortran contiguous layout with the derivatives of the components stacked
+              in the last dimension. This method will return der if der is None
+        """
+        
+        data_shape = data.shape
+        
+        if component_indices is not None:
+            data_shape = data_shape[0:-1]
+        
+        if len(data_shape) != self._dim:
+            raise RuntimeError("Make sure data is %dD!" % self._dim)
+        
+        if numpy.any(numpy.array(data_shape) != self._chunk_3d_size[0:self._dim]):
+            raise RuntimeError("Make sure data is of the same size as in grid_partition!")
+        
+        if direction >= self._dim:
+            raise RuntimeError("There is no derivative in direction %d for %dD problem!" % (direction, self._dim))
+        
+        # Stack the components in the 3D shape.
+        
+        if component_indices is None:
+            num_components = 1
+            data_stacked = data
+        else:
+            component_indices = list(component_indices)
+            num_components = len(component_indices)
+            
+            if component_indices == list(range(data.shape[-1])):
+                data_stacked = data
+            else:
+                data_stacked = data[..., component_indices]
+        
+        shape_3d = tuple(self._chunk_3d_size) + (num_components,)
+        
+        data_3d = numpy.reshape(data_stacked, shape_3d, order='F')
+        
+        return_der = True
+        if der is None:
+            der_3d = numpy.empty(shape_3d, dtype=numpy.float64, order='F')
+        else:
+            if der.shape != tuple(data_shape) + (num_components,):
+                raise RuntimeError("Make sure shape of der is consistent with that of data!")
+            if not der.flags.f_contiguous:
+                raise RuntimeError("Make sure der is in Fortran contiguous layout!")
+            
+            der_3d = numpy.reshape(der, shape_3d, order='F')
+            return_der = False
+        
+        data_pencil = self._workspace.getBuffer(direction, num_components=num_components, tag='input')
+        der_pencil  = self._workspace.getBuffer(direction, num_components=num_components, tag='output')
+        
+        if num_components == 1:
+            data_pencil = data_pencil[:, :, :, numpy.newaxis]
+            der_pencil  = der_pencil[:, :, :, numpy.newaxis]
+        
+        # Transpose all the components to the pencil, take the derivatives and transpose them back.
+        
+        self._transposeToPencilBatched(direction, data_3d, data_pencil)
+        
+        for ic in range(num_components):
+            self._differentiateInPencil(direction, data_pencil[:, :, :, ic], der_pencil[:, :, :, ic], bc)
+        
+        self._transposeFromPencilBatched(direction, der_pencil, der_3d)
+        
+        if return_der:
+            return numpy.reshape(der_3d, tuple(data_shape) + (num_components,), order='F')
+    
+    
+    def _mixedDerivative(self, data, directions, der=None, component_idx=None, bcs=((0,0), (0,0))):
+        """
+        Method to compute the mixed second order derivative of data in two different directions.
+        """
+        
+        component_indices = None
+        if component_idx is not None:
+            component_indices = (component_idx,)
+        
+        der_first = self._differentiateComponents(data, directions[0], component_indices, bcs[0])
+        
+        if der is None:
+            return self._differentiateComponents(der_first, directions[1], (0,), bcs[1])[..., 0]
+        
+        self._differentiateComponents(der_first, directions[1], (0,), bcs[1], der=der[..., numpy.newaxis])
+    
+    
+    def _transposeToPencilBatched(self, direction, data_3d, data_pencil):
+        """
+        Transpose all the components of 4D data from the 3D decomposition to the pencil in a direction with a single
+        all-to-all communication.
+        """
+        
+        if direction == 0:
+            self._grid_partition.transpose_3d_to_x_batched(data_3d, data_pencil)
+        elif direction == 1:
+            self._grid_partition.transpose_3d_to_y_batched(data_3d, data_pencil)
+        else:
+            self._grid_partition.transpose_3d_to_z_batched(data_3d, data_pencil)
+    
+    
+    def _transposeFromPencilBatched(self, direction, data_pencil, data_3d):
+        """
+        Transpose all the components of 4D data from the pencil in a direction to the 3D decomposition with a single
+        all-to-all communication.
+        """
+        
+        if direction == 0:
+            self._grid_partition.transpose_x_to_3d_batched(data_pencil, data_3d)
+        elif direction == 1:
+            self._grid_partition.transpose_y_to_3d_batched(data_pencil, data_3d)
+        else:
+            self._grid_partition.transpose_z_to_3d_batched(data_pencil, data_3d)
+    
+    
+    def _differentiateInPencil(self, direction, data_pencil, der_pencil, bc=(0,0), second_derivative=False):
+        """
+        Method to compute the first or second order derivative of one component of data in the pencil of the
+        direction.
+        
+        data_pencil : input 3D numpy array in Fortran contiguous layout in the pencil of the direction
+        der_pencil : output 3D numpy array in Fortran contiguous layout in the pencil of the direction
+        bc : integer iterable of size 2 with the boundary condition at the left and right.
+             0 is general, 1 is symmetric, -1 is anti-symmetric. Only required if non-periodic
+        second_derivative : boolean to decide whether to compute the second order derivative
+        """
+        
+        if direction == 0:
+            der, n_a, n_b = self._der_x, self._chunk_x_size[1], self._chunk_x_size[2]
+        elif direction == 1:
+            der, n_a, n_b = self._der_y, self._chunk_y_size[0], self._chunk_y_size[2]
+        else:
+            der, n_a, n_b = self._der_z, self._chunk_z_size[0], self._chunk_z_size[1]
+        
+        if second_derivative:
+            if self._order[direction] == 6:
+                raise NotImplementedError("6th order 2nd derivatives are not implemented yet. Sorry!")
+            
+            d2d = (der.d2d1, der.d2d2, der.d2d3)[direction]
+            d2d(data_pencil, der_pencil, n_a, n_b, bc1_=bc[0], bcn_=bc[1])
+        
+        else:
+            dd = (der.dd1, der.dd2, der.dd3)[direction]
+            
+            if self._order[direction] == 6:
+                # symmetry BC only supported in 10th order for now
+                dd(data_pencil, der_pencil, n_a, n_b)
+            elif self._order[direction] == 10:
+                dd(data_pencil, der_pencil, n_a, n_b, bc1_=bc[0], bcn_=bc[1])
@@ -0,0 +1,29 @@
+! Module explicitstencil defined in file explicit_stencil.F90
+
+subroutine f90wrap_apply_stencil(f, df, coeffs, offsets, direction, lo, hi, data_start, divisor, n1, n2, n3, nc)
+    use explicitstencil, only: apply_stencil
+    implicit none
+    
+    real(8), intent(in), dimension(n1,n2,n3) :: f
+    real(8), intent(inout), dimension(n1,n2,n3) :: df
+    real(8), intent(in), dimension(nc) :: coeffs
+    integer, intent(in), dimension(nc) :: offsets
+    integer, intent(in) :: direction
+    integer, intent(in) :: lo
+    integer, intent(in) :: hi
+    integer, intent(in) :: data_start
+    real(8), intent(in) :: divisor
+    integer :: n1
+    !f2py intent(hide), depend(f) :: n1 = shape(f,0)
+    integer :: n2
+    !f2py intent(hide), depend(f) :: n2 = shape(f,1)
+    integer :: n3
+    !f2py intent(hide), depend(f) :: n3 = shape(f,2)
+    integer :: nc
+    !f2py intent(hide), depend(coeffs) :: nc = shape(coeffs,0)
+    call apply_stencil(f=f, df=df, coeffs=coeffs, offsets=offsets, direction=direction, lo=lo, hi=hi, &
+        data_start=data_start, divisor=divisor, n1=n1, n2=n2, n3=n3, nc=nc)
+end subroutine f90wrap_apply_stencil
+
+! End of module explicitstencil defined in file explicit_stencil.F90
+
@@ -0,0 +1,243 @@
+"""
+Functions for computing derivatives of any order with explicit finite differencing of any even order of accuracy. The
+coefficients of the stencils are generated with the algorithm of Fornberg (1988) and all the schemes are applied with
+the same kernel.
+"""
+
+import fractions
+import numpy
+
+from floatpy.derivatives.explicit import stencil
+
+# Cache of the generated coefficients of the stencils keyed by the derivative order and the order of accuracy.
+_coefficients_cache = {}
+
+def getFornbergWeights(x0, x, derivative_order):
+    """
+    Compute the weights of the finite difference approximation of a derivative at a location from the data at the
+    given points with the algorithm of Fornberg (1988). The weights are computed with exact rational arithmetic and
+    only rounded at the end, so the weights of integer points are the correctly rounded fractions.
+
+    x0 : location of the derivative
+    x : iterable of the distinct locations of the data
+    derivative_order : order of the derivative
+    """
+
+    if derivative_order < 0:
+        raise RuntimeError('Derivative order < 0 is invalid!')
+
+    x0 = fractions.Fraction(x0)
+    x = [fractions.Fraction(x_i) for x_i in x]
+
+    num_points = len(x)
+
+    if num_points <= derivative_order:
+        raise RuntimeError('Number of points is not large enough for the derivative order!')
+
+    if len(set(x)) != num_points:
+        raise RuntimeError('Locations of the data are not distinct!')
+
+    # weights[i][k] is the weight of the i-th point in the approximation of the k-th derivative.
+
+    weights = [[fractions.Fraction(0)]*(derivative_order + 1) for i in range(num_points)]
+    weights[0][0] = fractions.Fraction(1)
+
+    c1 = fractions.Fraction(1)
+    c4 = x[0] - x0
+
+    for i in range(1, num_points):
+        mn = min(i, derivative_order)
+        c2 = fractions.Fraction(1)
+        c5 = c4
+        c4 = x[i] - x0
+
+        for j in range(i):
+            c3 = x[i] - x[j]
+            c2 = c2*c3
+
+            if j == i - 1:
+                for k in range(mn, 0, -1):
+                    weights[i][k] = c1*(k*weights[i-1][k-1] - c5*weights[i-1][k])/c2
+                weights[i][0] = -c1*c5*weights[i-1][0]/c2
+
+            for k in range(mn, 0, -1):
+                weights[j][k] = (c4*weights[j][k] - k*weights[j][k-1])/c3
+            weights[j][0] = c4*weights[j][0]/c3
+
+        c1 = c2
+
+    return numpy.array([float(weights[i][derivative_order]) for i in range(num_points)])
+
+
+def getStencilCoefficients(derivative_order, accuracy_order):
+    """
+    Get the coefficients of the central stencil in the interior and the one-sided stencils at the boundaries of the
+    domain of an explicit finite difference scheme. The central stencil has 2*num_ghosts + 1 points. The one-sided
+    stencils of the num_ghosts points at each boundary have derivative_order + accuracy_order points each. The
+    coefficients are cached.
+
+    derivative_order : order of the derivative (>= 1)
+    accuracy_order : even order of accuracy of the scheme (>= 2)
+
+    return : tuple (coeffs_interior, coeffs_left, coeffs_right, num_ghosts) where coeffs_left[i] is the stencil of the
+             i-th point from the left boundary and coeffs_right[i] the stencil of the (num_ghosts - i)-th point from the
+             right boundary
+    """
+
+    key = (derivative_order, accuracy_order)
+
+    if key in _coefficients_cache:
+        return _coefficients_cache[key]
+
+    if derivative_order < 1:
+        raise RuntimeError('Derivative order < 1 is invalid!')
+
+    if accuracy_order < 2 or accuracy_order % 2 != 0:
+        raise RuntimeError('Order of accuracy has to be an even number >= 2!')
+
+    num_ghosts = (derivative_order + 1)//2 - 1 + accuracy_order//2
+
+    coeffs_interior = getFornbergWeights(0, range(-num_ghosts, num_ghosts + 1), derivative_order)
+
+    # Remove the round-off errors of the coefficients that should vanish by symmetry.
+
+    if derivative_order % 2 == 1:
+        coeffs_interior[num_ghosts] = 0.0
+
+    stencil_width = derivative_order + accuracy_order
+
+    coeffs_left = [getFornbergWeights(i, range(stencil_width), derivative_order) for i in range(num_ghosts)]
+    coeffs_right = [getFornbergWeights(stencil_width - num_ghosts + i, range(stencil_width), derivative_order) \
+                    for i in range(num_ghosts)]
+
+    _coefficients_cache[key] = (coeffs_interior, coeffs_left, coeffs_right, num_ghosts)
+
+    return _coefficients_cache[key]
+
+
+def differentiateFiniteDifference(data, dx, direction, derivative_order, accuracy_order, component_idx, \
+                                  use_one_sided, dimension, data_order, diff_data=None, backend='numpy'):
+    """
+    Compute a derivative of data in one direction using explicit finite differencing of any even order of accuracy.
+    The derivatives are written into diff_data directly if it is given.
+
+    data : numpy array of the data with 1 to 3 dimensions and an optional component dimension
+    dx : grid spacing in the direction
+    direction : direction of the derivative (0, 1 or 2)
+    derivative_order : order of the derivative (>= 1)
+    accuracy_order : even order of accuracy of the scheme (>= 2)
+    component_idx : index of component in data for taking derivative. None if there is only one component in the
+                    data
+    use_one_sided : boolean to decide whether to use one-sided scheme at the boundaries
+    dimension : dimension of data
+    data_order : string of the order of data. Can be 'C' or 'F'
+    diff_data : optional output numpy array with the shape of the component's data. The points at the boundaries are
+                filled with NAN values if the one-sided scheme is not used
+    backend : string of the backend to apply the stencils. Can be 'numpy' or 'fortran'
+    """
+
+    # Get the shape of data.
+
+    data_shape = numpy.array(data.shape)
+
+    # Check whether the direction is valid.
+
+    if direction < 0 or direction > 2:
+        raise RuntimeError('Direction < 0 or > 2 is invalid!')
+
+    # Check whether the shape of data is valid.
+
+    if component_idx is None:
+        if data.ndim < 1 or data.ndim > 3:
+            raise RuntimeError('Shape of data is invalid!')
+
+    else:
+        if data.ndim < 2 or data.ndim > 4:
+            raise RuntimeError('Shape of data is invalid!')
+
+        # Check whether the component_idx is valid and get the shape of the component's data.
+
+        if data_order == 'C':
+            if component_idx >= data.shape[0] or component_idx < 0:
+                raise RuntimeError('Component index is invalid!')
+
+            data_shape = numpy.array(data_shape[1:])
+
+        else:
+            if component_idx >= data.shape[-1] or component_idx < 0:
+                raise RuntimeError('Component index is invalid!')
+
+            data_shape = numpy.array(data_shape[:-1])
+
+    # Get the dimension of data.
+
+    dim = dimension
+
+    # Check whether the direction is consistent with the dimension of data.
+
+    if dim > 3:
+        raise RuntimeError('Data dimension > 3 not supported!')
+
+    if direction == 1 and dim < 2:
+        raise IOError('There is no second direction in data with less than two dimensions!')
+
+    if direction == 2 and dim < 3:
+        raise IOError('There is no third direction in data with less than three dimensions!')
+
+    # Get the coefficients of the stencils.
+
+    coeffs_interior, coeffs_left, coeffs_right, num_ghosts = getStencilCoefficients(derivative_order, accuracy_order)
+
+    stencil_width = derivative_order + accuracy_order
+
+    # Check whether data size is large enough for the stencils.
+
+    n = data_shape[direction]
+
+    if (use_one_sided == True and n < stencil_width) or n < 2*num_ghosts + 1:
+        if direction == 0:
+            raise RuntimeError('First dimension of data is not large enough!')
+        elif direction == 1:
+            raise RuntimeError('Second dimension of data is not large enough!')
+        else:
+            raise RuntimeError('Third dimension of data is not large enough!')
+
+    # Initialize container to store the derivatives if it is not given.
+
+    if diff_data is None:
+        diff_data = numpy.empty(data_shape, dtype=data.dtype, order=data_order)
+    elif diff_data.ndim != data_shape.shape[0] or numpy.any(numpy.array(diff_data.shape) != data_shape):
+        raise RuntimeError('Shape of diff_data is invalid!')
+
+    # Get the component's data.
+
+    data_component = data
+
+    if component_idx is not None:
+        if data_order == 'C':
+            data_component = data[component_idx, ...]
+        else:
+            data_component = data[..., component_idx]
+
+    divisor = dx**derivative_order
+
+    # Compute the derivatives in the interior of the domain.
+
+    stencil.applyStencil(data_component, diff_data, coeffs_interior, direction, (num_ghosts, n - num_ghosts), 0, \
+                         divisor=divisor, backend=backend)
+
+    # Compute the derivatives at the boundaries.
+
+    if use_one_sided == True:
+        for i in range(num_ghosts):
+            stencil.applyStencil(data_component, diff_data, coeffs_left[i], direction, (i, i + 1), 0, \
+                                 divisor=divisor, backend=backend)
+
+            stencil.applyStencil(data_component, diff_data, coeffs_right[i], direction, \
+                                 (n - num_ghosts + i, n - num_ghosts + i + 1), n - stencil_width, \
+                                 divisor=divisor, backend=backend)
+
+    else:
+        stencil.fillBoundaries(diff_data, direction, num_ghosts)
+
+    return diff_data
@@ -0,0 +1,42 @@
+from __future__ import print_function, absolute_import, division
+import _pyexplicit_stencil
+import f90wrap.runtime
+import logging
+
+class Explicitstencil(f90wrap.runtime.FortranModule):
+    """
+    Module explicitstencil
+    
+    
+    Defined at explicit_stencil.F90 lines 4-89
+    
+    """
+    @staticmethod
+    def apply_stencil(f, df, coeffs, offsets, direction, lo, hi, data_start, divisor):
+        """
+        apply_stencil(f, df, coeffs, offsets, direction, lo, hi, data_start, divisor)
+        
+        
+        Defined at explicit_stencil.F90 lines 17-87
+        
+        Parameters
+        ----------
+        f : float array
+        df : float array
+        coeffs : float array
+        offsets : int array
+        direction : int
+        lo : int
+        hi : int
+        data_start : int
+        divisor : float
+        
+        """
+        _pyexplicit_stencil.f90wrap_apply_stencil(f=f, df=df, coeffs=coeffs, offsets=offsets, direction=direction, \
+            lo=lo, hi=hi, data_start=data_start, divisor=divisor)
+    
+    _dt_array_initialisers = []
+    
+
+explicitstencil = Explicitstencil()
+
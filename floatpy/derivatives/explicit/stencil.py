@@ -0,0 +1,163 @@
+"""
+Functions for applying explicit finite difference stencils without full-size temporary arrays.
+"""
+
+import numpy
+
+try:
+    from floatpy.derivatives.explicit import pyexplicit_stencil
+    has_fortran_backend = True
+except ImportError:
+    has_fortran_backend = False
+
+# Backends to apply the stencils. The Fortran backend is only used when the compiled extension is available.
+backends = ('numpy', 'fortran')
+
+# Maximum number of elements of the work array used to accumulate the terms of a stencil.
+max_work_size = 2**18
+
+def _getSlices(ndim, direction, lo, hi, block_axis=None, block_lo=None, block_hi=None):
+    """
+    Get the tuple of slices selecting [lo, hi) in the direction and [block_lo, block_hi) in the block axis.
+    """
+
+    slices = [slice(None)]*ndim
+    slices[direction] = slice(lo, hi)
+
+    if block_axis is not None:
+        slices[block_axis] = slice(block_lo, block_hi)
+
+    return tuple(slices)
+
+
+def _applyStencilFortran(data, out, coefficients, direction, out_range, data_start, divisor):
+    """
+    Apply a finite difference stencil with the compiled Fortran kernel. Return False without doing anything if the
+    data type or the memory layout of the arrays is not supported by the kernel.
+    """
+
+    if data.dtype != numpy.float64 or out.dtype != numpy.float64 or data.shape != out.shape or out.ndim > 3:
+        return False
+
+    # The kernel works on Fortran ordered arrays. C ordered arrays are passed as their transposes.
+
+    if not (data.flags.f_contiguous and out.flags.f_contiguous):
+        if not (data.flags.c_contiguous and out.flags.c_contiguous):
+            return False
+
+        data = data.T
+        out = out.T
+        direction = out.ndim - 1 - direction
+
+    shape_3d = out.shape + (1,)*(3 - out.ndim)
+
+    offsets = numpy.array([k for k, coefficient in enumerate(coefficients) if coefficient != 0.0], dtype=numpy.int32)
+    coeffs = numpy.array([coefficients[k] for k in offsets], dtype=numpy.float64)
+
+    pyexplicit_stencil.explicitstencil.apply_stencil(numpy.reshape(data, shape_3d, order='F'), \
+        numpy.reshape(out, shape_3d, order='F'), coeffs, offsets, direction, out_range[0], out_range[1], data_start, \
+        divisor)
+
+    return True
+
+
+def applyStencil(data, out, coefficients, direction, out_range, data_start, divisor=1.0, backend='numpy'):
+    """
+    Apply a finite difference stencil along a direction of data and write the result into out. The terms of the
+    stencil are accumulated in place block by block, so only a small work array is needed instead of a full-size
+    temporary array for each term.
+
+    data : numpy array of the data
+    out : numpy array of the output with the same shape as data
+    coefficients : iterable of the coefficients of the stencil. Zero coefficients are skipped
+    direction : direction to apply the stencil
+    out_range : tuple of the lower (inclusive) and upper (exclusive) indices in the direction of the points to compute
+    data_start : index in the direction of the data point multiplied by the first coefficient for the first point to
+                 compute. The stencil is shifted by one point for each following point
+    divisor : number to divide the sum of the terms by, e.g. the grid spacing
+    backend : string of the backend to apply the stencil. Can be 'numpy' or 'fortran'. The NumPy backend is used
+              if the Fortran backend is not available or does not support the arrays
+    """
+
+    if backend not in backends:
+        raise RuntimeError("Invalid backend! Backend can only be 'numpy' or 'fortran'.")
+
+    lo, hi = out_range
+    num_points = hi - lo
+
+    if num_points <= 0:
+        return
+
+    if backend == 'fortran' and has_fortran_backend:
+        if _applyStencilFortran(data, out, coefficients, direction, out_range, data_start, divisor):
+            return
+
+    ndim = out.ndim
+
+    # Split the work into blocks along the slowest varying axis other than the direction.
+
+    block_axis = None
+    num_blocks_points = 1
+    block_size = 1
+
+    if ndim > 1:
+        axes = [axis for axis in range(ndim) if axis != direction]
+
+        if out.flags.f_contiguous and not out.flags.c_contiguous:
+            block_axis = axes[-1]
+        else:
+            block_axis = axes[0]
+
+        num_blocks_points = out.shape[block_axis]
+        plane_size = num_points*numpy.prod(out.shape)//(out.shape[direction]*max(num_blocks_points, 1))
+        block_size = max(1, max_work_size//max(plane_size, 1))
+
+    work = None
+
+    for block_lo in range(0, num_blocks_points, block_size):
+        block_hi = min(block_lo + block_size, num_blocks_points)
+
+        out_block = out[_getSlices(ndim, direction, lo, hi, block_axis, block_lo, block_hi)]
+
+        is_first_term = True
+
+        for k, coefficient in enumerate(coefficients):
+            if coefficient == 0.0:
+                continue
+
+            data_block = data[_getSlices(ndim, direction, data_start + k, data_start + k + num_points, \
+                                         block_axis, block_lo, block_hi)]
+
+            if is_first_term:
+                numpy.multiply(coefficient, data_block, out=out_block)
+                is_first_term = False
+
+            else:
+                if work is None:
+                    work = numpy.empty(out_block.shape, dtype=out.dtype)
+
+                work_block = work
+                if block_axis is not None and block_hi - block_lo < block_size:
+                    work_block = work[_getSlices(ndim, direction, None, None, block_axis, 0, block_hi - block_lo)]
+
+                numpy.multiply(coefficient, data_block, out=work_block)
+                out_block += work_block
+
+        if divisor != 1.0:
+            out_block /= divisor
+
+
+def fillBoundaries(out, direction, num_boundary_points, value=numpy.NAN):
+    """
+    Fill the points at the two boundaries of out in a direction with a value.
+
+    out : numpy array of the output
+    direction : direction of the boundaries
+    num_boundary_points : number of points at each boundary
+    value : value to fill
+    """
+
+    n = out.shape[direction]
+
+    out[_getSlices(out.ndim, direction, 0, num_boundary_points)] = value
+    out[_getSlices(out.ndim, direction, n - num_boundary_points, n)] = value
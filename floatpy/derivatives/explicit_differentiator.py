@@ -1,22 +1,24 @@
 import numpy
 
-import explicit.first as first_der
-import explicit.second as second_der
+import explicit.finite_difference as finite_difference
+import explicit.stencil as stencil
 
 class ExplicitDifferentiator(object):
     """
     Class to perform derivatives with explicit finite difference schemes.
     """
     
-    def __init__(self, grid_spacing, order, dimension=3, data_order='F'):
+    def __init__(self, grid_spacing, order, dimension=3, data_order='F', backend='numpy'):
         """
         Constructor of the class.
         
         grid_spacing : iterable of floats for the grid spacing in each direction
-        order : integer iterable with each value in {2, 4, 6} representing the order of accuracy of the derivatives
-                in each direction
+        order : integer iterable with each value in {2, 4, 6, 8, 10} representing the order of accuracy of the
+                derivatives in each direction
         dimension : dimension of problem
         data_order : a string {'F', 'C'} describing whether the data is in Fortran or C contiguous layout
+        backend : a string {'numpy', 'fortran'} of the backend to apply the finite difference stencils. The compiled
+                  Fortran backend is threaded with OpenMP and the NumPy backend is used instead if it is not available
         """
         
         if dimension < 1 or dimension > 3:
@@ -31,8 +33,8 @@ class ExplicitDifferentiator(object):
             raise RuntimeError("Size of 'order' is smaller than problem dimension!")
         
         for i in range(self._dim):
-            if order[i] not in [2, 4, 6]:
-                raise RuntimeError("order[%d] has to be one of {2, 4, 6}" %i)
+            if order[i] not in [2, 4, 6, 8, 10]:
+                raise RuntimeError("order[%d] has to be one of {2, 4, 6, 8, 10}" %i)
         
         self._order = tuple(order)
         
@@ -46,6 +48,14 @@ class ExplicitDifferentiator(object):
             raise RuntimeError("Invalid data order! Data order can only be 'C' or 'F'.")
         
         self._data_order = data_order
+        
+        if backend not in stencil.backends:
+            raise RuntimeError("Invalid backend! Backend can only be 'numpy' or 'fortran'.")
+        
+        if backend == 'fortran' and not stencil.has_fortran_backend:
+            backend = 'numpy'
+        
+        self._backend = backend
     
     
     def getNumberOfGhostCells(self):
@@ -55,28 +65,8 @@ class ExplicitDifferentiator(object):
         
         n_ghosts = numpy.empty(self._dim, dtype=numpy.int32)
         
-        if self._order[0] == 2:
-            n_ghosts[0] = 1
-        elif self._order[0] == 4:
-            n_ghosts[0] = 2
-        elif self._order[0] == 6:
-            n_ghosts[0] = 3
-        
-        if self._dim > 1:
-            if self._order[1] == 2:
-                n_ghosts[1] = 1
-            elif self._order[1] == 4:
-                n_ghosts[1] = 2
-            elif self._order[1] == 6:
-                n_ghosts[1] = 3
-        
-        if self._dim > 2:
-            if self._order[2] == 2:
-                n_ghosts[2] = 1
-            elif self._order[2] == 4:
-                n_ghosts[2] = 2
-            elif self._order[2] == 6:
-                n_ghosts[2] = 3
+        for i in range(self._dim):
+            n_ghosts[i] = self._order[i]//2
         
         return n_ghosts
     
@@ -90,6 +80,15 @@ class ExplicitDifferentiator(object):
         return self.getNumberOfGhostCells()
     
     
+    @property
+    def backend(self):
+        """
+        Return the backend used to apply the finite difference stencils.
+        """
+        
+        return self._backend
+    
+    
     def ddx(self, data, der=None, component_idx=None, use_one_sided=False):
         """
         Method to compute the first order derivative of data in first direction.
@@ -121,21 +120,14 @@ class ExplicitDifferentiator(object):
         
         return_der = True
         if der is None:
-            der = numpy.empty(data_shape, dtype=numpy.float64, order='F')
+            der = numpy.empty(data_shape, dtype=numpy.float64, order=self._data_order)
         else:
             if der.shape != data_shape:
                 raise RuntimeError("Make sure shape of der is consistent with that of data!")
             return_der = False
         
-        if self._order[0] == 2:
-            der[[slice(None)]*self._dim] = first_der.differentiateSecondOrderFiniteDifference(\
-                data, self._dx, 0, component_idx, use_one_sided, self._dim, self._data_order)
-        elif self._order[0] == 4:
-            der[[slice(None)]*self._dim] = first_der.differentiateFourthOrderFiniteDifference(\
-                data, self._dx, 0, component_idx, use_one_sided, self._dim, self._data_order)
-        elif self._order[0] == 6:
-            der[[slice(None)]*self._dim] = first_der.differentiateSixthOrderFiniteDifference(\
-                data, self._dx, 0, component_idx, use_one_sided, self._dim, self._data_order)
+        finite_difference.differentiateFiniteDifference(data, self._dx, 0, 1, self._order[0], component_idx, \
+            use_one_sided, self._dim, self._data_order, diff_data=der, backend=self._backend)
         
         if return_der:
             return der
@@ -172,21 +164,14 @@ class ExplicitDifferentiator(object):
         
         return_der = True
         if der is None:
-            der = numpy.empty(data_shape, dtype=numpy.float64, order='F')
+            der = numpy.empty(data_shape, dtype=numpy.float64, order=self._data_order)
         else:
             if der.shape != data_shape:
                 raise RuntimeError("Make sure shape of der is consistent with that of data!")
             return_der = False
         
-        if self._order[1] == 2:
-            der[[slice(None)]*self._dim] = first_der.differentiateSecondOrderFiniteDifference(\
-                data, self._dy, 1, component_idx, use_one_sided, self._dim, self._data_order)
-        elif self._order[1] == 4:
-            der[[slice(None)]*self._dim] = first_der.differentiateFourthOrderFiniteDifference(\
-                data, self._dy, 1, component_idx, use_one_sided, self._dim, self._data_order)
-        elif self._order[1] == 6:
-            der[[slice(None)]*self._dim] = first_der.differentiateSixthOrderFiniteDifference(\
-                data, self._dy, 1, component_idx, use_one_sided, self._dim, self._data_order)
+        finite_difference.differentiateFiniteDifference(data, self._dy, 1, 1, self._order[1], component_idx, \
+            use_one_sided, self._dim, self._data_order, diff_data=der, backend=self._backend)
         
         if return_der:
             return der
@@ -223,21 +208,14 @@ class ExplicitDifferentiator(object):
         
         return_der = True
         if der is None:
-            der = numpy.empty(data_shape, dtype=numpy.float64, order='F')
+            der = numpy.empty(data_shape, dtype=numpy.float64, order=self._data_order)
         else:
             if der.shape != data_shape:
                 raise RuntimeError("Make sure shape of der is consistent with that of data!")
             return_der = False
         
-        if self._order[2] == 2:
-            der[[slice(None)]*self._dim] = first_der.differentiateSecondOrderFiniteDifference(\
-                data, self._dz, 2, component_idx, use_one_sided, self._dim, self._data_order)
-        elif self._order[2] == 4:
-            der[[slice(None)]*self._dim] = first_der.differentiateFourthOrderFiniteDifference(\
-                data, self._dz, 2, component_idx, use_one_sided, self._dim, self._data_order)
-        elif self._order[2] == 6:
-            der[[slice(None)]*self._dim] = first_der.differentiateSixthOrderFiniteDifference(\
-                data, self._dz, 2, component_idx, use_one_sided, self._dim, self._data_order)
+        finite_difference.differentiateFiniteDifference(data, self._dz, 2, 1, self._order[2], component_idx, \
+            use_one_sided, self._dim, self._data_order, diff_data=der, backend=self._backend)
         
         if return_der:
             return der
@@ -274,21 +252,14 @@ class ExplicitDifferentiator(object):
         
         return_der = True
         if der is None:
-            der = numpy.empty(data_shape, dtype=numpy.float64, order='F')
+            der = numpy.empty(data_shape, dtype=numpy.float64, order=self._data_order)
         else:
             if der.shape != data_shape:
                 raise RuntimeError("Make sure shape of der is consistent with that of data!")
             return_der = False
         
-        if self._order[0] == 2:
-            der[[slice(None)]*self._dim] = second_der.differentiateSecondOrderFiniteDifference(\
-                data, self._dx, 0, component_idx, use_one_sided, self._dim, self._data_order)
-        elif self._order[0] == 4:
-            der[[slice(None)]*self._dim] = second_der.differentiateFourthOrderFiniteDifference(\
-                data, self._dx, 0, component_idx, use_one_sided, self._dim, self._data_order)
-        elif self._order[0] == 6:
-            der[[slice(None)]*self._dim] = second_der.differentiateSixthOrderFiniteDifference(\
-                data, self._dx, 0, component_idx, use_one_sided, self._dim, self._data_order)
+        finite_difference.differentiateFiniteDifference(data, self._dx, 0, 2, self._order[0], component_idx, \
+            use_one_sided, self._dim, self._data_order, diff_data=der, backend=self._backend)
         
         if return_der:
             return der
@@ -325,21 +296,14 @@ class ExplicitDifferentiator(object):
         
         return_der = True
         if der is None:
-            der = numpy.empty(data_shape, dtype=numpy.float64, order='F')
+            der = numpy.empty(data_shape, dtype=numpy.float64, order=self._data_order)
         else:
             if der.shape != data_shape:
                 raise RuntimeError("Make sure shape of der is consistent with that of data!")
             return_der = False
         
-        if self._order[1] == 2:
-            der[[slice(None)]*self._dim] = second_der.differentiateSecondOrderFiniteDifference(\
-                data, self._dy, 1, component_idx, use_one_sided, self._dim, self._data_order)
-        elif self._order[1] == 4:
-            der[[slice(None)]*self._dim] = second_der.differentiateFourthOrderFiniteDifference(\
-                data, self._dy, 1, component_idx, use_one_sided, self._dim, self._data_order)
-        elif self._order[1] == 6:
-            der[[slice(None)]*self._dim] = second_der.differentiateSixthOrderFiniteDifference(\
-                data, self._dy, 1, component_idx, use_one_sided, self._dim, self._data_order)
+        finite_difference.differentiateFiniteDifference(data, self._dy, 1, 2, self._order[1], component_idx, \
+            use_one_sided, self._dim, self._data_order, diff_data=der, backend=self._backend)
         
         if return_der:
             return der
@@ -376,21 +340,14 @@ class ExplicitDifferentiator(object):
         
         return_der = True
         if der is None:
-            der = numpy.empty(data_shape, dtype=numpy.float64, order='F')
+            der = numpy.empty(data_shape, dtype=numpy.float64, order=self._data_order)
         else:
             if der.shape != data_shape:
                 raise RuntimeError("Make sure shape of der is consistent with that of data!")
             return_der = False
         
-        if self._order[2] == 2:
-            der[[slice(None)]*self._dim] = second_der.differentiateSecondOrderFiniteDifference(\
-                data, self._dz, 2, component_idx, use_one_sided, self._dim, self._data_order)
-        elif self._order[2] == 4:
-            der[[slice(None)]*self._dim] = second_der.differentiateFourthOrderFiniteDifference(\
-                data, self._dz, 2, component_idx, use_one_sided, self._dim, self._data_order)
-        elif self._order[2] == 6:
-            der[[slice(None)]*self._dim] = second_der.differentiateSixthOrderFiniteDifference(\
-                data, self._dz, 2, component_idx, use_one_sided, self._dim, self._data_order)
+        finite_difference.differentiateFiniteDifference(data, self._dz, 2, 2, self._order[2], component_idx, \
+            use_one_sided, self._dim, self._data_order, diff_data=der, backend=self._backend)
         
         if return_der:
             return der
@@ -529,3 +486,163 @@ class ExplicitDifferentiator(object):
             laplacian = laplacian + self.d2dz2(data, component_idx=component_idx, use_one_sided=use_one_sided)
         
         return laplacian
+    
+    
+    def velocity_gradient_tensor(self, data, use_one_sided=False):
+        """
+        Method to compute the velocity gradient tensor.
+        
+        data : input numpy array in the chosen contiguous layout. This array must be consistent with the problem
+               dimension. The number of components should be as same as the number of dimensions
+        use_one_sided : boolean to decide whether to use one-sided scheme at the boundaries
+        tensor : returned output numpy array in the chosen contiguous layout. In Fortran layout, tensor[..., i, j] is
+                 the derivative of the i-th component in the j-th direction. In C layout, tensor[i, j, ...] is the
+                 same derivative
+        """
+        
+        data_shape = data.shape
+        
+        if len(data_shape) != self._dim + 1:
+            raise RuntimeError("Make sure data is %dD and has enough number of components!" % self._dim)
+        
+        tensor = None
+        if self._data_order == 'C':
+            tensor = numpy.empty((self._dim,) + data_shape, dtype=numpy.float64, order='C')
+        else:
+            tensor = numpy.empty(data_shape + (self._dim,), dtype=numpy.float64, order='F')
+        
+        differentiators = (self.ddx, self.ddy, self.ddz)
+        
+        # The components are contiguous slices of data and of tensor in both layouts, so the derivatives are written
+        # in place into tensor.
+        
+        for j in range(self._dim):
+            for i in range(self._dim):
+                if self._data_order == 'C':
+                    differentiators[j](data[i, ...], tensor[i, j, ...], use_one_sided=use_one_sided)
+                else:
+                    differentiators[j](data[..., i], tensor[..., i, j], use_one_sided=use_one_sided)
+        
+        return tensor
+    
+    
+    def d2dxdy(self, data, der=None, component_idx=None, use_one_sided=False):
+        """
+        Method to compute the mixed second order derivative of data in the first and second directions.
+        
+        data : input numpy array in the chosen contiguous layout. This array must be consistent with the problem dimension
+        der : optional output numpy array in the chosen contiguous layout. This array must be consistent with the problem
+              dimension. This method will return der if der is None
+        component_idx : index of component in data for taking derivative. None if there is only one component in the
+                        data
+        use_one_sided : boolean to decide whether to use one-sided scheme at the boundaries
+        """
+        
+        return self._mixedDerivative(data, (0, 1), der, component_idx, use_one_sided)
+    
+    
+    def d2dxdz(self, data, der=None, component_idx=None, use_one_sided=False):
+        """
+        Method to compute the mixed second order derivative of data in the first and third directions.
+        
+        data : input numpy array in the chosen contiguous layout. This array must be consistent with the problem dimension
+        der : optional output numpy array in the chosen contiguous layout. This array must be consistent with the problem
+              dimension. This method will return der if der is None
+        component_idx : index of component in data for taking derivative. None if there is only one component in the
+                        data
+        use_one_sided : boolean to decide whether to use one-sided scheme at the boundaries
+        """
+        
+        return self._mixedDerivative(data, (0, 2), der, component_idx, use_one_sided)
+    
+    
+    def d2dydz(self, data, der=None, component_idx=None, use_one_sided=False):
+        """
+        Method to compute the mixed second order derivative of data in the second and third directions.
+        
+        data : input numpy array in the chosen contiguous layout. This array must be consistent with the problem dimension
+        der : optional output numpy array in the chosen contiguous layout. This array must be consistent with the problem
+              dimension. This method will return der if der is None
+        component_idx : index of component in data for taking derivative. None if there is only one component in the
+                        data
+        use_one_sided : boolean to decide whether to use one-sided scheme at the boundaries
+        """
+        
+        return self._mixedDerivative(data, (1, 2), der, component_idx, use_one_sided)
+    
+    
+    def hessian(self, data, component_idx=None, use_one_sided=False):
+        """
+        Method to compute the Hessian of data. The first order derivative in each direction is computed only once and
+        all the second order derivatives are written directly into the tensor.
+        
+        data : input numpy array in the chosen contiguous layout. This array must be consistent with the problem
+               dimension
+        component_idx : index of component in data for taking derivative. None if there is only one component in the
+                        data
+        use_one_sided : boolean to decide whether to use one-sided scheme at the boundaries
+        tensor : returned output numpy array in the chosen contiguous layout. In Fortran layout, tensor[..., i, j] is
+                 the second order derivative in the i-th and j-th directions. In C layout, tensor[i, j, ...] is the
+                 same derivative
+        """
+        
+        data_component = self._getComponent(data, component_idx)
+        data_shape = data_component.shape
+        
+        if len(data_shape) != self._dim:
+            raise RuntimeError("Make sure data is %dD!" % self._dim)
+        
+        # The components of the tensor are contiguous slices of the tensor in both layouts.
+        
+        tensor = None
+        components = None
+        if self._data_order == 'C':
+            tensor = numpy.empty((self._dim, self._dim) + data_shape, dtype=numpy.float64, order='C')
+            components = [[tensor[i, j, ...] for j in range(self._dim)] for i in range(self._dim)]
+        else:
+            tensor = numpy.empty(data_shape + (self._dim, self._dim), dtype=numpy.float64, order='F')
+            components = [[tensor[..., i, j] for j in range(self._dim)] for i in range(self._dim)]
+        
+        first_differentiators = (self.ddx, self.ddy, self.ddz)
+        second_differentiators = (self.d2dx2, self.d2dy2, self.d2dz2)
+        
+        for i in range(self._dim):
+            second_differentiators[i](data_component, components[i][i], use_one_sided=use_one_sided)
+            
+            if i < self._dim - 1:
+                der_first = first_differentiators[i](data_component, use_one_sided=use_one_sided)
+                
+                for j in range(i + 1, self._dim):
+                    first_differentiators[j](der_first, components[i][j], use_one_sided=use_one_sided)
+                    components[j][i][...] = components[i][j]
+        
+        return tensor
+    
+    
+    def _getComponent(self, data, component_idx):
+        """
+        Get the data of a component as a contiguous slice of data in the chosen layout.
+        """
+        
+        if component_idx is None:
+            return data
+        
+        if self._data_order == 'C':
+            return data[component_idx, ...]
+        
+        return data[..., component_idx]
+    
+    
+    def _mixedDerivative(self, data, directions, der=None, component_idx=None, use_one_sided=False):
+        """
+        Method to compute the mixed second order derivative of data in two different directions.
+        """
+        
+        if directions[1] >= self._dim:
+            raise RuntimeError("There is no derivative in direction %d for %dD problem!" % (directions[1], self._dim))
+        
+        differentiators = (self.ddx, self.ddy, self.ddz)
+        
+        der_first = differentiators[directions[0]](self._getComponent(data, component_idx), use_one_sided=use_one_sided)
+        
+        return differentiators[directions[1]](der_first, der, use_one_sided=use_one_sided)
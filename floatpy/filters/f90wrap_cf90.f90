@@ -30,6 +30,20 @@ subroutine f90wrap_destroy(this)
     deallocate(this_ptr%p)
 end subroutine f90wrap_destroy
 
+subroutine f90wrap_set_num_threads(this, num_threads_)
+    use cf90stuff, only: set_num_threads, cf90
+    implicit none
+    
+    type cf90_ptr_type
+        type(cf90), pointer :: p => NULL()
+    end type cf90_ptr_type
+    type(cf90_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    integer, intent(in) :: num_threads_
+    this_ptr = transfer(this, this_ptr)
+    call set_num_threads(this=this_ptr%p, num_threads_=num_threads_)
+end subroutine f90wrap_set_num_threads
+
 subroutine f90wrap_filter1(this, f, df, na, nb, bc1_, bcn_, n0, n1, n2, n3, n4, &
     n5)
     use cf90stuff, only: cf90, filter1
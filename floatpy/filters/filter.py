@@ -3,7 +3,7 @@ import numpy
 import pycf90
 import pygaussian
 
-from floatpy.parallel import t3dmod
+from floatpy.parallel import pencil_workspace, t3dmod
 from floatpy.utilities import data_reshaper
 
 class Filter(object):
@@ -11,7 +11,8 @@ class Filter(object):
     Class to perform parallel filter operations
     """
 
-    def __init__(self, grid_partition, filter_type, dimension=3, periodic_dimensions=(False, False, False)):
+    def __init__(self, grid_partition, filter_type, dimension=3, periodic_dimensions=(False, False, False), \
+                 num_threads=None):
         """
         Constructor of the class.
 
@@ -19,6 +20,12 @@ class Filter(object):
         filter_type : string iterable of size 3 with the type of filter to use in each direction
                       options are "compact" and "gaussian"
         periodic_dimensions : boolean iterable of size 3
+        num_threads : number of OpenMP threads of each process for the filters over the independent lines of the
+                      pencils. None for the OpenMP default
+
+        The work buffers are cached in the pencil workspace shared by all the objects using the same grid partition
+        and are kept as long as the grid partition. Call clearWorkspace() to free them, e.g. between the phases of
+        an analysis.
         """
 
         if not isinstance(grid_partition, t3dmod.t3d):
@@ -114,8 +121,48 @@ class Filter(object):
             elif self._filter_type[2] == 'gaussian':
                 self._zfil = pygaussian.gaussianstuff.gaussian( self._nz, self._periodic[2] )
         
+        self.setNumThreads(num_threads)
+        
         # Initialize the data reshaper.
         self._data_reshaper = data_reshaper.DataReshaper(self._dim, data_order='F')
+        
+        # Get the pencil workspace shared by all the objects using the same grid partition.
+        self._workspace = pencil_workspace.getPencilWorkspace(self._grid_partition)
+
+
+    @property
+    def num_threads(self):
+        """
+        Return the number of OpenMP threads used for the filters. None if the OpenMP default is used.
+        """
+
+        return self._num_threads
+
+
+    def setNumThreads(self, num_threads=None):
+        """
+        Set the number of OpenMP threads of each process for the filters over the independent lines of the pencils.
+
+        num_threads : positive integer number of threads. None for the OpenMP default
+        """
+
+        if num_threads is not None and num_threads < 1:
+            raise RuntimeError("Number of threads should be at least 1!")
+
+        self._num_threads = num_threads
+
+        for fil in [self._xfil, self._yfil, self._zfil]:
+            if fil is not None:
+                fil.set_num_threads(0 if num_threads is None else num_threads)
+
+
+    def clearWorkspace(self):
+        """
+        Free the work buffers cached in the pencil workspace. The workspace is shared by all the objects using the same
+        grid partition, so their buffers are freed as well. The buffers are allocated again when they are needed.
+        """
+
+        self._workspace.clear()
 
 
     def filter_x(self, data, data_filtered=None, component_idx=None, bc=(0,0)):
@@ -163,8 +210,8 @@ class Filter(object):
         else:
             return_data_filtered = False
 
-        data_x          = numpy.empty( self._chunk_x_size, dtype=numpy.float64, order='F' )
-        data_filtered_x = numpy.empty( self._chunk_x_size, dtype=numpy.float64, order='F' )
+        data_x          = self._workspace.getBuffer(0, tag='input')
+        data_filtered_x = self._workspace.getBuffer(0, tag='output')
 
         data_3d = []
         if component_idx is None:
@@ -226,8 +273,8 @@ class Filter(object):
         else:
             return_data_filtered = False
 
-        data_y          = numpy.empty( self._chunk_y_size, dtype=numpy.float64, order='F' )
-        data_filtered_y = numpy.empty( self._chunk_y_size, dtype=numpy.float64, order='F' )
+        data_y          = self._workspace.getBuffer(1, tag='input')
+        data_filtered_y = self._workspace.getBuffer(1, tag='output')
 
         data_3d = []
         if component_idx is None:
@@ -285,8 +332,8 @@ class Filter(object):
         else:
             return_data_filtered = False
 
-        data_z          = numpy.empty( self._chunk_z_size, dtype=numpy.float64, order='F' )
-        data_filtered_z = numpy.empty( self._chunk_z_size, dtype=numpy.float64, order='F' )
+        data_z          = self._workspace.getBuffer(2, tag='input')
+        data_filtered_z = self._workspace.getBuffer(2, tag='output')
 
         data_3d = []
         if component_idx is None:
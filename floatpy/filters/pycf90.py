@@ -8,7 +8,7 @@ class Cf90Stuff(f90wrap.runtime.FortranModule):
     Module cf90stuff
     
     
-    Defined at cf90.F90 lines 4-1390
+    Defined at cf90.F90 lines 4-1425
     
     """
     @f90wrap.runtime.register_class("cf90")
@@ -17,7 +17,7 @@ class Cf90Stuff(f90wrap.runtime.FortranModule):
         Type(name=cf90)
         
         
-        Defined at cf90.F90 lines 53-98
+        Defined at cf90.F90 lines 54-100
         
         """
         def __init__(self, n_, periodic_, handle=None):
@@ -25,7 +25,7 @@ class Cf90Stuff(f90wrap.runtime.FortranModule):
             self = Cf90(n_, periodic_)
             
             
-            Defined at cf90.F90 lines 102-170
+            Defined at cf90.F90 lines 104-174
             
             Parameters
             ----------
@@ -45,7 +45,7 @@ class Cf90Stuff(f90wrap.runtime.FortranModule):
             Destructor for class Cf90
             
             
-            Defined at cf90.F90 lines 172-191
+            Defined at cf90.F90 lines 176-195
             
             Parameters
             ----------
@@ -55,12 +55,27 @@ class Cf90Stuff(f90wrap.runtime.FortranModule):
             if self._alloc:
                 _pycf90.f90wrap_destroy(this=self._handle)
         
+        def set_num_threads(self, num_threads_):
+            """
+            set_num_threads(self, num_threads_)
+            
+            
+            Defined at cf90.F90 lines 196-210
+            
+            Parameters
+            ----------
+            this : Cf90
+            num_threads_ : int
+            
+            """
+            _pycf90.f90wrap_set_num_threads(this=self._handle, num_threads_=num_threads_)
+        
         def filter1(self, f, df, na, nb, bc1_=None, bcn_=None):
             """
             filter1(self, f, df, na, nb[, bc1_, bcn_])
             
             
-            Defined at cf90.F90 lines 1176-1246
+            Defined at cf90.F90 lines 1211-1281
             
             Parameters
             ----------
@@ -81,7 +96,7 @@ class Cf90Stuff(f90wrap.runtime.FortranModule):
             filter2(self, f, df, na, nb[, bc1_, bcn_])
             
             
-            Defined at cf90.F90 lines 1248-1318
+            Defined at cf90.F90 lines 1283-1353
             
             Parameters
             ----------
@@ -102,7 +117,7 @@ class Cf90Stuff(f90wrap.runtime.FortranModule):
             filter3(self, f, df, na, nb[, bc1_, bcn_])
             
             
-            Defined at cf90.F90 lines 1320-1390
+            Defined at cf90.F90 lines 1355-1425
             
             Parameters
             ----------
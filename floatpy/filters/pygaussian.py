@@ -8,7 +8,7 @@ class Gaussianstuff(f90wrap.runtime.FortranModule):
     Module gaussianstuff
     
     
-    Defined at gaussian.F90 lines 4-789
+    Defined at gaussian.F90 lines 4-821
     
     """
     @f90wrap.runtime.register_class("gaussian")
@@ -17,7 +17,7 @@ class Gaussianstuff(f90wrap.runtime.FortranModule):
         Type(name=gaussian)
         
         
-        Defined at gaussian.F90 lines 48-68
+        Defined at gaussian.F90 lines 49-70
         
         """
         def __init__(self, n_, periodic_, handle=None):
@@ -25,7 +25,7 @@ class Gaussianstuff(f90wrap.runtime.FortranModule):
             self = Gaussian(n_, periodic_)
             
             
-            Defined at gaussian.F90 lines 72-91
+            Defined at gaussian.F90 lines 74-95
             
             Parameters
             ----------
@@ -45,7 +45,7 @@ class Gaussianstuff(f90wrap.runtime.FortranModule):
             Destructor for class Gaussian
             
             
-            Defined at gaussian.F90 lines 93-100
+            Defined at gaussian.F90 lines 97-104
             
             Parameters
             ----------
@@ -55,12 +55,27 @@ class Gaussianstuff(f90wrap.runtime.FortranModule):
             if self._alloc:
                 _pygaussian.f90wrap_destroy(this=self._handle)
         
+        def set_num_threads(self, num_threads_):
+            """
+            set_num_threads(self, num_threads_)
+            
+            
+            Defined at gaussian.F90 lines 106-119
+            
+            Parameters
+            ----------
+            this : Gaussian
+            num_threads_ : int
+            
+            """
+            _pygaussian.f90wrap_set_num_threads(this=self._handle, num_threads_=num_threads_)
+        
         def filter1(self, f, fil, nb, nc, bc1_=None, bcn_=None):
             """
             filter1(self, f, fil, nb, nc[, bc1_, bcn_])
             
             
-            Defined at gaussian.F90 lines 102-334
+            Defined at gaussian.F90 lines 121-357
             
             Parameters
             ----------
@@ -81,7 +96,7 @@ class Gaussianstuff(f90wrap.runtime.FortranModule):
             filter2(self, f, fil, na, nc[, bc1_, bcn_])
             
             
-            Defined at gaussian.F90 lines 336-564
+            Defined at gaussian.F90 lines 359-591
             
             Parameters
             ----------
@@ -102,7 +117,7 @@ class Gaussianstuff(f90wrap.runtime.FortranModule):
             filter3(self, f, fil, na, nb[, bc1_, bcn_])
             
             
-            Defined at gaussian.F90 lines 566-789
+            Defined at gaussian.F90 lines 593-821
             
             Parameters
             ----------
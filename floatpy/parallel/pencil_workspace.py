@@ -0,0 +1,124 @@
+import numpy
+import weakref
+
+from floatpy.parallel import t3dmod
+
+# Workspaces shared by all the objects using the same grid partition.
+_workspaces = weakref.WeakKeyDictionary()
+
+def getPencilWorkspace(grid_partition):
+    """
+    Return the pencil workspace shared by all the objects using the given grid partition. The workspace is created
+    the first time it is requested and freed together with the grid partition.
+
+    grid_partition : t3d object or the grid_partition property of the parallel data reader class
+    """
+
+    if grid_partition not in _workspaces:
+        _workspaces[grid_partition] = PencilWorkspace(grid_partition)
+
+    return _workspaces[grid_partition]
+
+
+class PencilWorkspace(object):
+    """
+    Class to hand out preallocated work buffers in the shape of the pencils or the 3D decomposition of a grid
+    partition. The buffers are cached and reused across calls instead of being allocated every time. Buffers are keyed
+    by the direction of the pencil, the data type and a tag so that different users of the same workspace can hold
+    buffers at the same time without overwriting each other.
+
+    Only one buffer is kept for each key. It grows to the largest number of components requested with the key and
+    the leading components of it are returned, so requests with different numbers of components share the memory.
+    The content of a buffer is only valid until the next request with the same key.
+    """
+
+    def __init__(self, grid_partition):
+        """
+        Constructor of the class.
+
+        grid_partition : t3d object or the grid_partition property of the parallel data reader class
+        """
+
+        if not isinstance(grid_partition, t3dmod.t3d):
+            raise RuntimeError("The given grid partition object is not an instance of the t3d class!")
+
+        # Get the sizes of the chunk from the 3D decomposition and the pencils in each direction.
+
+        self._3d_size = numpy.empty(3, dtype=numpy.int32)
+        grid_partition.get_sz3d(self._3d_size)
+
+        self._pencil_sizes = [numpy.empty(3, dtype=numpy.int32) for i in range(3)]
+        grid_partition.get_szx(self._pencil_sizes[0])
+        grid_partition.get_szy(self._pencil_sizes[1])
+        grid_partition.get_szz(self._pencil_sizes[2])
+
+        self._buffers = {}
+        self._views = {}
+
+
+    @property
+    def num_buffers(self):
+        """
+        Return the number of cached buffers.
+        """
+
+        return len(self._buffers)
+
+
+    @property
+    def num_bytes(self):
+        """
+        Return the total number of bytes of the cached buffers.
+        """
+
+        return sum([buffer.nbytes for buffer in self._buffers.values()])
+
+
+    def getBuffer(self, direction, dtype=numpy.float64, num_components=1, tag=0):
+        """
+        Return a Fortran ordered work buffer in the shape of the pencil in a direction. The shape of the buffer is 3D if
+        there is only one component and 4D with the components in the last dimension otherwise.
+
+        direction : direction of the pencil (0, 1 or 2). None for the 3D decomposition
+        dtype : data type of the buffer
+        num_components : number of components of the buffer
+        tag : hashable tag to distinguish buffers with the same shape and data type that are needed at the same time
+        """
+
+        if direction is not None and (direction < 0 or direction > 2):
+            raise RuntimeError('Direction < 0 or > 2 is invalid!')
+
+        if num_components < 1:
+            raise RuntimeError('Number of components should be at least 1!')
+
+        dtype = numpy.dtype(dtype)
+        key = (direction, dtype, tag)
+
+        if key not in self._buffers or self._buffers[key].shape[3] < num_components:
+            if direction is None:
+                shape = tuple(self._3d_size)
+            else:
+                shape = tuple(self._pencil_sizes[direction])
+
+            self._buffers[key] = numpy.empty(shape + (num_components,), dtype=dtype, order='F')
+            self._views[key] = {}
+
+        # The leading components of a Fortran ordered buffer are contiguous. The views are cached as well so that the
+        # same buffer object is returned for the same request.
+
+        if num_components not in self._views[key]:
+            if num_components == 1:
+                self._views[key][num_components] = self._buffers[key][:, :, :, 0]
+            else:
+                self._views[key][num_components] = self._buffers[key][:, :, :, 0:num_components]
+
+        return self._views[key][num_components]
+
+
+    def clear(self):
+        """
+        Free all the cached buffers.
+        """
+
+        self._buffers = {}
+        self._views = {}
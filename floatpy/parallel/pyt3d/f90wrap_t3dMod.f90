@@ -210,6 +210,366 @@ subroutine f90wrap_transpose_z_to_3d(this, input, output, n0, n1, n2, n3, n4, &
     call transpose_z_to_3d(this=this_ptr%p, input=input, output=output)
 end subroutine f90wrap_transpose_z_to_3d
 
+subroutine f90wrap_transpose_3d_to_x_batched(this, input, output, n0, n1, n2, n3, &
+    n4, n5, n6, n7)
+    use t3dmod, only: t3d, transpose_3d_to_x_batched
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    real(8), intent(in), dimension(n0,n1,n2,n3) :: input
+    real(8), intent(inout), dimension(n4,n5,n6,n7) :: output
+    integer :: n0
+    !f2py intent(hide), depend(input) :: n0 = shape(input,0)
+    integer :: n1
+    !f2py intent(hide), depend(input) :: n1 = shape(input,1)
+    integer :: n2
+    !f2py intent(hide), depend(input) :: n2 = shape(input,2)
+    integer :: n3
+    !f2py intent(hide), depend(input) :: n3 = shape(input,3)
+    integer :: n4
+    !f2py intent(hide), depend(output) :: n4 = shape(output,0)
+    integer :: n5
+    !f2py intent(hide), depend(output) :: n5 = shape(output,1)
+    integer :: n6
+    !f2py intent(hide), depend(output) :: n6 = shape(output,2)
+    integer :: n7
+    !f2py intent(hide), depend(output) :: n7 = shape(output,3)
+    this_ptr = transfer(this, this_ptr)
+    call transpose_3d_to_x_batched(this=this_ptr%p, input=input, output=output)
+end subroutine f90wrap_transpose_3d_to_x_batched
+
+subroutine f90wrap_transpose_x_to_3d_batched(this, input, output, n0, n1, n2, n3, &
+    n4, n5, n6, n7)
+    use t3dmod, only: t3d, transpose_x_to_3d_batched
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    real(8), intent(in), dimension(n0,n1,n2,n3) :: input
+    real(8), intent(inout), dimension(n4,n5,n6,n7) :: output
+    integer :: n0
+    !f2py intent(hide), depend(input) :: n0 = shape(input,0)
+    integer :: n1
+    !f2py intent(hide), depend(input) :: n1 = shape(input,1)
+    integer :: n2
+    !f2py intent(hide), depend(input) :: n2 = shape(input,2)
+    integer :: n3
+    !f2py intent(hide), depend(input) :: n3 = shape(input,3)
+    integer :: n4
+    !f2py intent(hide), depend(output) :: n4 = shape(output,0)
+    integer :: n5
+    !f2py intent(hide), depend(output) :: n5 = shape(output,1)
+    integer :: n6
+    !f2py intent(hide), depend(output) :: n6 = shape(output,2)
+    integer :: n7
+    !f2py intent(hide), depend(output) :: n7 = shape(output,3)
+    this_ptr = transfer(this, this_ptr)
+    call transpose_x_to_3d_batched(this=this_ptr%p, input=input, output=output)
+end subroutine f90wrap_transpose_x_to_3d_batched
+
+subroutine f90wrap_transpose_3d_to_y_batched(this, input, output, n0, n1, n2, n3, &
+    n4, n5, n6, n7)
+    use t3dmod, only: t3d, transpose_3d_to_y_batched
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    real(8), intent(in), dimension(n0,n1,n2,n3) :: input
+    real(8), intent(inout), dimension(n4,n5,n6,n7) :: output
+    integer :: n0
+    !f2py intent(hide), depend(input) :: n0 = shape(input,0)
+    integer :: n1
+    !f2py intent(hide), depend(input) :: n1 = shape(input,1)
+    integer :: n2
+    !f2py intent(hide), depend(input) :: n2 = shape(input,2)
+    integer :: n3
+    !f2py intent(hide), depend(input) :: n3 = shape(input,3)
+    integer :: n4
+    !f2py intent(hide), depend(output) :: n4 = shape(output,0)
+    integer :: n5
+    !f2py intent(hide), depend(output) :: n5 = shape(output,1)
+    integer :: n6
+    !f2py intent(hide), depend(output) :: n6 = shape(output,2)
+    integer :: n7
+    !f2py intent(hide), depend(output) :: n7 = shape(output,3)
+    this_ptr = transfer(this, this_ptr)
+    call transpose_3d_to_y_batched(this=this_ptr%p, input=input, output=output)
+end subroutine f90wrap_transpose_3d_to_y_batched
+
+subroutine f90wrap_transpose_y_to_3d_batched(this, input, output, n0, n1, n2, n3, &
+    n4, n5, n6, n7)
+    use t3dmod, only: t3d, transpose_y_to_3d_batched
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    real(8), intent(in), dimension(n0,n1,n2,n3) :: input
+    real(8), intent(inout), dimension(n4,n5,n6,n7) :: output
+    integer :: n0
+    !f2py intent(hide), depend(input) :: n0 = shape(input,0)
+    integer :: n1
+    !f2py intent(hide), depend(input) :: n1 = shape(input,1)
+    integer :: n2
+    !f2py intent(hide), depend(input) :: n2 = shape(input,2)
+    integer :: n3
+    !f2py intent(hide), depend(input) :: n3 = shape(input,3)
+    integer :: n4
+    !f2py intent(hide), depend(output) :: n4 = shape(output,0)
+    integer :: n5
+    !f2py intent(hide), depend(output) :: n5 = shape(output,1)
+    integer :: n6
+    !f2py intent(hide), depend(output) :: n6 = shape(output,2)
+    integer :: n7
+    !f2py intent(hide), depend(output) :: n7 = shape(output,3)
+    this_ptr = transfer(this, this_ptr)
+    call transpose_y_to_3d_batched(this=this_ptr%p, input=input, output=output)
+end subroutine f90wrap_transpose_y_to_3d_batched
+
+subroutine f90wrap_transpose_3d_to_z_batched(this, input, output, n0, n1, n2, n3, &
+    n4, n5, n6, n7)
+    use t3dmod, only: t3d, transpose_3d_to_z_batched
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    real(8), intent(in), dimension(n0,n1,n2,n3) :: input
+    real(8), intent(inout), dimension(n4,n5,n6,n7) :: output
+    integer :: n0
+    !f2py intent(hide), depend(input) :: n0 = shape(input,0)
+    integer :: n1
+    !f2py intent(hide), depend(input) :: n1 = shape(input,1)
+    integer :: n2
+    !f2py intent(hide), depend(input) :: n2 = shape(input,2)
+    integer :: n3
+    !f2py intent(hide), depend(input) :: n3 = shape(input,3)
+    integer :: n4
+    !f2py intent(hide), depend(output) :: n4 = shape(output,0)
+    integer :: n5
+    !f2py intent(hide), depend(output) :: n5 = shape(output,1)
+    integer :: n6
+    !f2py intent(hide), depend(output) :: n6 = shape(output,2)
+    integer :: n7
+    !f2py intent(hide), depend(output) :: n7 = shape(output,3)
+    this_ptr = transfer(this, this_ptr)
+    call transpose_3d_to_z_batched(this=this_ptr%p, input=input, output=output)
+end subroutine f90wrap_transpose_3d_to_z_batched
+
+subroutine f90wrap_transpose_z_to_3d_batched(this, input, output, n0, n1, n2, n3, &
+    n4, n5, n6, n7)
+    use t3dmod, only: t3d, transpose_z_to_3d_batched
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    real(8), intent(in), dimension(n0,n1,n2,n3) :: input
+    real(8), intent(inout), dimension(n4,n5,n6,n7) :: output
+    integer :: n0
+    !f2py intent(hide), depend(input) :: n0 = shape(input,0)
+    integer :: n1
+    !f2py intent(hide), depend(input) :: n1 = shape(input,1)
+    integer :: n2
+    !f2py intent(hide), depend(input) :: n2 = shape(input,2)
+    integer :: n3
+    !f2py intent(hide), depend(input) :: n3 = shape(input,3)
+    integer :: n4
+    !f2py intent(hide), depend(output) :: n4 = shape(output,0)
+    integer :: n5
+    !f2py intent(hide), depend(output) :: n5 = shape(output,1)
+    integer :: n6
+    !f2py intent(hide), depend(output) :: n6 = shape(output,2)
+    integer :: n7
+    !f2py intent(hide), depend(output) :: n7 = shape(output,3)
+    this_ptr = transfer(this, this_ptr)
+    call transpose_z_to_3d_batched(this=this_ptr%p, input=input, output=output)
+end subroutine f90wrap_transpose_z_to_3d_batched
+
+subroutine f90wrap_transpose_3d_to_x_complex(this, input, output, n0, n1, n2, n3, &
+    n4, n5)
+    use t3dmod, only: t3d, transpose_3d_to_x_complex
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    complex(8), intent(in), dimension(n0,n1,n2) :: input
+    complex(8), intent(inout), dimension(n3,n4,n5) :: output
+    integer :: n0
+    !f2py intent(hide), depend(input) :: n0 = shape(input,0)
+    integer :: n1
+    !f2py intent(hide), depend(input) :: n1 = shape(input,1)
+    integer :: n2
+    !f2py intent(hide), depend(input) :: n2 = shape(input,2)
+    integer :: n3
+    !f2py intent(hide), depend(output) :: n3 = shape(output,0)
+    integer :: n4
+    !f2py intent(hide), depend(output) :: n4 = shape(output,1)
+    integer :: n5
+    !f2py intent(hide), depend(output) :: n5 = shape(output,2)
+    this_ptr = transfer(this, this_ptr)
+    call transpose_3d_to_x_complex(this=this_ptr%p, input=input, output=output)
+end subroutine f90wrap_transpose_3d_to_x_complex
+
+subroutine f90wrap_transpose_x_to_3d_complex(this, input, output, n0, n1, n2, n3, &
+    n4, n5)
+    use t3dmod, only: t3d, transpose_x_to_3d_complex
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    complex(8), intent(in), dimension(n0,n1,n2) :: input
+    complex(8), intent(inout), dimension(n3,n4,n5) :: output
+    integer :: n0
+    !f2py intent(hide), depend(input) :: n0 = shape(input,0)
+    integer :: n1
+    !f2py intent(hide), depend(input) :: n1 = shape(input,1)
+    integer :: n2
+    !f2py intent(hide), depend(input) :: n2 = shape(input,2)
+    integer :: n3
+    !f2py intent(hide), depend(output) :: n3 = shape(output,0)
+    integer :: n4
+    !f2py intent(hide), depend(output) :: n4 = shape(output,1)
+    integer :: n5
+    !f2py intent(hide), depend(output) :: n5 = shape(output,2)
+    this_ptr = transfer(this, this_ptr)
+    call transpose_x_to_3d_complex(this=this_ptr%p, input=input, output=output)
+end subroutine f90wrap_transpose_x_to_3d_complex
+
+subroutine f90wrap_transpose_3d_to_y_complex(this, input, output, n0, n1, n2, n3, &
+    n4, n5)
+    use t3dmod, only: t3d, transpose_3d_to_y_complex
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    complex(8), intent(in), dimension(n0,n1,n2) :: input
+    complex(8), intent(inout), dimension(n3,n4,n5) :: output
+    integer :: n0
+    !f2py intent(hide), depend(input) :: n0 = shape(input,0)
+    integer :: n1
+    !f2py intent(hide), depend(input) :: n1 = shape(input,1)
+    integer :: n2
+    !f2py intent(hide), depend(input) :: n2 = shape(input,2)
+    integer :: n3
+    !f2py intent(hide), depend(output) :: n3 = shape(output,0)
+    integer :: n4
+    !f2py intent(hide), depend(output) :: n4 = shape(output,1)
+    integer :: n5
+    !f2py intent(hide), depend(output) :: n5 = shape(output,2)
+    this_ptr = transfer(this, this_ptr)
+    call transpose_3d_to_y_complex(this=this_ptr%p, input=input, output=output)
+end subroutine f90wrap_transpose_3d_to_y_complex
+
+subroutine f90wrap_transpose_y_to_3d_complex(this, input, output, n0, n1, n2, n3, &
+    n4, n5)
+    use t3dmod, only: t3d, transpose_y_to_3d_complex
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    complex(8), intent(in), dimension(n0,n1,n2) :: input
+    complex(8), intent(inout), dimension(n3,n4,n5) :: output
+    integer :: n0
+    !f2py intent(hide), depend(input) :: n0 = shape(input,0)
+    integer :: n1
+    !f2py intent(hide), depend(input) :: n1 = shape(input,1)
+    integer :: n2
+    !f2py intent(hide), depend(input) :: n2 = shape(input,2)
+    integer :: n3
+    !f2py intent(hide), depend(output) :: n3 = shape(output,0)
+    integer :: n4
+    !f2py intent(hide), depend(output) :: n4 = shape(output,1)
+    integer :: n5
+    !f2py intent(hide), depend(output) :: n5 = shape(output,2)
+    this_ptr = transfer(this, this_ptr)
+    call transpose_y_to_3d_complex(this=this_ptr%p, input=input, output=output)
+end subroutine f90wrap_transpose_y_to_3d_complex
+
+subroutine f90wrap_transpose_3d_to_z_complex(this, input, output, n0, n1, n2, n3, &
+    n4, n5)
+    use t3dmod, only: t3d, transpose_3d_to_z_complex
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    complex(8), intent(in), dimension(n0,n1,n2) :: input
+    complex(8), intent(inout), dimension(n3,n4,n5) :: output
+    integer :: n0
+    !f2py intent(hide), depend(input) :: n0 = shape(input,0)
+    integer :: n1
+    !f2py intent(hide), depend(input) :: n1 = shape(input,1)
+    integer :: n2
+    !f2py intent(hide), depend(input) :: n2 = shape(input,2)
+    integer :: n3
+    !f2py intent(hide), depend(output) :: n3 = shape(output,0)
+    integer :: n4
+    !f2py intent(hide), depend(output) :: n4 = shape(output,1)
+    integer :: n5
+    !f2py intent(hide), depend(output) :: n5 = shape(output,2)
+    this_ptr = transfer(this, this_ptr)
+    call transpose_3d_to_z_complex(this=this_ptr%p, input=input, output=output)
+end subroutine f90wrap_transpose_3d_to_z_complex
+
+subroutine f90wrap_transpose_z_to_3d_complex(this, input, output, n0, n1, n2, n3, &
+    n4, n5)
+    use t3dmod, only: t3d, transpose_z_to_3d_complex
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    complex(8), intent(in), dimension(n0,n1,n2) :: input
+    complex(8), intent(inout), dimension(n3,n4,n5) :: output
+    integer :: n0
+    !f2py intent(hide), depend(input) :: n0 = shape(input,0)
+    integer :: n1
+    !f2py intent(hide), depend(input) :: n1 = shape(input,1)
+    integer :: n2
+    !f2py intent(hide), depend(input) :: n2 = shape(input,2)
+    integer :: n3
+    !f2py intent(hide), depend(output) :: n3 = shape(output,0)
+    integer :: n4
+    !f2py intent(hide), depend(output) :: n4 = shape(output,1)
+    integer :: n5
+    !f2py intent(hide), depend(output) :: n5 = shape(output,2)
+    this_ptr = transfer(this, this_ptr)
+    call transpose_z_to_3d_complex(this=this_ptr%p, input=input, output=output)
+end subroutine f90wrap_transpose_z_to_3d_complex
+
 subroutine f90wrap_fill_halo_x(this, array, n0, n1, n2)
     use t3dmod, only: fill_halo_x, t3d
     implicit none
@@ -270,6 +630,109 @@ subroutine f90wrap_fill_halo_z(this, array, n0, n1, n2)
     call fill_halo_z(this=this_ptr%p, array=array)
 end subroutine f90wrap_fill_halo_z
 
+subroutine f90wrap_fill_halo_x_batched(this, array, n0, n1, n2, n3)
+    use t3dmod, only: fill_halo_x_batched, t3d
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    real(8), intent(inout), dimension(n0,n1,n2,n3) :: array
+    integer :: n0
+    !f2py intent(hide), depend(array) :: n0 = shape(array,0)
+    integer :: n1
+    !f2py intent(hide), depend(array) :: n1 = shape(array,1)
+    integer :: n2
+    !f2py intent(hide), depend(array) :: n2 = shape(array,2)
+    integer :: n3
+    !f2py intent(hide), depend(array) :: n3 = shape(array,3)
+    this_ptr = transfer(this, this_ptr)
+    call fill_halo_x_batched(this=this_ptr%p, array=array)
+end subroutine f90wrap_fill_halo_x_batched
+
+subroutine f90wrap_fill_halo_y_batched(this, array, n0, n1, n2, n3)
+    use t3dmod, only: fill_halo_y_batched, t3d
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    real(8), intent(inout), dimension(n0,n1,n2,n3) :: array
+    integer :: n0
+    !f2py intent(hide), depend(array) :: n0 = shape(array,0)
+    integer :: n1
+    !f2py intent(hide), depend(array) :: n1 = shape(array,1)
+    integer :: n2
+    !f2py intent(hide), depend(array) :: n2 = shape(array,2)
+    integer :: n3
+    !f2py intent(hide), depend(array) :: n3 = shape(array,3)
+    this_ptr = transfer(this, this_ptr)
+    call fill_halo_y_batched(this=this_ptr%p, array=array)
+end subroutine f90wrap_fill_halo_y_batched
+
+subroutine f90wrap_fill_halo_z_batched(this, array, n0, n1, n2, n3)
+    use t3dmod, only: fill_halo_z_batched, t3d
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    real(8), intent(inout), dimension(n0,n1,n2,n3) :: array
+    integer :: n0
+    !f2py intent(hide), depend(array) :: n0 = shape(array,0)
+    integer :: n1
+    !f2py intent(hide), depend(array) :: n1 = shape(array,1)
+    integer :: n2
+    !f2py intent(hide), depend(array) :: n2 = shape(array,2)
+    integer :: n3
+    !f2py intent(hide), depend(array) :: n3 = shape(array,3)
+    this_ptr = transfer(this, this_ptr)
+    call fill_halo_z_batched(this=this_ptr%p, array=array)
+end subroutine f90wrap_fill_halo_z_batched
+
+subroutine f90wrap_begin_halo_exchange(this, array, requests, n0, n1, n2, n3)
+    use t3dmod, only: begin_halo_exchange, t3d
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    real(8), intent(inout), dimension(n0,n1,n2,n3) :: array
+    integer, dimension(12), intent(inout) :: requests
+    integer :: n0
+    !f2py intent(hide), depend(array) :: n0 = shape(array,0)
+    integer :: n1
+    !f2py intent(hide), depend(array) :: n1 = shape(array,1)
+    integer :: n2
+    !f2py intent(hide), depend(array) :: n2 = shape(array,2)
+    integer :: n3
+    !f2py intent(hide), depend(array) :: n3 = shape(array,3)
+    this_ptr = transfer(this, this_ptr)
+    call begin_halo_exchange(this=this_ptr%p, array=array, requests=requests)
+end subroutine f90wrap_begin_halo_exchange
+
+subroutine f90wrap_finish_halo_exchange(this, requests)
+    use t3dmod, only: finish_halo_exchange, t3d
+    implicit none
+    
+    type t3d_ptr_type
+        type(t3d), pointer :: p => NULL()
+    end type t3d_ptr_type
+    type(t3d_ptr_type) :: this_ptr
+    integer, intent(in), dimension(2) :: this
+    integer, dimension(12), intent(inout) :: requests
+    this_ptr = transfer(this, this_ptr)
+    call finish_halo_exchange(this=this_ptr%p, requests=requests)
+end subroutine f90wrap_finish_halo_exchange
+
 subroutine f90wrap_optimize_decomposition(this, comm3d, nx, ny, nz, periodic, &
     nghosts)
     use t3dmod, only: t3d, optimize_decomposition
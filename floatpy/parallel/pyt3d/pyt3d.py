@@ -8,7 +8,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
     Module t3dmod
     
     
-    Defined at t3dMod.F90 lines 1-1656
+    Defined at t3dMod.F90 lines 1-2486
     
     """
     @f90wrap.runtime.register_class("t3d")
@@ -17,7 +17,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
         Type(name=t3d)
         
         
-        Defined at t3dMod.F90 lines 19-90
+        Defined at t3dMod.F90 lines 23-94
         
         """
         def init(self, comm3d, nx, ny, nz, px, py, pz, periodic_, reorder, fail, \
@@ -27,7 +27,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
                 createcrosscommunicators])
             
             
-            Defined at t3dMod.F90 lines 98-518
+            Defined at t3dMod.F90 lines 102-522
             
             Parameters
             ----------
@@ -55,7 +55,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             Destructor for class T3D
             
             
-            Defined at t3dMod.F90 lines 520-536
+            Defined at t3dMod.F90 lines 524-540
             
             Parameters
             ----------
@@ -70,7 +70,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             transpose_3d_to_x(self, input, output)
             
             
-            Defined at t3dMod.F90 lines 538-590
+            Defined at t3dMod.F90 lines 542-594
             
             Parameters
             ----------
@@ -86,7 +86,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             transpose_x_to_3d(self, input, output)
             
             
-            Defined at t3dMod.F90 lines 592-633
+            Defined at t3dMod.F90 lines 596-637
             
             Parameters
             ----------
@@ -102,7 +102,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             transpose_3d_to_y(self, input, output)
             
             
-            Defined at t3dMod.F90 lines 635-687
+            Defined at t3dMod.F90 lines 639-691
             
             Parameters
             ----------
@@ -118,7 +118,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             transpose_y_to_3d(self, input, output)
             
             
-            Defined at t3dMod.F90 lines 689-731
+            Defined at t3dMod.F90 lines 693-735
             
             Parameters
             ----------
@@ -134,7 +134,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             transpose_3d_to_z(self, input, output)
             
             
-            Defined at t3dMod.F90 lines 733-785
+            Defined at t3dMod.F90 lines 737-789
             
             Parameters
             ----------
@@ -150,7 +150,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             transpose_z_to_3d(self, input, output)
             
             
-            Defined at t3dMod.F90 lines 787-829
+            Defined at t3dMod.F90 lines 791-833
             
             Parameters
             ----------
@@ -161,12 +161,204 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             """
             _pyt3d.f90wrap_transpose_z_to_3d(this=self._handle, input=input, output=output)
         
+        def transpose_3d_to_x_batched(self, input, output):
+            """
+            transpose_3d_to_x_batched(self, input, output)
+            
+            
+            Defined at t3dMod.F90 lines 835-896
+            
+            Parameters
+            ----------
+            this : T3D
+            input : float array
+            output : float array
+            
+            """
+            _pyt3d.f90wrap_transpose_3d_to_x_batched(this=self._handle, input=input, output=output)
+        
+        def transpose_x_to_3d_batched(self, input, output):
+            """
+            transpose_x_to_3d_batched(self, input, output)
+            
+            
+            Defined at t3dMod.F90 lines 897-957
+            
+            Parameters
+            ----------
+            this : T3D
+            input : float array
+            output : float array
+            
+            """
+            _pyt3d.f90wrap_transpose_x_to_3d_batched(this=self._handle, input=input, output=output)
+        
+        def transpose_3d_to_y_batched(self, input, output):
+            """
+            transpose_3d_to_y_batched(self, input, output)
+            
+            
+            Defined at t3dMod.F90 lines 958-1019
+            
+            Parameters
+            ----------
+            this : T3D
+            input : float array
+            output : float array
+            
+            """
+            _pyt3d.f90wrap_transpose_3d_to_y_batched(this=self._handle, input=input, output=output)
+        
+        def transpose_y_to_3d_batched(self, input, output):
+            """
+            transpose_y_to_3d_batched(self, input, output)
+            
+            
+            Defined at t3dMod.F90 lines 1020-1081
+            
+            Parameters
+            ----------
+            this : T3D
+            input : float array
+            output : float array
+            
+            """
+            _pyt3d.f90wrap_transpose_y_to_3d_batched(this=self._handle, input=input, output=output)
+        
+        def transpose_3d_to_z_batched(self, input, output):
+            """
+            transpose_3d_to_z_batched(self, input, output)
+            
+            
+            Defined at t3dMod.F90 lines 1082-1143
+            
+            Parameters
+            ----------
+            this : T3D
+            input : float array
+            output : float array
+            
+            """
+            _pyt3d.f90wrap_transpose_3d_to_z_batched(this=self._handle, input=input, output=output)
+        
+        def transpose_z_to_3d_batched(self, input, output):
+            """
+            transpose_z_to_3d_batched(self, input, output)
+            
+            
+            Defined at t3dMod.F90 lines 1144-1205
+            
+            Parameters
+            ----------
+            this : T3D
+            input : float array
+            output : float array
+            
+            """
+            _pyt3d.f90wrap_transpose_z_to_3d_batched(this=self._handle, input=input, output=output)
+        
+        def transpose_3d_to_x_complex(self, input, output):
+            """
+            transpose_3d_to_x_complex(self, input, output)
+            
+            
+            Defined at t3dMod.F90 lines 1206-1259
+            
+            Parameters
+            ----------
+            this : T3D
+            input : complex array
+            output : complex array
+            
+            """
+            _pyt3d.f90wrap_transpose_3d_to_x_complex(this=self._handle, input=input, output=output)
+        
+        def transpose_x_to_3d_complex(self, input, output):
+            """
+            transpose_x_to_3d_complex(self, input, output)
+            
+            
+            Defined at t3dMod.F90 lines 1260-1302
+            
+            Parameters
+            ----------
+            this : T3D
+            input : complex array
+            output : complex array
+            
+            """
+            _pyt3d.f90wrap_transpose_x_to_3d_complex(this=self._handle, input=input, output=output)
+        
+        def transpose_3d_to_y_complex(self, input, output):
+            """
+            transpose_3d_to_y_complex(self, input, output)
+            
+            
+            Defined at t3dMod.F90 lines 1303-1356
+            
+            Parameters
+            ----------
+            this : T3D
+            input : complex array
+            output : complex array
+            
+            """
+            _pyt3d.f90wrap_transpose_3d_to_y_complex(this=self._handle, input=input, output=output)
+        
+        def transpose_y_to_3d_complex(self, input, output):
+            """
+            transpose_y_to_3d_complex(self, input, output)
+            
+            
+            Defined at t3dMod.F90 lines 1357-1400
+            
+            Parameters
+            ----------
+            this : T3D
+            input : complex array
+            output : complex array
+            
+            """
+            _pyt3d.f90wrap_transpose_y_to_3d_complex(this=self._handle, input=input, output=output)
+        
+        def transpose_3d_to_z_complex(self, input, output):
+            """
+            transpose_3d_to_z_complex(self, input, output)
+            
+            
+            Defined at t3dMod.F90 lines 1401-1454
+            
+            Parameters
+            ----------
+            this : T3D
+            input : complex array
+            output : complex array
+            
+            """
+            _pyt3d.f90wrap_transpose_3d_to_z_complex(this=self._handle, input=input, output=output)
+        
+        def transpose_z_to_3d_complex(self, input, output):
+            """
+            transpose_z_to_3d_complex(self, input, output)
+            
+            
+            Defined at t3dMod.F90 lines 1455-1498
+            
+            Parameters
+            ----------
+            this : T3D
+            input : complex array
+            output : complex array
+            
+            """
+            _pyt3d.f90wrap_transpose_z_to_3d_complex(this=self._handle, input=input, output=output)
+        
         def fill_halo_x(self, array):
             """
             fill_halo_x(self, array)
             
             
-            Defined at t3dMod.F90 lines 1177-1197
+            Defined at t3dMod.F90 lines 1846-1866
             
             Parameters
             ----------
@@ -181,7 +373,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             fill_halo_y(self, array)
             
             
-            Defined at t3dMod.F90 lines 1199-1219
+            Defined at t3dMod.F90 lines 1868-1888
             
             Parameters
             ----------
@@ -196,7 +388,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             fill_halo_z(self, array)
             
             
-            Defined at t3dMod.F90 lines 1221-1242
+            Defined at t3dMod.F90 lines 1890-1911
             
             Parameters
             ----------
@@ -206,12 +398,89 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             """
             _pyt3d.f90wrap_fill_halo_z(this=self._handle, array=array)
         
+        def fill_halo_x_batched(self, array):
+            """
+            fill_halo_x_batched(self, array)
+            
+            
+            Defined at t3dMod.F90 lines 1912-1941
+            
+            Parameters
+            ----------
+            this : T3D
+            array : float array
+            
+            """
+            _pyt3d.f90wrap_fill_halo_x_batched(this=self._handle, array=array)
+        
+        def fill_halo_y_batched(self, array):
+            """
+            fill_halo_y_batched(self, array)
+            
+            
+            Defined at t3dMod.F90 lines 1943-1974
+            
+            Parameters
+            ----------
+            this : T3D
+            array : float array
+            
+            """
+            _pyt3d.f90wrap_fill_halo_y_batched(this=self._handle, array=array)
+        
+        def fill_halo_z_batched(self, array):
+            """
+            fill_halo_z_batched(self, array)
+            
+            
+            Defined at t3dMod.F90 lines 1976-2005
+            
+            Parameters
+            ----------
+            this : T3D
+            array : float array
+            
+            """
+            _pyt3d.f90wrap_fill_halo_z_batched(this=self._handle, array=array)
+        
+        def begin_halo_exchange(self, array, requests):
+            """
+            begin_halo_exchange(self, array, requests)
+            
+            
+            Defined at t3dMod.F90 lines 2008-2060
+            
+            Parameters
+            ----------
+            this : T3D
+            array : float array
+            requests : int array
+            
+            """
+            _pyt3d.f90wrap_begin_halo_exchange(this=self._handle, array=array, \
+                requests=requests)
+        
+        def finish_halo_exchange(self, requests):
+            """
+            finish_halo_exchange(self, requests)
+            
+            
+            Defined at t3dMod.F90 lines 2062-2071
+            
+            Parameters
+            ----------
+            this : T3D
+            requests : int array
+            
+            """
+            _pyt3d.f90wrap_finish_halo_exchange(this=self._handle, requests=requests)
+        
         def __init__(self, comm3d, nx, ny, nz, periodic, nghosts=None, handle=None):
             """
             self = T3D(comm3d, nx, ny, nz, periodic[, nghosts])
             
             
-            Defined at t3dMod.F90 lines 1285-1368
+            Defined at t3dMod.F90 lines 2115-2198
             
             Parameters
             ----------
@@ -236,7 +505,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_sz3d(self, sz3d)
             
             
-            Defined at t3dMod.F90 lines 1470-1475
+            Defined at t3dMod.F90 lines 2300-2305
             
             Parameters
             ----------
@@ -251,7 +520,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_st3d(self, st3d)
             
             
-            Defined at t3dMod.F90 lines 1477-1482
+            Defined at t3dMod.F90 lines 2307-2312
             
             Parameters
             ----------
@@ -266,7 +535,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_en3d(self, en3d)
             
             
-            Defined at t3dMod.F90 lines 1484-1491
+            Defined at t3dMod.F90 lines 2314-2321
             
             Parameters
             ----------
@@ -281,7 +550,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_sz3dg(self, sz3dg)
             
             
-            Defined at t3dMod.F90 lines 1493-1498
+            Defined at t3dMod.F90 lines 2323-2328
             
             Parameters
             ----------
@@ -296,7 +565,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_st3dg(self, st3dg)
             
             
-            Defined at t3dMod.F90 lines 1500-1505
+            Defined at t3dMod.F90 lines 2330-2335
             
             Parameters
             ----------
@@ -311,7 +580,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_en3dg(self, en3dg)
             
             
-            Defined at t3dMod.F90 lines 1507-1514
+            Defined at t3dMod.F90 lines 2337-2344
             
             Parameters
             ----------
@@ -326,7 +595,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_szx(self, szx)
             
             
-            Defined at t3dMod.F90 lines 1516-1521
+            Defined at t3dMod.F90 lines 2346-2351
             
             Parameters
             ----------
@@ -341,7 +610,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_stx(self, stx)
             
             
-            Defined at t3dMod.F90 lines 1523-1528
+            Defined at t3dMod.F90 lines 2353-2358
             
             Parameters
             ----------
@@ -356,7 +625,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_enx(self, enx)
             
             
-            Defined at t3dMod.F90 lines 1530-1536
+            Defined at t3dMod.F90 lines 2360-2366
             
             Parameters
             ----------
@@ -371,7 +640,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_szy(self, szy)
             
             
-            Defined at t3dMod.F90 lines 1538-1543
+            Defined at t3dMod.F90 lines 2368-2373
             
             Parameters
             ----------
@@ -386,7 +655,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_sty(self, sty)
             
             
-            Defined at t3dMod.F90 lines 1545-1550
+            Defined at t3dMod.F90 lines 2375-2380
             
             Parameters
             ----------
@@ -401,7 +670,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_eny(self, eny)
             
             
-            Defined at t3dMod.F90 lines 1552-1558
+            Defined at t3dMod.F90 lines 2382-2388
             
             Parameters
             ----------
@@ -416,7 +685,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_szz(self, szz)
             
             
-            Defined at t3dMod.F90 lines 1560-1565
+            Defined at t3dMod.F90 lines 2390-2395
             
             Parameters
             ----------
@@ -431,7 +700,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_stz(self, stz)
             
             
-            Defined at t3dMod.F90 lines 1567-1572
+            Defined at t3dMod.F90 lines 2397-2402
             
             Parameters
             ----------
@@ -446,7 +715,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             get_enz(self, enz)
             
             
-            Defined at t3dMod.F90 lines 1574-1579
+            Defined at t3dMod.F90 lines 2404-2409
             
             Parameters
             ----------
@@ -461,7 +730,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             comm3d = comm3d(self)
             
             
-            Defined at t3dMod.F90 lines 1581-1586
+            Defined at t3dMod.F90 lines 2411-2416
             
             Parameters
             ----------
@@ -480,7 +749,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             commx = commx(self)
             
             
-            Defined at t3dMod.F90 lines 1588-1593
+            Defined at t3dMod.F90 lines 2418-2423
             
             Parameters
             ----------
@@ -499,7 +768,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             commy = commy(self)
             
             
-            Defined at t3dMod.F90 lines 1595-1600
+            Defined at t3dMod.F90 lines 2425-2430
             
             Parameters
             ----------
@@ -518,7 +787,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             commz = commz(self)
             
             
-            Defined at t3dMod.F90 lines 1602-1607
+            Defined at t3dMod.F90 lines 2432-2437
             
             Parameters
             ----------
@@ -537,7 +806,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             commxy = commxy(self)
             
             
-            Defined at t3dMod.F90 lines 1609-1614
+            Defined at t3dMod.F90 lines 2439-2444
             
             Parameters
             ----------
@@ -556,7 +825,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             commyz = commyz(self)
             
             
-            Defined at t3dMod.F90 lines 1616-1621
+            Defined at t3dMod.F90 lines 2446-2451
             
             Parameters
             ----------
@@ -575,7 +844,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             commxz = commxz(self)
             
             
-            Defined at t3dMod.F90 lines 1623-1628
+            Defined at t3dMod.F90 lines 2453-2458
             
             Parameters
             ----------
@@ -594,7 +863,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             px = px(self)
             
             
-            Defined at t3dMod.F90 lines 1630-1635
+            Defined at t3dMod.F90 lines 2460-2465
             
             Parameters
             ----------
@@ -613,7 +882,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             py = py(self)
             
             
-            Defined at t3dMod.F90 lines 1637-1642
+            Defined at t3dMod.F90 lines 2467-2472
             
             Parameters
             ----------
@@ -632,7 +901,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             pz = pz(self)
             
             
-            Defined at t3dMod.F90 lines 1644-1649
+            Defined at t3dMod.F90 lines 2474-2479
             
             Parameters
             ----------
@@ -651,7 +920,7 @@ class T3Dmod(f90wrap.runtime.FortranModule):
             nprocs = nprocs(self)
             
             
-            Defined at t3dMod.F90 lines 1651-1656
+            Defined at t3dMod.F90 lines 2481-2486
             
             Parameters
             ----------
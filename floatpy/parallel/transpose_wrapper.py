@@ -1,6 +1,6 @@
 import numpy
 
-from floatpy.parallel import t3dmod
+from floatpy.parallel import pencil_workspace, t3dmod
 from floatpy.utilities import data_reshaper
 
 class TransposeWrapper(object):
@@ -74,6 +74,9 @@ class TransposeWrapper(object):
         
         # Initialize the data reshaper.
         self._data_reshaper = data_reshaper.DataReshaper(self._dim, data_order='F')
+        
+        # Get the pencil workspace shared by all the objects using the same grid partition.
+        self._workspace = pencil_workspace.getPencilWorkspace(self._grid_partition)
     
     
     @property
@@ -94,15 +97,21 @@ class TransposeWrapper(object):
         return tuple(self._pencil_size[0:self._dim])
     
     
-    def transposeToPencil(self, data):
+    def transposeToPencil(self, data, use_workspace=False):
         """
         Transpose data to pencil.
         
-        data : data to transpose
+        data : data to transpose. Complex data is only supported with type complex128
+        use_workspace : whether to return a buffer from the pencil workspace shared by all the objects using the same
+                        grid partition instead of a new array. The buffer is overwritten by the next transpose in the
+                        same direction with the workspace
         """
         
-        if not numpy.all(numpy.isreal(data)):
-            raise ValueError("The given data is complex! Only real data can be transposed.")
+        is_complex = numpy.iscomplexobj(data)
+        
+        if is_complex and data.dtype != numpy.complex128:
+            raise ValueError("The given data is complex but not of type complex128! " + \
+                             "Only real or complex128 data can be transposed.")
         
         num_components = 1
         if data.ndim == self._dim + 1:
@@ -116,46 +125,64 @@ class TransposeWrapper(object):
         data_out = []
         
         if num_components == 1:
-            data_to_transpose = numpy.empty(self._pencil_size, dtype=data.dtype, order='F')
+            if use_workspace:
+                data_to_transpose = self._workspace.getBuffer(self._direction, dtype=data.dtype, \
+                    tag=('transpose', self._direction))
+            else:
+                data_to_transpose = numpy.empty(self._pencil_size, dtype=data.dtype, order='F')
             
             data_3d = self._data_reshaper.reshapeTo3d(data)
             
-            if self._direction == 0:
-                self._grid_partition.transpose_3d_to_x(data_3d, data_to_transpose)
-            elif self._direction == 1:
-                self._grid_partition.transpose_3d_to_y(data_3d, data_to_transpose)
-            else:
-                self._grid_partition.transpose_3d_to_z(data_3d, data_to_transpose)
+            self._transposeToPencil3d(data_3d, data_to_transpose)
             
             data_out = self._data_reshaper.reshapeFrom3d(data_to_transpose)
         
         else:
-            data_to_transpose = numpy.empty(numpy.append(self._pencil_size, num_components), dtype=data.dtype, order='F')
+            if use_workspace:
+                data_to_transpose = self._workspace.getBuffer(self._direction, dtype=data.dtype, \
+                    num_components=num_components, tag=('transpose', self._direction))
+            else:
+                data_to_transpose = numpy.empty(numpy.append(self._pencil_size, num_components), dtype=data.dtype, order='F')
+            
+            if is_complex:
+                # Transpose the components one by one with the native complex transposes.
+                
+                for ic in range(num_components):
+                    data_3d = self._data_reshaper.reshapeTo3d(data, component_idx=ic)
+                    self._transposeToPencil3d(data_3d, data_to_transpose[:, :, :, ic])
             
-            for ic in range(num_components):
-                data_3d = self._data_reshaper.reshapeTo3d(data, component_idx=ic)
+            else:
+                # Transpose all the components with a single all-to-all communication.
+                
+                data_3d = numpy.reshape(data, numpy.append(shape_3d, num_components), order='F')
                 
                 if self._direction == 0:
-                    self._grid_partition.transpose_3d_to_x(data_3d, data_to_transpose[:, :, :, ic])
+                    self._grid_partition.transpose_3d_to_x_batched(data_3d, data_to_transpose)
                 elif self._direction == 1:
-                    self._grid_partition.transpose_3d_to_y(data_3d, data_to_transpose[:, :, :, ic])
+                    self._grid_partition.transpose_3d_to_y_batched(data_3d, data_to_transpose)
                 else:
-                    self._grid_partition.transpose_3d_to_z(data_3d, data_to_transpose[:, :, :, ic])
+                    self._grid_partition.transpose_3d_to_z_batched(data_3d, data_to_transpose)
             
             data_out = self._data_reshaper.reshapeFrom3d(data_to_transpose)
         
         return data_out
     
     
-    def transposeFromPencil(self, data):
+    def transposeFromPencil(self, data, use_workspace=False):
         """
         Transpose data from pencil.
         
-        data : data to transpose
+        data : data to transpose. Complex data is only supported with type complex128
+        use_workspace : whether to return a buffer from the pencil workspace shared by all the objects using the same
+                        grid partition instead of a new array. The buffer is overwritten by the next transpose in the
+                        same direction with the workspace
         """
         
-        if not numpy.all(numpy.isreal(data)):
-            raise ValueError("The given data is complex! Only real data can be transposed.")
+        is_complex = numpy.iscomplexobj(data)
+        
+        if is_complex and data.dtype != numpy.complex128:
+            raise ValueError("The given data is complex but not of type complex128! " + \
+                             "Only real or complex128 data can be transposed.")
         
         num_components = 1
         if data.ndim == self._dim + 1:
@@ -169,32 +196,88 @@ class TransposeWrapper(object):
         data_out = []
         
         if num_components == 1:
-            data_to_transpose = numpy.empty(self._3d_size, dtype=data.dtype, order='F')
+            if use_workspace:
+                data_to_transpose = self._workspace.getBuffer(None, dtype=data.dtype, \
+                    tag=('transpose', self._direction))
+            else:
+                data_to_transpose = numpy.empty(self._3d_size, dtype=data.dtype, order='F')
             
             data_pencil = self._data_reshaper.reshapeTo3d(data)
             
-            if self._direction == 0:
-                self._grid_partition.transpose_x_to_3d(data_pencil, data_to_transpose)
-            elif self._direction == 1:
-                self._grid_partition.transpose_y_to_3d(data_pencil, data_to_transpose)
-            else:
-                self._grid_partition.transpose_z_to_3d(data_pencil, data_to_transpose)
+            self._transposeFromPencil3d(data_pencil, data_to_transpose)
             
             data_out = self._data_reshaper.reshapeFrom3d(data_to_transpose)
         
         else:
-            data_to_transpose = numpy.empty(numpy.append(self._3d_size, num_components), dtype=data.dtype, order='F')
+            if use_workspace:
+                data_to_transpose = self._workspace.getBuffer(None, dtype=data.dtype, \
+                    num_components=num_components, tag=('transpose', self._direction))
+            else:
+                data_to_transpose = numpy.empty(numpy.append(self._3d_size, num_components), dtype=data.dtype, order='F')
+            
+            if is_complex:
+                # Transpose the components one by one with the native complex transposes.
+                
+                for ic in range(num_components):
+                    data_pencil = self._data_reshaper.reshapeTo3d(data, component_idx=ic)
+                    self._transposeFromPencil3d(data_pencil, data_to_transpose[:, :, :, ic])
             
-            for ic in range(num_components):
-                data_pencil = self._data_reshaper.reshapeTo3d(data, component_idx=ic)
+            else:
+                # Transpose all the components with a single all-to-all communication.
+                
+                data_pencil = numpy.reshape(data, numpy.append(shape_pencil, num_components), order='F')
                 
                 if self._direction == 0:
-                    self._grid_partition.transpose_x_to_3d(data_pencil, data_to_transpose[:, :, :, ic])
+                    self._grid_partition.transpose_x_to_3d_batched(data_pencil, data_to_transpose)
                 elif self._direction == 1:
-                    self._grid_partition.transpose_y_to_3d(data_pencil, data_to_transpose[:, :, :, ic])
+                    self._grid_partition.transpose_y_to_3d_batched(data_pencil, data_to_transpose)
                 else:
-                    self._grid_partition.transpose_z_to_3d(data_pencil, data_to_transpose[:, :, :, ic])
+                    self._grid_partition.transpose_z_to_3d_batched(data_pencil, data_to_transpose)
             
             data_out = self._data_reshaper.reshapeFrom3d(data_to_transpose)
         
         return data_out
+    
+    
+    def _transposeToPencil3d(self, data_3d, data_pencil):
+        """
+        Transpose a single component of 3D data to pencil with the real or complex transpose.
+        """
+        
+        if numpy.iscomplexobj(data_3d):
+            if self._direction == 0:
+                self._grid_partition.transpose_3d_to_x_complex(data_3d, data_pencil)
+            elif self._direction == 1:
+                self._grid_partition.transpose_3d_to_y_complex(data_3d, data_pencil)
+            else:
+                self._grid_partition.transpose_3d_to_z_complex(data_3d, data_pencil)
+        
+        else:
+            if self._direction == 0:
+                self._grid_partition.transpose_3d_to_x(data_3d, data_pencil)
+            elif self._direction == 1:
+                self._grid_partition.transpose_3d_to_y(data_3d, data_pencil)
+            else:
+                self._grid_partition.transpose_3d_to_z(data_3d, data_pencil)
+    
+    
+    def _transposeFromPencil3d(self, data_pencil, data_3d):
+        """
+        Transpose a single component of 3D data from pencil with the real or complex transpose.
+        """
+        
+        if numpy.iscomplexobj(data_pencil):
+            if self._direction == 0:
+                self._grid_partition.transpose_x_to_3d_complex(data_pencil, data_3d)
+            elif self._direction == 1:
+                self._grid_partition.transpose_y_to_3d_complex(data_pencil, data_3d)
+            else:
+                self._grid_partition.transpose_z_to_3d_complex(data_pencil, data_3d)
+        
+        else:
+            if self._direction == 0:
+                self._grid_partition.transpose_x_to_3d(data_pencil, data_3d)
+            elif self._direction == 1:
+                self._grid_partition.transpose_y_to_3d(data_pencil, data_3d)
+            else:
+                self._grid_partition.transpose_z_to_3d(data_pencil, data_3d)
@@ -8,15 +8,27 @@ class PadeopsReader(BaseReader):
     Class to read in HDF5 data generated by PadeOps.
     """
     
-    def __init__(self, filename, periodic_dimensions=(False,False,False)):
+    def __init__(self, filename, periodic_dimensions=(False,False,False), keep_open=False, comm=None):
         """
         Constructor of the PadeOps reader class.
+        
+        keep_open : boolean to keep the HDF5 file open across calls until close() is called. The file is also kept
+                    open inside a with statement
+        comm : optional mpi4py communicator object. If it is given, the HDF5 file is opened with the MPI-IO driver
+               and the chunks are read with collective hyperslab reads, so all the processes in the communicator have
+               to construct the reader and call the reading methods together. This requires h5py built with MPI
         """
         
+        if comm is not None and not h5py.get_config().mpi:
+            raise RuntimeError('h5py is not built with MPI support! Collective reads are not available.')
+        
         self.filename = filename
-        vizfile = h5py.File(self.filename, 'r')
+        self._comm = comm
+        vizfile = self._openHDF5File()
         
+        # Get the steps and prefetch the time at each step.
         self._steps = steps = []
+        self._times = {}
         for item in vizfile.items():
             try:
                 step = int( item[0] )
@@ -24,6 +36,7 @@ class PadeopsReader(BaseReader):
                 continue
             if not (step in steps):
                 steps.append(step)
+                self._times[step] = (item[1].attrs)['Time'][0]
             
         # Set the domain size in x, y and z directions respectively.
         self._domain_size = vizfile['coords']['X'].shape[::-1]
@@ -31,7 +44,12 @@ class PadeopsReader(BaseReader):
         # Set periodicity in each direction.
         self._periodic_dimensions = tuple(periodic_dimensions)
 
-        vizfile.close()
+        # Keep the file handle if requested.
+        self._vizfile = None
+        if keep_open:
+            self._vizfile = vizfile
+        else:
+            vizfile.close()
 
         # Step is set to 0 by default.
         self._step = 0
@@ -41,6 +59,75 @@ class PadeopsReader(BaseReader):
         self.chunk = ( (0, self._domain_size[0]), (0, self._domain_size[1]), (0, self._domain_size[2]) )
     
     
+    def __enter__(self):
+        """
+        Keep the HDF5 file open inside a with statement.
+        """
+        
+        if self._vizfile is None:
+            self._vizfile = self._openHDF5File()
+        
+        return self
+    
+    
+    def __exit__(self, exception_type, exception_value, traceback):
+        """
+        Close the HDF5 file at the end of a with statement.
+        """
+        
+        self.close()
+    
+    
+    def close(self):
+        """
+        Close the HDF5 file if it is kept open.
+        """
+        
+        if self._vizfile is not None:
+            self._vizfile.close()
+            self._vizfile = None
+    
+    
+    @property
+    def comm(self):
+        """
+        Return the communicator used for the collective reads. None if the reads are independent.
+        """
+        
+        return self._comm
+    
+    
+    def _openHDF5File(self):
+        """
+        Open the HDF5 file, with the MPI-IO driver if a communicator is used.
+        """
+        
+        if self._comm is not None:
+            return h5py.File(self.filename, 'r', driver='mpio', comm=self._comm)
+        
+        return h5py.File(self.filename, 'r')
+    
+    
+    def _openFile(self):
+        """
+        Return the HDF5 file kept open or open it for a single call.
+        """
+        
+        if self._vizfile is not None:
+            return self._vizfile
+        
+        return self._openHDF5File()
+    
+    
+    def _closeFile(self, vizfile):
+        """
+        Close the HDF5 file unless it is kept open.
+        """
+        
+        if vizfile is not self._vizfile:
+            vizfile.close()
+    
+    
     def setStep(self, step):
         """
         Update the metadata from the summary file in the data directory at a new time step.
@@ -48,10 +135,7 @@ class PadeopsReader(BaseReader):
         
         assert (step in self._steps), "Step to read in is not available in the dataset."
         self._step = step
-
-        vizfile = h5py.File(self.filename, 'r')
-        self._time = (vizfile['%04d' %step].attrs)['Time'][0]
-        vizfile.close()
+        self._time = self._times[step]
     
     
     def getStep(self):
@@ -161,29 +245,17 @@ class PadeopsReader(BaseReader):
         
         chunk_size = (self.chunk[0][1]-self.chunk[0][0], self.chunk[1][1]-self.chunk[1][0], self.chunk[2][1]-self.chunk[2][0])
 
-        vizfile = h5py.File(self.filename, 'r')
+        x_c = numpy.empty( chunk_size, dtype=numpy.float64, order='F' )
+        y_c = numpy.empty( chunk_size, dtype=numpy.float64, order='F' )
+        z_c = numpy.empty( chunk_size, dtype=numpy.float64, order='F' )
 
-        # Read data in C contiguous order using h5py
-        x_c = vizfile['coords']['X'][self.chunk[2][0]:self.chunk[2][1],\
-                                     self.chunk[1][0]:self.chunk[1][1],self.chunk[0][0]:self.chunk[0][1],]
-        y_c = vizfile['coords']['Y'][self.chunk[2][0]:self.chunk[2][1],\
-                                     self.chunk[1][0]:self.chunk[1][1],self.chunk[0][0]:self.chunk[0][1],]
-        z_c = vizfile['coords']['Z'][self.chunk[2][0]:self.chunk[2][1],\
-                                     self.chunk[1][0]:self.chunk[1][1],self.chunk[0][0]:self.chunk[0][1],]
-        
-        # Reshape data to F contiguous order without copying
-        x_c = x_c.reshape( (chunk_size[0]*chunk_size[1]*chunk_size[2]) ).reshape( chunk_size, order='F' )
-        y_c = y_c.reshape( (chunk_size[0]*chunk_size[1]*chunk_size[2]) ).reshape( chunk_size, order='F' )
-        z_c = z_c.reshape( (chunk_size[0]*chunk_size[1]*chunk_size[2]) ).reshape( chunk_size, order='F' )
+        vizfile = self._openFile()
 
-        if x_c.dtype != numpy.float64:
-            x_c = x_c.astype(numpy.float64, casting='same_kind')
-        if y_c.dtype != numpy.float64:
-            y_c = y_c.astype(numpy.float64, casting='same_kind')
-        if z_c.dtype != numpy.float64:
-            z_c = z_c.astype(numpy.float64, casting='same_kind')
+        self._readChunk(vizfile['coords']['X'], x_c)
+        self._readChunk(vizfile['coords']['Y'], y_c)
+        self._readChunk(vizfile['coords']['Z'], z_c)
 
-        vizfile.close()
+        self._closeFile(vizfile)
 
         return x_c, y_c, z_c
     
@@ -191,6 +263,9 @@ class PadeopsReader(BaseReader):
     def readData(self, var_names, data=None):
         """
         Method to read in the a chunk of the data for variables at current vizdump step.
+        
+        data : optional list to store the data. The data is read directly into the elements of the list that are
+               float64 numpy arrays with the chunk shape. Other elements are replaced by new arrays
         """
         
         # If a simple string is passed in, convert to a tuple.
@@ -198,31 +273,60 @@ class PadeopsReader(BaseReader):
             var_names = (var_names,)
         
         chunk_size = (self.chunk[0][1]-self.chunk[0][0], self.chunk[1][1]-self.chunk[1][0], self.chunk[2][1]-self.chunk[2][0])
-        if data == None:
-            _data = [ numpy.zeros( chunk_size ) for i in range(len(var_names)) ]
+        if data is None:
+            _data = [ None for i in range(len(var_names)) ]
         else:
             _data = data
         
-        vizfile = h5py.File(self.filename, 'r')
+        vizfile = self._openFile()
         
         for i in range(len(var_names)):
             var = var_names[i]
 
+            if not ( isinstance(_data[i], numpy.ndarray) and _data[i].dtype == numpy.float64 and \
+                     _data[i].shape == chunk_size ):
+                _data[i] = numpy.empty( chunk_size, dtype=numpy.float64, order='F' )
+
             group = "%04d" %self._step
-            # Read data in C contiguous order using h5py
-            v = vizfile[group][var][self.chunk[2][0]:self.chunk[2][1],\
-                                    self.chunk[1][0]:self.chunk[1][1],self.chunk[0][0]:self.chunk[0][1],]
-            # Reshape data to F contiguous order without copying
-            _data[i] = v.reshape( (chunk_size[0]*chunk_size[1]*chunk_size[2]) ).reshape( chunk_size, order='F' )
-            if _data[i].dtype != numpy.float64:
-                _data[i] = _data[i].astype(numpy.float64, casting='same_kind')
+            self._readChunk(vizfile[group][var], _data[i])
 
-        vizfile.close()
+        self._closeFile(vizfile)
             
-        if data == None:
+        if data is None:
             return tuple(_data)
     
     
+    def _readChunk(self, dataset, data):
+        """
+        Read the chunk of a dataset into a float64 array of the chunk shape. The dataset is stored in C order with
+        indices [z, y, x], so a Fortran ordered array is read into directly through its C ordered transpose. Other
+        arrays are filled through a temporary buffer. The read is collective if a communicator is used.
+        """
+        
+        if self._comm is not None:
+            with dataset.collective:
+                self._readChunkDirect(dataset, data)
+        else:
+            self._readChunkDirect(dataset, data)
+    
+    
+    def _readChunkDirect(self, dataset, data):
+        """
+        Read the hyperslab of the chunk of a dataset into a float64 array of the chunk shape.
+        """
+        
+        source_sel = numpy.s_[self.chunk[2][0]:self.chunk[2][1], \
+                              self.chunk[1][0]:self.chunk[1][1], \
+                              self.chunk[0][0]:self.chunk[0][1]]
+        
+        if data.flags['F_CONTIGUOUS']:
+            dataset.read_direct(data.T, source_sel=source_sel)
+        else:
+            data_c = numpy.empty( data.shape[::-1], dtype=numpy.float64 )
+            dataset.read_direct(data_c, source_sel=source_sel)
+            data[:] = data_c.T
+    
+    
 BaseReader.register(PadeopsReader)
 
 if __name__ == '__main__':
@@ -5,20 +5,25 @@ import os
 import sys
 
 from floatpy.parallel import t3dmod
+from floatpy.utilities.rectilinear_coordinates import RectilinearCoordinates
 
 class ParallelDataReader(object):
     """
     Class to read data and exchange data across nodes with MPI.
     """
     
-    def __init__(self, comm, serial_reader, sub_domain=None, num_ghosts=None):
+    def __init__(self, comm, serial_reader, sub_domain=None, num_ghosts=None, collective_io=False):
         """
         Constructor of the class.
         
         comm : mpi4py communicator object
         serial_reader : a concrete object that extends BaseReader (Do not use this outside of this class)
-        sub_domain : iterable of size 2 with the first entry being lo and second entry being hi
+        sub_domain : iterable of size 2 with the first entry being lo and second entry being hi. The sub-domain is
+                     decomposed instead of the full domain and is not periodic in the directions where it is cut
         num_ghosts : numpy integer array of size 3 with the no. of ghost values in the x, y and z directions respectively
+        collective_io : boolean to read the interior chunks of all the processes with collective MPI-IO reads. The
+                        serial data reader has to be created with the same communicator (e.g. PadeopsReader with
+                        comm=comm)
         """
         
         if not isinstance(serial_reader, BaseReader):
@@ -27,6 +32,17 @@ class ParallelDataReader(object):
         if serial_reader.data_order != 'F':
             raise RuntimeError("The data order should be 'F'!")
         
+        if collective_io:
+            reader_comm = getattr(serial_reader, 'comm', None)
+            
+            if reader_comm is None:
+                raise RuntimeError("The given serial data reader does not support collective reads!")
+            
+            if MPI.Comm.Compare(reader_comm, comm) not in (MPI.IDENT, MPI.CONGRUENT):
+                raise RuntimeError("The serial data reader should use the same communicator for collective reads!")
+        
+        self._collective_io = collective_io
+        
         # Set the communicator and it's Fortran value.
         self._comm  = comm
         self._fcomm = comm.py2f()
@@ -76,30 +92,39 @@ class ParallelDataReader(object):
             self._periodic_dimensions = numpy.asarray(serial_reader.periodic_dimensions)
             self._domain_size = numpy.asarray(serial_reader.domain_size)
        
-        if sub_domain == None:
+        if sub_domain is None:
             self._subdomain_lo = numpy.array([0, 0, 0], dtype=self._domain_size.dtype)
             self._subdomain_hi = self._domain_size - 1
             self._subdomain_size = self._domain_size
         else:
-            # Need to change periodic_dimensions if only reading in a sub-domain
-            raise NotImplementedError('Reading in only a partial sub domain is not yet implemented. Sorry!')
-            
             try:
                 lo, hi = sub_domain
             except ValueError:
                 raise ValueError("Pass an iterable of sub_domain with two items!")
             
+            if len(lo) < self._dim or len(hi) < self._dim:
+                raise ValueError('Size of the indices in sub-domain is smaller than the dimension of data!')
+            
+            self._subdomain_lo = numpy.array([0, 0, 0], dtype=self._domain_size.dtype)
+            self._subdomain_hi = self._domain_size - 1
+            
             for i in range(self._dim):
-                if lo[i] < 0 or lo[i] > self._domain_size[i]:
-                    raise ValueError('Invalid indices in sub-domain. Cannot be < 0 or > domain size!')
-                if hi[i] < 0 or hi[i] > self._domain_size[i]:
-                    raise ValueError('Invalid indices in sub-domain. Cannot be < 0 or > domain size!')
+                if lo[i] < 0 or lo[i] >= self._domain_size[i]:
+                    raise ValueError('Invalid indices in sub-domain. Cannot be < 0 or >= domain size!')
+                if hi[i] < 0 or hi[i] >= self._domain_size[i]:
+                    raise ValueError('Invalid indices in sub-domain. Cannot be < 0 or >= domain size!')
                 if hi[i] < lo[i]:
                     raise ValueError('Invalid indices in sub-domain. Upper bound cannot be smaller than lower bound!')
+                
+                self._subdomain_lo[i] = lo[i]
+                self._subdomain_hi[i] = hi[i]
             
-            self._subdomain_lo = numpy.asarray(lo)
-            self._subdomain_hi = numpy.asarray(hi)
             self._subdomain_size = self._subdomain_hi - self._subdomain_lo + 1
+            
+            # The sub-domain is not periodic in the directions where it is cut from the domain.
+            
+            self._periodic_dimensions = numpy.logical_and(self._periodic_dimensions, \
+                self._subdomain_size == self._domain_size)
         
         # Create the parallel grid partition object that handles all the communication stuff.
         self._grid_partition = t3dmod.t3d(self._fcomm, \
@@ -115,8 +140,8 @@ class ParallelDataReader(object):
         self._grid_partition.get_sz3d(self._interior_chunk_size)
         self._grid_partition.get_st3d(self._interior_chunk_lo)
         self._grid_partition.get_en3d(self._interior_chunk_hi)
-        self._interior_chunk_lo = self._interior_chunk_lo - 1 # Convert to 0 based indexing
-        self._interior_chunk_hi = self._interior_chunk_hi - 1 # Convert to 0 based indexing
+        self._interior_chunk_lo = self._interior_chunk_lo - 1 + self._subdomain_lo # Convert to 0 based global indexing
+        self._interior_chunk_hi = self._interior_chunk_hi - 1 + self._subdomain_lo # Convert to 0 based global indexing
         
         # Size of the full chunk of this process.
         self._full_chunk_size = numpy.zeros(3, dtype=numpy.int32, order='F')
@@ -127,8 +152,8 @@ class ParallelDataReader(object):
         self._grid_partition.get_sz3dg(self._full_chunk_size)
         self._grid_partition.get_st3dg(self._full_chunk_lo)
         self._grid_partition.get_en3dg(self._full_chunk_hi)
-        self._full_chunk_lo = self._full_chunk_lo - 1 # Convert to 0 based indexing
-        self._full_chunk_hi = self._full_chunk_hi - 1 # Convert to 0 based indexing
+        self._full_chunk_lo = self._full_chunk_lo - 1 + self._subdomain_lo # Convert to 0 based global indexing
+        self._full_chunk_hi = self._full_chunk_hi - 1 + self._subdomain_lo # Convert to 0 based global indexing
         
         # Set the sub domain to read in using the serial data reader.
         self._serial_reader.sub_domain = ( tuple(self._interior_chunk_lo), tuple(self._interior_chunk_hi) )
@@ -151,6 +176,15 @@ class ParallelDataReader(object):
         return self._serial_reader
     
     
+    @property
+    def collective_io(self):
+        """
+        Return whether the data is read with collective MPI-IO reads.
+        """
+        
+        return self._collective_io
+    
+    
     @property
     def dimension(self):
         """
@@ -172,7 +206,7 @@ class ParallelDataReader(object):
     @property
     def periodic_dimensions(self):
         """
-        Return a tuple indicating if data is periodic in each dimension.
+        Return a tuple indicating if data in the sub-domain is periodic in each dimension.
         """
         
         return tuple(self._periodic_dimensions[0:self._dim])
@@ -286,21 +320,34 @@ class ParallelDataReader(object):
         Get the coordinates of the stored sub-domain.
         Default to the full domain when the sub-domain is not set.
         (Not yet well implemented with communication!)
+        
+        If the serial data reader returns RectilinearCoordinates, the coordinates of the full chunk are also returned
+        lazily as a RectilinearCoordinates object built from the axes of the interior chunk. As for the dense
+        coordinates, the coordinates in the ghost cells are only filled if communicate is True and are zero otherwise.
         """
         
-        x_c = numpy.zeros( tuple(self._full_chunk_size), dtype=numpy.float64, order='F' )
-        y_c = numpy.zeros( tuple(self._full_chunk_size), dtype=numpy.float64, order='F' )
-        z_c = numpy.zeros( tuple(self._full_chunk_size), dtype=numpy.float64, order='F' )
+        coords_interior = self._serial_reader.readCoordinates()
+        
+        if isinstance(coords_interior, RectilinearCoordinates):
+            return self._getRectilinearCoordinatesInFullChunk(coords_interior, communicate)
+        
+        # Store the coordinates in one array so that they are communicated together.
+        
+        coords = numpy.zeros( tuple(self._full_chunk_size) + (3, ), dtype=numpy.float64, order='F' )
+        
+        x_c = coords[:, :, :, 0]
+        y_c = coords[:, :, :, 1]
+        z_c = coords[:, :, :, 2]
         
         if self._dim == 1:
-            x_coords = self._serial_reader.readCoordinates()
+            x_coords = coords_interior
             
             nx = x_coords.shape[0]
             x_coords = x_coords.reshape((nx, 1, 1), order='F')
             x_c[self._interior] = x_coords
         
         elif self._dim == 2:
-            x_coords, y_coords = self._serial_reader.readCoordinates()
+            x_coords, y_coords = coords_interior
             
             nx = x_coords.shape[0]
             ny = x_coords.shape[1]
@@ -312,25 +359,11 @@ class ParallelDataReader(object):
             y_c[self._interior] = y_coords
         
         else:
-            x_c[self._interior], y_c[self._interior], z_c[self._interior] = self._serial_reader.readCoordinates()
+            x_c[self._interior], y_c[self._interior], z_c[self._interior] = coords_interior
         
         # Communicate to get the coordinates in the ghost cell regions.
         if communicate:
-            self._grid_partition.fill_halo_x(x_c)
-            
-            if self._dim > 1:
-                self._grid_partition.fill_halo_y(x_c)
-                
-                self._grid_partition.fill_halo_x(y_c)
-                self._grid_partition.fill_halo_y(y_c)
-            
-            if self._dim > 2:
-                self._grid_partition.fill_halo_z(x_c)
-                self._grid_partition.fill_halo_z(y_c)
-                
-                self._grid_partition.fill_halo_x(z_c)
-                self._grid_partition.fill_halo_y(z_c)
-                self._grid_partition.fill_halo_z(z_c)
+            self._fillHalos(coords[:, :, :, 0:self._dim])
         
         if self._dim == 1:
             return numpy.squeeze(x_c, (1, 2))
@@ -340,70 +373,174 @@ class ParallelDataReader(object):
             return x_c, y_c, z_c
     
     
+    def _getRectilinearCoordinatesInFullChunk(self, coords_interior, communicate=False):
+        """
+        Get the coordinates of the full chunk as a RectilinearCoordinates object from the 1D axes of the interior
+        chunk. To fill the ghost cells, the 1D axes of the interior chunks of all the processes are gathered into the
+        axes of the whole sub-domain, which are wrapped around in the periodic directions. The ghost cells outside of
+        the sub-domain in the non-periodic directions are zero, as after a halo exchange.
+        """
+        
+        axes_chunk = []
+        
+        for i in range(self._dim):
+            axis_chunk = numpy.zeros(self._full_chunk_size[i], dtype=numpy.float64)
+            axis_chunk[self._interior[i]] = coords_interior.axes[i]
+            
+            if communicate:
+                # Gather the axis of the whole sub-domain. Only the 1D axes are communicated.
+                
+                axis = numpy.zeros(self._subdomain_size[i], dtype=numpy.float64)
+                
+                for lo, axis_interior in self._comm.allgather( (self._interior_chunk_lo[i], coords_interior.axes[i]) ):
+                    lo = lo - self._subdomain_lo[i]
+                    axis[lo:lo + axis_interior.shape[0]] = axis_interior
+                
+                indices = numpy.arange(self._full_chunk_lo[i], self._full_chunk_hi[i] + 1) - self._subdomain_lo[i]
+                
+                if self._periodic_dimensions[i]:
+                    axis_chunk = axis.take(indices, mode='wrap')
+                else:
+                    in_subdomain = numpy.logical_and(indices >= 0, indices < self._subdomain_size[i])
+                    axis_chunk[in_subdomain] = axis[indices[in_subdomain]]
+            
+            axes_chunk.append(axis_chunk)
+        
+        return RectilinearCoordinates(axes_chunk, data_order='F')
+    
+    
     def readData(self, var_names, communicate=False):
         """
         Read the data of several variables in the assigned chunk of the stored sub-domain.
         Default to the full domain when the sub-domain is not set.
         (Not yet well implemented with communication and vector!)
+        With collective reads, all the processes have to call this method with the same variables.
+        
+        The data of all the variables and components is stored in one array so that the ghost cells of all of them
+        are filled with one halo exchange in each direction. The returned arrays are views of this array.
         """
         
         if isinstance(var_names, basestring):
             var_names = (var_names,)
         
-        data_vars = []
+        # Read the data of the variables and get the number of components of each variable.
+        
+        data_serial = []
+        num_components = []
         
         for i in range(len(var_names)):
             data_var, = self._serial_reader.readData(var_names[i])
             
-            num_components = 1
+            data_serial.append(data_var)
+            
             if data_var.ndim == self._dim + 1:
-                num_components = data_var.shape[self._dim]
+                num_components.append(data_var.shape[self._dim])
+            else:
+                num_components.append(1)
+        
+        # Copy the data into one array with the components of all the variables stacked in the last dimension.
+        
+        data_all = numpy.zeros( tuple(self._full_chunk_size) + (sum(num_components), ), dtype=numpy.float64, \
+                                order='F' )
+        
+        data_vars = []
+        component_idx = 0
+        
+        for i in range(len(var_names)):
+            data_var = data_all[:, :, :, component_idx:component_idx + num_components[i]]
+            data_var[self._interior] = data_serial[i].reshape( \
+                tuple(self._interior_chunk_size) + (num_components[i], ), order='F' )
             
-            if num_components == 1:
-                data_vars.append( numpy.zeros( tuple(self._full_chunk_size[0:self._dim]), dtype=numpy.float64, order='F' ) )
-                data_vars[i][self._interior[0:self._dim]] = data_var
+            # Release the data read by the serial reader once it is copied.
+            data_serial[i] = None
             
+            if num_components[i] == 1:
+                data_vars.append( data_var.reshape(tuple(self._full_chunk_size[0:self._dim]), order='F') )
             else:
-                data_vars.append( numpy.zeros( tuple(self._full_chunk_size[0:self._dim]) + (num_components, ), \
-                                               dtype=numpy.float64, order='F' ) )
-                data_vars[i][ self._interior[0:self._dim] + (slice(0, num_components), ) ] = data_var
+                data_vars.append( data_var.reshape(tuple(self._full_chunk_size[0:self._dim]) + \
+                                                   (num_components[i], ), order='F') )
             
-            # Communicate to get the data in the ghost cell regions.
-            if communicate:
-                shape_modified = data_vars[i].shape[0:self._dim]
-                
-                if self._dim == 1:
-                    shape_modified = numpy.append(shape_modified, [1, 1])
-                elif self._dim == 2:
-                    shape_modified = numpy.append(shape_modified, 1)
-                
-                data_to_communicate = []
-                for ic in range(0, num_components):
-                    if self._dim == 1:
-                        if num_components == 1:
-                            data_to_communicate = numpy.reshape(data_vars[i][:], shape_modified, order='F')
-                        else:
-                            data_to_communicate = numpy.reshape(data_vars[i][:, ic], shape_modified, order='F')
-                        
-                        self._grid_partition.fill_halo_x(data_to_communicate)
-                    
-                    elif self._dim == 2:
-                        if num_components == 1:
-                            data_to_communicate = numpy.reshape(data_vars[i][:, :], shape_modified, order='F')
-                        else:
-                            data_to_communicate = numpy.reshape(data_vars[i][:, :, ic], shape_modified, order='F')
-                        
-                        self._grid_partition.fill_halo_x(data_to_communicate)
-                        self._grid_partition.fill_halo_y(data_to_communicate)
-                    
-                    else:
-                        if num_components == 1:
-                            data_to_communicate = data_vars[i]
-                        else:
-                            data_to_communicate = data_vars[i][:, :, :, ic]
-                        
-                        self._grid_partition.fill_halo_x(data_to_communicate)
-                        self._grid_partition.fill_halo_y(data_to_communicate)
-                        self._grid_partition.fill_halo_z(data_to_communicate)
+            component_idx = component_idx + num_components[i]
+        
+        # Communicate to get the data in the ghost cell regions.
+        if communicate:
+            self._fillHalos(data_all)
         
         return tuple(data_vars)
+    
+    
+    def beginHaloExchange(self, data):
+        """
+        Start the non-blocking exchange of the ghost cells next to the faces of the interior chunk. Computations on
+        the interior of the data can be done while the ghost cells are in flight. The ghost cells at the edges and
+        corners of the full chunk are not filled. Return a handle to pass to finishHaloExchange().
+        
+        data : Fortran ordered float64 numpy array with the shape of the full chunk (and optionally a last dimension
+               of components), or an iterable of such arrays. The arrays should not be modified until the exchange is
+               finished
+        """
+        
+        if isinstance(data, numpy.ndarray):
+            data = (data,)
+        
+        handle = []
+        
+        for data_var in data:
+            data_stacked = self._getStackedFieldsView(data_var)
+            
+            requests = numpy.zeros(12, dtype=numpy.int32, order='F')
+            self._grid_partition.begin_halo_exchange(data_stacked, requests)
+            
+            handle.append((data_stacked, requests))
+        
+        return handle
+    
+    
+    def finishHaloExchange(self, handle):
+        """
+        Wait for the exchange of the ghost cells started by beginHaloExchange() to complete.
+        
+        handle : handle returned by beginHaloExchange()
+        """
+        
+        for data_stacked, requests in handle:
+            self._grid_partition.finish_halo_exchange(requests)
+    
+    
+    def _getStackedFieldsView(self, data):
+        """
+        Return a 4D view of a Fortran ordered array of data in the full chunk with the fields stacked in the last
+        dimension.
+        """
+        
+        full_chunk_size = tuple(self._full_chunk_size[0:self._dim])
+        
+        if data.dtype != numpy.float64 or not data.flags['F_CONTIGUOUS']:
+            raise RuntimeError('Data should be a Fortran ordered float64 array!')
+        
+        if data.shape[0:self._dim] != full_chunk_size or data.ndim > self._dim + 1:
+            raise RuntimeError('Shape of data is not consistent with the full chunk!')
+        
+        num_fields = 1
+        if data.ndim == self._dim + 1:
+            num_fields = data.shape[self._dim]
+        
+        return data.reshape(tuple(self._full_chunk_size) + (num_fields, ), order='F')
+    
+    
+    def _fillHalos(self, data):
+        """
+        Fill the ghost cells of several fields stacked in the last dimension of a 4D Fortran ordered array, with one
+        halo exchange in each direction of the domain for all the fields.
+        """
+        
+        if data.shape[3] == 0:
+            return
+        
+        self._grid_partition.fill_halo_x_batched(data)
+        
+        if self._dim > 1:
+            self._grid_partition.fill_halo_y_batched(data)
+        
+        if self._dim > 2:
+            self._grid_partition.fill_halo_z_batched(data)
@@ -4,26 +4,125 @@ Module for reading and handling samrai data.
 
 import copy
 import h5py
+import multiprocessing
+import multiprocessing.pool
 import numpy
+import os
 import re
 
 from floatpy.upsampling import Lagrange_upsampler
+from floatpy.utilities.box_bin_grid import BoxBinGrid
+from floatpy.utilities.rectilinear_coordinates import RectilinearCoordinates
 
 from base_reader import BaseReader
 
+def _readPatchWindow(dataset, patch_shape, patch_window):
+    """
+    Read a window of a patch from the flattened dataset of the patch stored in Fortran order. Only the contiguous
+    range of the dataset between the first and the last elements of the window is read, into a float64 buffer
+    spanning the slices of the window in the slowest varying dimension, and the window is then cropped from the
+    buffer.
+    
+    dataset : HDF5 dataset of the patch
+    patch_shape : tuple of the shape of the patch
+    patch_window : tuple of slices of the window in the patch
+    """
+    
+    dim = len(patch_shape)
+    
+    # Get the strides of the patch in Fortran order.
+    
+    strides = numpy.cumprod((1,) + tuple(patch_shape[:-1]))
+    
+    # Get the flat indices of the first and the last elements of the window.
+    
+    start_idx = sum([patch_window[i].start*strides[i] for i in range(dim)])
+    end_idx = sum([(patch_window[i].stop - 1)*strides[i] for i in range(dim)]) + 1
+    
+    # Read the contiguous range into a buffer of the slices in the slowest varying dimension.
+    
+    buffer_shape = tuple(patch_shape[:-1]) + (patch_window[-1].stop - patch_window[-1].start,)
+    buffer_offset = patch_window[-1].start*strides[-1]
+    
+    buffer_data = numpy.empty(int(numpy.prod(buffer_shape)), dtype = numpy.float64)
+    
+    dataset.read_direct(buffer_data, source_sel = numpy.s_[start_idx:end_idx], \
+        dest_sel = numpy.s_[start_idx - buffer_offset:end_idx - buffer_offset])
+    
+    buffer_data = buffer_data.reshape(buffer_shape, order = 'F')
+    
+    return buffer_data[patch_window[:-1] + (slice(None),)]
+
+
+def _readPatchWindowsFromFileCluster(file_cluster_request):
+    """
+    Read the windows of patches from a file cluster. This is a module level function so that it can be run by a
+    pool of processes.
+    
+    file_cluster_request : tuple of the file cluster number, the path to the file cluster and a list of the requests
+                           of the patches. Each request is a tuple of the path to the patch in the file cluster, the
+                           shape of the patch, the names of the datasets to read and a list of the windows (tuples of
+                           slices) to read from the patch
+    
+    Return a tuple of the file cluster number and a list with the data of each patch as [dataset][window].
+    """
+    
+    file_cluster_num, full_path, patch_requests = file_cluster_request
+    
+    f_input = h5py.File(full_path, 'r')
+    
+    file_cluster_data = []
+    
+    for patch_path, patch_shape, dataset_names, patch_windows in patch_requests:
+        file_cluster_patch = f_input[patch_path]
+        
+        patch_data = []
+        
+        for dataset_name in dataset_names:
+            dataset = file_cluster_patch[dataset_name]
+            patch_data.append([_readPatchWindow(dataset, patch_shape, patch_window) for patch_window in patch_windows])
+        
+        file_cluster_data.append(patch_data)
+    
+    f_input.close()
+    
+    return file_cluster_num, file_cluster_data
+
+
 class SamraiDataReader(BaseReader):
     """
     Class to read samrai data.
     """
     
     def __init__(self, data_directory_path, periodic_dimensions = (False, False, False), \
-                 upsampling_method = 'constant', data_order = 'F'):
+                 upsampling_method = 'constant', data_order = 'F', use_summary_index = False, \
+                 num_workers = 1, worker_type = 'thread'):
         """
         Constructor of the class.
         The current time step of the class is set to the first time step in dump file.
+        
+        use_summary_index : boolean to cache the metadata of the summary file at each time step in an index
+                            folder inside the dump folder. The index is written the first time a step is read and
+                            memory-mapped afterwards instead of parsing the summary file again
+        num_workers : number of workers to load the file clusters concurrently. The file clusters are loaded one at
+                      a time if it is 1
+        worker_type : type of the workers to load the file clusters. Can be 'thread' or 'process'
         """
         
         self._data_directory_path = data_directory_path
+        self._use_summary_index = use_summary_index
+        
+        # Set the workers to load the file clusters.
+        
+        if num_workers < 1:
+            raise RuntimeError('Number of workers should be at least 1!')
+        
+        if worker_type != 'thread' and \
+           worker_type != 'process':
+            raise RuntimeError("Unknown worker type '" + worker_type + "'! Worker type can only be 'thread' or 'process'.")
+        
+        self._num_workers = num_workers
+        self._worker_type = worker_type
         
         # Get the full paths to data at different time steps.
         
@@ -55,6 +154,13 @@ class SamraiDataReader(BaseReader):
         self._step = self._steps[0]
         
         self._basic_info = {}
+        
+        # Initialize the spatial indices of the patches at different levels. They are checked once whenever the
+        # summary is loaded at a new time step and only rebuilt when the patch layout at a level changes.
+        
+        self._patch_bin_grids = {}
+        self._patch_layout_key = None
+        
         self._readSummary(self._step)
         
         # Set the periodic dimensions.
@@ -201,6 +307,13 @@ class SamraiDataReader(BaseReader):
         Get the basic information, patch extents and path map from the summary file.
         """
         
+        # Load the metadata from the summary index instead if it is available.
+        
+        if self._use_summary_index:
+            if self._loadSummaryIndex(step):
+                self._updatePatchBinGrids(step)
+                return
+        
         # Open the summary file.
         
         summary_file_path = self._full_viz_folder_paths[step] + '/' + 'summary.samrai'
@@ -269,6 +382,120 @@ class SamraiDataReader(BaseReader):
         # Close the summary file.
         
         f_summary.close()
+        
+        # Write the summary index for later reads at this time step.
+        
+        if self._use_summary_index:
+            self._writeSummaryIndex(step)
+        
+        # Check the spatial indices of the patches against the new patch layout.
+        
+        self._updatePatchBinGrids(step)
+    
+    
+    def _getSummaryIndexPaths(self, step):
+        """
+        Get the paths to the files of the summary index at a time step.
+        """
+        
+        index_directory_path = self._full_viz_folder_paths[step] + '/' + 'summary_index'
+        
+        basic_info_path = index_directory_path + '/' + 'basic_info.npz'
+        patch_extents_path = index_directory_path + '/' + 'patch_extents.npy'
+        patch_map_path = index_directory_path + '/' + 'patch_map.npy'
+        
+        return index_directory_path, basic_info_path, patch_extents_path, patch_map_path
+    
+    
+    def _loadSummaryIndex(self, step):
+        """
+        Get the basic information, patch extents and path map from the summary index. The patch extents and patch
+        map are memory-mapped. Return False if the index does not exist or is older than the summary file.
+        """
+        
+        index_directory_path, basic_info_path, patch_extents_path, patch_map_path = \
+            self._getSummaryIndexPaths(step)
+        
+        summary_file_path = self._full_viz_folder_paths[step] + '/' + 'summary.samrai'
+        
+        # Check whether the index is complete and up to date. The patch map is always written last.
+        
+        for index_file_path in (basic_info_path, patch_extents_path, patch_map_path):
+            if not os.path.isfile(index_file_path):
+                return False
+        
+        if os.path.getmtime(patch_map_path) < os.path.getmtime(summary_file_path):
+            return False
+        
+        # Get the basic information.
+        
+        self._basic_info = {}
+        
+        basic_info = numpy.load(basic_info_path)
+        for key in basic_info.files:
+            self._basic_info[key] = basic_info[key][()]
+        basic_info.close()
+        
+        # Get the patch extents and patch map.
+        
+        self._patch_extents = numpy.load(patch_extents_path, mmap_mode='r')
+        self._patch_map = numpy.load(patch_map_path, mmap_mode='r')
+        
+        # Set the flag for loading summary file to be true.
+        
+        self._summary_loaded = True
+        
+        return True
+    
+    
+    def _writeSummaryIndex(self, step):
+        """
+        Write the loaded basic information, patch extents and patch map to the summary index. Nothing is written
+        if the dump folder is not writable.
+        """
+        
+        index_directory_path, basic_info_path, patch_extents_path, patch_map_path = \
+            self._getSummaryIndexPaths(step)
+        
+        try:
+            if not os.path.isdir(index_directory_path):
+                os.mkdir(index_directory_path)
+            
+            # Write each file to a temporary path first and then rename it so that an incomplete index is never
+            # loaded.
+            
+            index_files = ((basic_info_path, None), \
+                           (patch_extents_path, self._packStructuredArray(self._patch_extents)), \
+                           (patch_map_path, self._packStructuredArray(self._patch_map)))
+            
+            for index_file_path, index_data in index_files:
+                f_index = open(index_file_path + '.tmp', 'wb')
+                if index_data is None:
+                    numpy.savez(f_index, **self._basic_info)
+                else:
+                    numpy.save(f_index, index_data)
+                f_index.close()
+                
+                os.rename(index_file_path + '.tmp', index_file_path)
+        
+        except (IOError, OSError):
+            pass
+    
+    
+    def _packStructuredArray(self, data):
+        """
+        Return a copy of a structured array with the fields packed in order so that it can be stored in the NPY
+        format.
+        """
+        
+        dtype_packed = numpy.dtype({'names': data.dtype.names, \
+                                    'formats': [data.dtype.fields[name][0] for name in data.dtype.names]})
+        
+        data_packed = numpy.empty(data.shape, dtype = dtype_packed)
+        for name in data.dtype.names:
+            data_packed[name] = data[name]
+        
+        return data_packed
     
     
     def getBasicInfo(self):
@@ -556,10 +783,6 @@ class SamraiDataReader(BaseReader):
         Read data at one particular level.
         """
         
-        # Get the number of file clusters.
-        
-        num_file_clusters = self._basic_info['num_file_clusters']
-        
         # Get the dimension of the problem, number of levels and number of patches.
         
         dim = self._basic_info['dim']
@@ -619,119 +842,15 @@ class SamraiDataReader(BaseReader):
         
         # Get the data from all patches at the specified level.
         
-        if dim == 1:
-            for process_idx in range(0, num_file_clusters):
-                file_name = 'processor_cluster.' + str(process_idx).zfill(5) + '.samrai'
-                full_path = self._full_viz_folder_paths[self._step] + '/' + file_name
-                f_input = h5py.File(full_path, 'r')
-                
-                file_cluster = f_input['processor.' + str(process_idx).zfill(5)]
-                file_cluster_level = file_cluster['level.' + str(level_num).zfill(5)]
-                
-                for var_name in var_names:
-                    for patch_key in file_cluster_level:
-                        patch_idx = int(patch_key.replace('patch.', ''))
-                        global_patch_idx = patch_level_start_idx + patch_idx
-                        file_cluster_patch = file_cluster_level[patch_key]
-                        
-                        lo_patch = patch_extents[global_patch_idx][0] - lo_level
-                        hi_patch = patch_extents[global_patch_idx][1] - lo_level
-                        patch_shape = hi_patch[0] - lo_patch[0] + 1
-                        
-                        x_start_idx = lo_patch[0]
-                        x_end_idx = hi_patch[0] + 1
-                        
-                        for component_idx in range(0, var_num_components[var_name]):
-                            if self._data_order == 'C':
-                                self._data[var_name][component_idx, x_start_idx:x_end_idx] = \
-                                    file_cluster_patch[var_component_names[var_name][component_idx]].value
-                            else:
-                                self._data[var_name][x_start_idx:x_end_idx, component_idx] = \
-                                    file_cluster_patch[var_component_names[var_name][component_idx]].value
-                
-                f_input.close()
+        hi_level = lo_level[0:dim] + numpy.asarray(domain_shape)[0:dim] - numpy.ones(dim, dtype = lo_level.dtype)
         
-        elif dim == 2:
-            for process_idx in range(0, num_file_clusters):
-                file_name = 'processor_cluster.' + str(process_idx).zfill(5) + '.samrai'
-                full_path = self._full_viz_folder_paths[self._step] + '/' + file_name
-                f_input = h5py.File(full_path, 'r')
-                
-                file_cluster = f_input['processor.' + str(process_idx).zfill(5)]
-                file_cluster_level = file_cluster['level.' + str(level_num).zfill(5)]
-                
-                for var_name in var_names:
-                    for patch_key in file_cluster_level:
-                        patch_idx = int(patch_key.replace('patch.', ''))
-                        global_patch_idx = patch_level_start_idx + patch_idx
-                        file_cluster_patch = file_cluster_level[patch_key]
-                        
-                        lo_patch = self._patch_extents[global_patch_idx][0] - lo_level
-                        hi_patch = self._patch_extents[global_patch_idx][1] - lo_level
-                        patch_shape = hi_patch[0:2] - lo_patch[0:2] + numpy.ones(2, dtype = numpy.int)
-                        
-                        x_start_idx = lo_patch[0]
-                        x_end_idx = hi_patch[0] + 1
-                        
-                        y_start_idx = lo_patch[1]
-                        y_end_idx = hi_patch[1] + 1
-                        
-                        for component_idx in range(0, var_num_components[var_name]):
-                            if self._data_order == 'C':
-                                self._data[var_name][component_idx, x_start_idx:x_end_idx, y_start_idx:y_end_idx] = \
-                                    file_cluster_patch[var_component_names[var_name][component_idx]].value.reshape( \
-                                        patch_shape, order = 'F')
-                            else:
-                                self._data[var_name][x_start_idx:x_end_idx, y_start_idx:y_end_idx, component_idx] = \
-                                    file_cluster_patch[var_component_names[var_name][component_idx]].value.reshape( \
-                                        patch_shape, order = 'F')
-                
-                f_input.close()
+        patch_overlaps = {level_num: self._getPatchOverlapsAtOneLevel(level_num, lo_level[0:dim], hi_level, domain_shape)}
         
-        elif dim == 3:
-            for process_idx in range(0, num_file_clusters):
-                file_name = 'processor_cluster.' + str(process_idx).zfill(5) + '.samrai'
-                full_path = self._full_viz_folder_paths[self._step] + '/' + file_name
-                f_input = h5py.File(full_path, 'r')
-                
-                file_cluster = f_input['processor.' + str(process_idx).zfill(5)]
-                file_cluster_level = file_cluster['level.' + str(level_num).zfill(5)]
-                
-                for var_name in var_names:
-                    for patch_key in file_cluster_level:
-                        patch_idx = int(patch_key.replace('patch.', ''))
-                        global_patch_idx = patch_level_start_idx + patch_idx
-                        file_cluster_patch = file_cluster_level[patch_key]
-                        
-                        lo_patch = self._patch_extents[global_patch_idx][0] - lo_level
-                        hi_patch = self._patch_extents[global_patch_idx][1] - lo_level
-                        patch_shape = hi_patch[0:3] - lo_patch[0:3] + numpy.ones(3, dtype = numpy.int)
-                        
-                        x_start_idx = lo_patch[0]
-                        x_end_idx = hi_patch[0] + 1
-                        
-                        y_start_idx = lo_patch[1]
-                        y_end_idx = hi_patch[1] + 1
-                        
-                        z_start_idx = lo_patch[2]
-                        z_end_idx = hi_patch[2] + 1
-                        
-                        for component_idx in range(0, var_num_components[var_name]):
-                            if self._data_order == 'C':
-                                self._data[var_name] \
-                                    [component_idx, x_start_idx:x_end_idx, y_start_idx:y_end_idx, z_start_idx:z_end_idx] = \
-                                        file_cluster_patch[var_component_names[var_name][component_idx]].value.reshape( \
-                                            patch_shape, order = 'F')
-                            else:
-                                self._data[var_name] \
-                                    [x_start_idx:x_end_idx, y_start_idx:y_end_idx, z_start_idx:z_end_idx, component_idx] = \
-                                        file_cluster_patch[var_component_names[var_name][component_idx]].value.reshape( \
-                                            patch_shape, order = 'F')
-                
-                f_input.close()
+        level_data = {}
+        for var_name in var_names:
+            level_data[var_name] = {level_num: self._data[var_name]}
         
-        else:
-            raise RuntimeError('Problem dimension < 1 or > 3 not supported!')
+        self._loadPatchOverlaps(patch_overlaps, var_names, var_component_names, level_data)
         
         self._data_loaded = True
     
@@ -878,10 +997,15 @@ class SamraiDataReader(BaseReader):
     
     def readCombinedDataInSubdomainFromAllLevels(self, \
             var_names, \
-            num_ghosts = None):
+            num_ghosts = None, \
+            data_output = None):
         """
         Read data in a sub-domain from all levels, refine the data to the finest level
         and combine the data from different levels.
+        
+        data_output : optional dictionary of float64 numpy arrays with variable names as keys to store the combined
+                      data of the variables (including the component axis) instead of allocating new arrays. The
+                      data is read directly into these arrays if there is only one level
         """
         
         lo_subdomain = numpy.asarray(self._lo_subdomain)
@@ -889,10 +1013,6 @@ class SamraiDataReader(BaseReader):
         
         periodic_dimensions = self._periodic_dimensions
         
-        # Get the number of file clusters.
-        
-        num_file_clusters = self._basic_info['num_file_clusters']
-        
         # Get the dimension of the problem, number of levels and number of patches.
         
         dim = self._basic_info['dim']
@@ -1031,349 +1151,14 @@ class SamraiDataReader(BaseReader):
         lo_subdomain = lo_subdomain[0:dim] - num_ghosts[0:dim]
         hi_subdomain = hi_subdomain[0:dim] + num_ghosts[0:dim]
         
-        # Determine which file clusters to load.
+        # Determine the patches overlapping with the sub-domain at each level (including the periodic images of the
+        # patches) and the windows to copy from the patches to the sub-domain.
         
-        file_clusters_to_load = []
+        patch_overlaps = {}
         
         for level_num in range(num_levels):
-            patch_level_start_idx = 0
-            for level_idx in range(0, level_num):
-                patch_level_start_idx = patch_level_start_idx + num_patches[level_idx]
-            
-            for patch_idx in range(num_patches[level_num]):
-                global_patch_idx = patch_level_start_idx + patch_idx
-                lo_patch = self._patch_extents[global_patch_idx][0]
-                hi_patch = self._patch_extents[global_patch_idx][1]
-                
-                file_cluster_num = self._patch_map[global_patch_idx][1]
-                
-                # Determine whether the sub-domain overlaps with the patches.
-                
-                if dim == 1:
-                    load_file_cluster = False
-                    
-                    if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                       (hi_patch[0] >= lo_subdomain_level[level_num][0]):
-                        load_file_cluster = True
-                    
-                    # Check whether the patches overlap with the ghost cell regions if the domain is periodic.
-                    
-                    if periodic_dimensions[0] == True:
-                        # Check the left boundary.
-                        
-                        if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]):
-                            load_file_cluster = True
-                        
-                        # Check the right boundary.
-                        
-                        if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]):
-                            load_file_cluster = True
-                    
-                    if load_file_cluster and (file_cluster_num not in file_clusters_to_load):
-                        file_clusters_to_load.append(file_cluster_num)
-                
-                elif dim == 2:
-                    load_file_cluster = False
-                    
-                    if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                       (hi_patch[0] >= lo_subdomain_level[level_num][0]) and \
-                       (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                       (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                        load_file_cluster = True
-                    
-                    # Check whether the patches overlap with the ghost cell regions if the domain is periodic.
-                    
-                    if periodic_dimensions[0] == True:
-                        # Check the left edge.
-                        
-                        if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]):
-                            if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                               (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                load_file_cluster = True
-                        
-                        # Check the right edge.
-                        
-                        if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]):
-                            if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                               (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                load_file_cluster = True
-                    
-                    if periodic_dimensions[1] == True:
-                        # Check the bottom edge.
-                        
-                        if (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]):
-                            if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                               (hi_patch[0] >= lo_subdomain_level[level_num][0]):
-                                load_file_cluster = True
-                        
-                        # Check the top edge.
-                        
-                        if (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]):
-                            if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                               (hi_patch[0] >= lo_subdomain_level[level_num][0]):
-                                load_file_cluster = True
-                    
-                    if (periodic_dimensions[0] == True) and (periodic_dimensions[1] == True):
-                        # Check the left-bottom corner.
-                        
-                        if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) and \
-                           (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]):
-                            load_file_cluster = True
-                        
-                        # Check the left-top corner.
-                        
-                        if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) and \
-                           (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]):
-                            load_file_cluster = True
-                        
-                        # Check the right-bottom corner.
-                        
-                        if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) and \
-                           (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]):
-                            load_file_cluster = True
-                        
-                        # Check the right-top corner.
-                        
-                        if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) and \
-                           (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]):
-                            load_file_cluster = True
-                    
-                    if load_file_cluster and (file_cluster_num not in file_clusters_to_load):
-                        file_clusters_to_load.append(file_cluster_num)
-                
-                elif dim == 3:
-                    load_file_cluster = False
-                    
-                    if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                       (hi_patch[0] >= lo_subdomain_level[level_num][0]) and \
-                       (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                       (hi_patch[1] >= lo_subdomain_level[level_num][1]) and \
-                       (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                       (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                        load_file_cluster = True
-                    
-                    # Check whether the patches overlap with the ghost cell regions if the domain is periodic.
-                    
-                    if periodic_dimensions[0] == True:
-                        # Check the left face.
-                        
-                        if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]):
-                            if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                               (hi_patch[1] >= lo_subdomain_level[level_num][1]) and \
-                               (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                               (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                load_file_cluster = True
-                        
-                        # Check the right face.
-                        
-                        if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]):
-                            if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                               (hi_patch[1] >= lo_subdomain_level[level_num][1]) and \
-                               (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                               (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                load_file_cluster = True
-                    
-                    if periodic_dimensions[1] == True:
-                        # Check the bottom face.
-                        
-                        if (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]):
-                            if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                               (hi_patch[0] >= lo_subdomain_level[level_num][0]) and \
-                               (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                               (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                load_file_cluster = True
-                        
-                        # Check the top face.
-                        
-                        if (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]):
-                            if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                               (hi_patch[0] >= lo_subdomain_level[level_num][0]) and \
-                               (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                               (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                load_file_cluster = True
-                    
-                    if periodic_dimensions[2] == True:
-                        # Check the back face.
-                        
-                        if (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                            if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                               (hi_patch[0] >= lo_subdomain_level[level_num][0]) and \
-                               (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                               (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                load_file_cluster = True
-                        
-                        # Check the front face.
-                        
-                        if (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                            if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                               (hi_patch[0] >= lo_subdomain_level[level_num][0]) and \
-                               (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                               (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                load_file_cluster = True
-                    
-                    if (periodic_dimensions[0] == True) and (periodic_dimensions[1] == True):
-                        # Check the left-bottom edge.
-                        
-                        if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) and \
-                           (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]):
-                            if (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                               (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                load_file_cluster = True
-                        
-                        # Check the left-top edge.
-                        
-                        if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) and \
-                           (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]):
-                            if (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                               (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                load_file_cluster = True
-                        
-                        # Check the right-bottom edge.
-                        
-                        if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) and \
-                           (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]):
-                            if (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                               (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                load_file_cluster = True
-                        
-                        # Check the right-top edge.
-        
-                        if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) and \
-                           (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]):
-                            if (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                               (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                load_file_cluster = True
-                    
-                    if (periodic_dimensions[0] == True) and (periodic_dimensions[2] == True):
-                        # Check the left-back edge.
-                        
-                        if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) and \
-                           (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                            if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                               (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                load_file_cluster = True
-                        
-                        # Check the left-front edge.
-                        
-                        if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) and \
-                           (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                            if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                               (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                load_file_cluster = True
-                        
-                        # Check the right-back edge.
-                        
-                        if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) and \
-                           (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                            if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                               (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                load_file_cluster = True
-                        
-                        # Check the right-front edge.
-                        
-                        if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) and \
-                           (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                            if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                               (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                load_file_cluster = True
-                    
-                    if (periodic_dimensions[1] == True) and (periodic_dimensions[2] == True):
-                        # Check the bottom-back edge.
-                        
-                        if (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]) and \
-                           (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                            if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                               (hi_patch[0] >= lo_subdomain_level[level_num][0]):
-                                load_file_cluster = True
-                        
-                        # Check the bottom-front edge.
-                        
-                        if (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]) and \
-                           (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                            if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                               (hi_patch[0] >= lo_subdomain_level[level_num][0]):
-                                load_file_cluster = True
-                        
-                        # Check the top-back edge.
-                        
-                        if (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]) and \
-                           (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                            if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                               (hi_patch[0] >= lo_subdomain_level[level_num][0]):
-                                load_file_cluster = True
-                        
-                        # Check the top-front edge.
-                        
-                        if (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]) and \
-                           (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                            if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                               (hi_patch[0] >= lo_subdomain_level[level_num][0]):
-                                load_file_cluster = True
-                    
-                    if (periodic_dimensions[0] == True) and \
-                       (periodic_dimensions[1] == True) and \
-                       (periodic_dimensions[2] == True):
-                        # Check the left-bottom-back corner.
-                        
-                        if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) and \
-                           (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]) and \
-                           (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                            load_file_cluster = True
-                        
-                        # Check the left-top-back corner.
-                        
-                        if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) and \
-                           (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]) and \
-                           (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                            load_file_cluster = True
-                        
-                        # Check the right-bottom-back corner.
-                        
-                        if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) and \
-                           (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]) and \
-                           (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                            load_file_cluster = True
-                        
-                        # Check the right-top-back corner.
-                        
-                        if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) and \
-                           (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]) and \
-                           (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                            load_file_cluster = True
-                        
-                        # Check the left-bottom-front corner.
-                        
-                        if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) and \
-                           (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]) and \
-                           (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                            load_file_cluster = True
-                        
-                        # Check the left-top-front corner.
-                        
-                        if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) and \
-                           (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]) and \
-                           (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                            load_file_cluster = True
-                        
-                        # Check the right-bottom-front corner.
-                        
-                        if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) and \
-                           (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]) and \
-                           (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                            load_file_cluster = True
-                        
-                        # Check the right-top-front corner.
-                        
-                        if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) and \
-                           (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]) and \
-                           (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                            load_file_cluster = True
-                    
-                    if load_file_cluster and (file_cluster_num not in file_clusters_to_load):
-                        file_clusters_to_load.append(file_cluster_num)
-                
-                else:
-                    raise RuntimeError('Problem dimension < 1 or > 3 not supported!')
+            patch_overlaps[level_num] = self._getPatchOverlapsAtOneLevel(level_num, \
+                lo_subdomain_level[level_num], hi_subdomain_level[level_num], domain_shape_level[level_num])
         
         # Initialize containers to store the data at different levels. The elements in the containers 
         # are initialized as NAN values.
@@ -1392,1207 +1177,31 @@ class SamraiDataReader(BaseReader):
                 else:
                     data_shape = numpy.append(data_shape, var_num_components[var_name])
                 
-                data = numpy.empty(data_shape, dtype = numpy.float64, order = self._data_order)
-                data[:] = numpy.NAN
+                # Load the data directly into the container of the combined data if there is only one level.
                 
-                level_data[var_name].append(data)
-        
-        if dim == 1:
-            for process_idx in file_clusters_to_load:
-                file_name = 'processor_cluster.' + str(process_idx).zfill(5) + '.samrai'
-                full_path = self._full_viz_folder_paths[self._step] + '/' + file_name
-                f_input = h5py.File(full_path, 'r')
-                
-                for level_num in range(num_levels):
-                    patch_level_start_idx = 0
-                    for level_idx in range(0, level_num):
-                        patch_level_start_idx = patch_level_start_idx + num_patches[level_idx]
-                    
-                    file_cluster = f_input['processor.' + str(process_idx).zfill(5)]
-                    file_cluster_level = file_cluster['level.' + str(level_num).zfill(5)]
-                    
-                    for var_name in var_names:
-                        for patch_key in file_cluster_level:
-                            patch_idx = int(patch_key.replace('patch.', ''))
-                            global_patch_idx = patch_level_start_idx + patch_idx
-                            file_cluster_patch = file_cluster_level[patch_key]
-                            
-                            # Get the lower and upper indices of the current patch.
-                            
-                            lo_patch = self._patch_extents[global_patch_idx][0]
-                            hi_patch = self._patch_extents[global_patch_idx][1]
-                            
-                            for component_idx in range(0, var_num_components[var_name]):
-                                # Get the patch data.
-                                patch_data = file_cluster_patch[var_component_names[var_name][component_idx]].value
-                                
-                                if self._data_order == 'C':
-                                    self._loadDataFromPatchToSubdomain( \
-                                        lo_subdomain_level[level_num], hi_subdomain_level[level_num], \
-                                        lo_patch, hi_patch, \
-                                        level_data[var_name][level_num][component_idx, :], patch_data)
-                                else:
-                                    self._loadDataFromPatchToSubdomain( \
-                                        lo_subdomain_level[level_num], hi_subdomain_level[level_num], \
-                                        lo_patch, hi_patch, \
-                                        level_data[var_name][level_num][:, component_idx], patch_data)
-                                
-                                # Check whether the patches overlap with the ghost cell regions if the domain is periodic.
-                                
-                                lo_subdomain_shifted = numpy.empty(1, dtype = lo_subdomain_level.dtype)
-                                hi_subdomain_shifted = numpy.empty(1, dtype = hi_subdomain_level.dtype)
-                                
-                                if periodic_dimensions[0] == True:
-                                    # Check the left boundary.
-                                    if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]):
-                                        lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                            + domain_shape_level[level_num][0]
-                                        hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                            + domain_shape_level[level_num][0]
-                                        
-                                        if self._data_order == 'C':
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][component_idx, :], patch_data)
-                                        else:
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][:, component_idx], patch_data)
-                                    
-                                    # Check the right boundary.
-                                    if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]):
-                                        lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                            - domain_shape_level[level_num][0]
-                                        hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                            - domain_shape_level[level_num][0]
-                                        
-                                        if self._data_order == 'C':
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][component_idx, :], patch_data)
-                                        else:
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][:, component_idx], patch_data)
-                
-                f_input.close()
-        
-        elif dim == 2:
-            for process_idx in range(0, num_file_clusters):
-                file_name = 'processor_cluster.' + str(process_idx).zfill(5) + '.samrai'
-                full_path = self._full_viz_folder_paths[self._step] + '/' + file_name
-                f_input = h5py.File(full_path, 'r')
+                if num_levels == 1:
+                    data = self._getCombinedDataContainer(var_name, data_shape, data_output)
+                else:
+                    data = numpy.empty(data_shape, dtype = numpy.float64, order = self._data_order)
                 
-                for level_num in range(num_levels):
-                    patch_level_start_idx = 0
-                    for level_idx in range(0, level_num):
-                        patch_level_start_idx = patch_level_start_idx + num_patches[level_idx]
-                    
-                    file_cluster = f_input['processor.' + str(process_idx).zfill(5)]
-                    file_cluster_level = file_cluster['level.' + str(level_num).zfill(5)]
-                    
-                    for var_name in var_names:
-                        for patch_key in file_cluster_level:
-                            patch_idx = int(patch_key.replace('patch.', ''))
-                            global_patch_idx = patch_level_start_idx + patch_idx
-                            file_cluster_patch = file_cluster_level[patch_key]
-                            
-                            # Get the lower and upper indices of the current patch.
-                            
-                            lo_patch = self._patch_extents[global_patch_idx][0]
-                            hi_patch = self._patch_extents[global_patch_idx][1]
-                            
-                            # Get the shape of the patch.
-                            
-                            patch_shape = hi_patch[0:2] - lo_patch[0:2] + numpy.ones(2, dtype = lo_patch.dtype)
-                            
-                            for component_idx in range(0, var_num_components[var_name]):
-                                # Get the patch data.
-                                
-                                patch_data = file_cluster_patch[var_component_names[var_name][component_idx]].value.reshape( \
-                                    patch_shape, order = 'F')
-                                
-                                if self._data_order == 'C':
-                                    patch_data  = patch_data.copy(order = 'C')
-                                    
-                                    self._loadDataFromPatchToSubdomain( \
-                                        lo_subdomain_level[level_num], hi_subdomain_level[level_num], \
-                                        lo_patch, hi_patch, \
-                                        level_data[var_name][level_num][component_idx, :, :], patch_data)
-                                else:
-                                    self._loadDataFromPatchToSubdomain( \
-                                        lo_subdomain_level[level_num], hi_subdomain_level[level_num], \
-                                        lo_patch, hi_patch, \
-                                        level_data[var_name][level_num][:, :, component_idx], patch_data)
-                                
-                                # Check whether the patches overlap with the ghost cell regions if the domain is periodic.
-                                
-                                lo_subdomain_shifted = numpy.empty(2, dtype = lo_subdomain_level.dtype)
-                                hi_subdomain_shifted = numpy.empty(2, dtype = hi_subdomain_level.dtype)
-                                
-                                if periodic_dimensions[0] == True:
-                                    # Check the left edge.
-                                    
-                                    if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]):
-                                        if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                                           (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                                + domain_shape_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                                + domain_shape_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, component_idx], patch_data)
-                                    
-                                    # Check the right edge.
-                                    
-                                    if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]):
-                                        if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                                           (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                                - domain_shape_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                                - domain_shape_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, component_idx], patch_data)
-                                
-                                if periodic_dimensions[1] == True:
-                                    # Check the bottom edge.
-                                    
-                                    if (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]):
-                                        if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                                           (hi_patch[0] >= lo_subdomain_level[level_num][0]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                                + domain_shape_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                                + domain_shape_level[level_num][1]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, component_idx], patch_data)
-                                    
-                                    # Check the top edge.
-                                    
-                                    if (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]):
-                                        if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                                           (hi_patch[0] >= lo_subdomain_level[level_num][0]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                                - domain_shape_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                                - domain_shape_level[level_num][1]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, component_idx], patch_data)
-                                
-                                if (periodic_dimensions[0] == True) and (periodic_dimensions[1] == True):
-                                    # Check the left-bottom corner.
-                                    
-                                    if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]):
-                                        lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                            + domain_shape_level[level_num][0]
-                                        hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                            + domain_shape_level[level_num][0]
-                                        
-                                        lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                            + domain_shape_level[level_num][1]
-                                        hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                            + domain_shape_level[level_num][1]
-                                        
-                                        if self._data_order == 'C':
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][component_idx, :, :], patch_data)
-                                        else:
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][:, :, component_idx], patch_data)
-                                    
-                                    # Check the left-top corner.
-                                    
-                                    if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]):
-                                        lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                            + domain_shape_level[level_num][0]
-                                        hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                            + domain_shape_level[level_num][0]
-                                        
-                                        lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                            - domain_shape_level[level_num][1]
-                                        hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                            - domain_shape_level[level_num][1]
-                                        
-                                        if self._data_order == 'C':
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][component_idx, :, :], patch_data)
-                                        else:
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][:, :, component_idx], patch_data)
-                                    
-                                    # Check the right-bottom corner.
-                                    
-                                    if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]):
-                                        lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                            - domain_shape_level[level_num][0]
-                                        hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                            - domain_shape_level[level_num][0]
-                                        
-                                        lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                            + domain_shape_level[level_num][1]
-                                        hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                            + domain_shape_level[level_num][1]
-                                        
-                                        if self._data_order == 'C':
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][component_idx, :, :], patch_data)
-                                        else:
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][:, :, component_idx], patch_data)
-                                    
-                                    # Check the right-top corner.
-                                    
-                                    if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]):
-                                        load_file_cluster = True
-                                        lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                            - domain_shape_level[level_num][0]
-                                        hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                            - domain_shape_level[level_num][0]
-                                        
-                                        lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                            - domain_shape_level[level_num][1]
-                                        hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                            - domain_shape_level[level_num][1]
-                                        
-                                        if self._data_order == 'C':
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][component_idx, :, :], patch_data)
-                                        else:
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][:, :, component_idx], patch_data)
+                data[:] = numpy.NAN
                 
-                f_input.close()
+                level_data[var_name].append(data)
         
-        elif dim == 3:
-            for process_idx in range(0, num_file_clusters):
-                file_name = 'processor_cluster.' + str(process_idx).zfill(5) + '.samrai'
-                full_path = self._full_viz_folder_paths[self._step] + '/' + file_name
-                f_input = h5py.File(full_path, 'r')
-                
-                for level_num in range(num_levels):
-                    patch_level_start_idx = 0
-                    for level_idx in range(0, level_num):
-                        patch_level_start_idx = patch_level_start_idx + num_patches[level_idx]
-                    
-                    file_cluster = f_input['processor.' + str(process_idx).zfill(5)]
-                    file_cluster_level = file_cluster['level.' + str(level_num).zfill(5)]
-                    
-                    for var_name in var_names:
-                        for patch_key in file_cluster_level:
-                            patch_idx = int(patch_key.replace('patch.', ''))
-                            global_patch_idx = patch_level_start_idx + patch_idx
-                            file_cluster_patch = file_cluster_level[patch_key]
-                            
-                            # Get the lower and upper indices of the current patch.
-                            
-                            lo_patch = self._patch_extents[global_patch_idx][0]
-                            hi_patch = self._patch_extents[global_patch_idx][1]
-                            
-                            # Get the shape of the patch.
-                            
-                            patch_shape = hi_patch - lo_patch + numpy.ones(3, dtype = lo_patch.dtype)
-                            
-                            for component_idx in range(0, var_num_components[var_name]):
-                                # Get the patch data and upsample the data to the finest resolution.
-                                
-                                patch_data = file_cluster_patch[var_component_names[var_name][component_idx]].value.reshape( \
-                                    patch_shape, order = 'F')
-                                
-                                if self._data_order == 'C':
-                                    patch_data  = patch_data.copy(order = 'C')
-                                    
-                                    self._loadDataFromPatchToSubdomain( \
-                                        lo_subdomain_level[level_num], hi_subdomain_level[level_num], \
-                                        lo_patch, hi_patch, \
-                                        level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                else:
-                                    self._loadDataFromPatchToSubdomain( \
-                                        lo_subdomain_level[level_num], hi_subdomain_level[level_num], \
-                                        lo_patch, hi_patch, \
-                                        level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                
-                                # Check whether the patches overlap with the ghost cell regions if the domain is periodic.
-                                
-                                lo_subdomain_shifted = numpy.empty(3, dtype = lo_subdomain_level.dtype)
-                                hi_subdomain_shifted = numpy.empty(3, dtype = hi_subdomain_level.dtype)
-                                
-                                if periodic_dimensions[0] == True:
-                                    # Check the left face.
-                                    
-                                    if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]):
-                                        if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                                           (hi_patch[1] >= lo_subdomain_level[level_num][1]) and \
-                                           (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                                           (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                                + domain_shape_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                                + domain_shape_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the right face.
-                                    
-                                    if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]):
-                                        if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                                           (hi_patch[1] >= lo_subdomain_level[level_num][1]) and \
-                                           (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                                           (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                                - domain_shape_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                                - domain_shape_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                
-                                if periodic_dimensions[1] == True:
-                                    # Check the bottom face.
-                                    
-                                    if (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]):
-                                        if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                                           (hi_patch[0] >= lo_subdomain_level[level_num][0]) and \
-                                           (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                                           (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                                + domain_shape_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                                + domain_shape_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the top face.
-                                    
-                                    if (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]):
-                                        if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                                           (hi_patch[0] >= lo_subdomain_level[level_num][0]) and \
-                                           (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                                           (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                                - domain_shape_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                                - domain_shape_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                
-                                if periodic_dimensions[2] == True:
-                                    # Check the back face.
-                                    
-                                    if (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                                        if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                                           (hi_patch[0] >= lo_subdomain_level[level_num][0]) and \
-                                           (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                                           (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                                + domain_shape_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                                + domain_shape_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the front face.
-                                    
-                                    if (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                                        if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                                           (hi_patch[0] >= lo_subdomain_level[level_num][0]) and \
-                                           (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                                           (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                                - domain_shape_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                                - domain_shape_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                
-                                if (periodic_dimensions[0] == True) and (periodic_dimensions[1] == True):
-                                    # Check the left-bottom edge.
-                                    
-                                    if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]):
-                                        if (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                                           (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                                + domain_shape_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                                + domain_shape_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                                + domain_shape_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                                + domain_shape_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the left-top edge.
-                                    
-                                    if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]):
-                                        if (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                                           (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                                + domain_shape_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                                + domain_shape_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                                - domain_shape_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                                - domain_shape_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the right-bottom edge.
-                                    
-                                    if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]):
-                                        if (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                                           (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                                - domain_shape_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                                - domain_shape_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                                + domain_shape_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                                + domain_shape_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the right-top edge.
-                                    
-                                    if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]):
-                                        if (lo_patch[2] <= hi_subdomain_level[level_num][2]) and \
-                                           (hi_patch[2] >= lo_subdomain_level[level_num][2]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                                - domain_shape_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                                - domain_shape_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                                - domain_shape_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                                - domain_shape_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                
-                                if (periodic_dimensions[0] == True) and (periodic_dimensions[2] == True):
-                                    # Check the left-back edge.
-                                    
-                                    if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                                        if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                                           (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                                + domain_shape_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                                + domain_shape_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                                + domain_shape_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                                + domain_shape_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the left-front edge.
-                                    
-                                    if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                                        if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                                           (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                                + domain_shape_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                                + domain_shape_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                                - domain_shape_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                                - domain_shape_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the right-back edge.
-                                    
-                                    if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                                        if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                                           (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                                - domain_shape_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                                - domain_shape_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                                + domain_shape_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                                + domain_shape_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the right-front edge.
-                                    
-                                    if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                                        if (lo_patch[1] <= hi_subdomain_level[level_num][1]) and \
-                                           (hi_patch[1] >= lo_subdomain_level[level_num][1]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                                - domain_shape_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                                - domain_shape_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                                - domain_shape_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                                - domain_shape_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                
-                                if (periodic_dimensions[1] == True) and (periodic_dimensions[2] == True):
-                                    # Check the bottom-back edge.
-                                    
-                                    if (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                                        if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                                           (hi_patch[0] >= lo_subdomain_level[level_num][0]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                                + domain_shape_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                                + domain_shape_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                                + domain_shape_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                                + domain_shape_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the bottom-front edge.
-                                    
-                                    if (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                                        if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                                           (hi_patch[0] >= lo_subdomain_level[level_num][0]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                                + domain_shape_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                                + domain_shape_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                                - domain_shape_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                                - domain_shape_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the top-back edge.
-                                    
-                                    if (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                                        if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                                           (hi_patch[0] >= lo_subdomain_level[level_num][0]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                                - domain_shape_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                                - domain_shape_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                                + domain_shape_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                                + domain_shape_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the top-front edge.
-                                    
-                                    if (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                                        if (lo_patch[0] <= hi_subdomain_level[level_num][0]) and \
-                                           (hi_patch[0] >= lo_subdomain_level[level_num][0]):
-                                            lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0]
-                                            hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0]
-                                            
-                                            lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                                - domain_shape_level[level_num][1]
-                                            hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                                - domain_shape_level[level_num][1]
-                                            
-                                            lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                                - domain_shape_level[level_num][2]
-                                            hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                                - domain_shape_level[level_num][2]
-                                            
-                                            if self._data_order == 'C':
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                            else:
-                                                self._loadDataFromPatchToSubdomain( \
-                                                    lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                    lo_patch, hi_patch, \
-                                                    level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                
-                                if (periodic_dimensions[0] == True) and \
-                                   (periodic_dimensions[1] == True) and \
-                                   (periodic_dimensions[2] == True):
-                                    # Check the left-bottom-back corner.
-                                    
-                                    if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                                        lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                            + domain_shape_level[level_num][0]
-                                        hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                            + domain_shape_level[level_num][0]
-                                        
-                                        lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                            + domain_shape_level[level_num][1]
-                                        hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                            + domain_shape_level[level_num][1]
-                                        
-                                        lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                            + domain_shape_level[level_num][2]
-                                        hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                            + domain_shape_level[level_num][2]
-                                        
-                                        if self._data_order == 'C':
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                        else:
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the left-top-back corner.
-                                    
-                                    if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                                        lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                            + domain_shape_level[level_num][0]
-                                        hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                            + domain_shape_level[level_num][0]
-                                        
-                                        lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                            - domain_shape_level[level_num][1]
-                                        hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                            - domain_shape_level[level_num][1]
-                                        
-                                        lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                            + domain_shape_level[level_num][2]
-                                        hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                            + domain_shape_level[level_num][2]
-                                        
-                                        if self._data_order == 'C':
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                        else:
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the right-bottom-back corner.
-                                    
-                                    if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                                        lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                            - domain_shape_level[level_num][0]
-                                        hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                            - domain_shape_level[level_num][0]
-                                        
-                                        lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                            + domain_shape_level[level_num][1]
-                                        hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                            + domain_shape_level[level_num][1]
-                                        
-                                        lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                            + domain_shape_level[level_num][2]
-                                        hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                            + domain_shape_level[level_num][2]
-                                        
-                                        if self._data_order == 'C':
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                        else:
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                        
-                                    # Check the right-top-back corner.
-                                    
-                                    if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][2] <= hi_patch[2] - domain_shape_level[level_num][2]):
-                                        lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                            - domain_shape_level[level_num][0]
-                                        hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                            - domain_shape_level[level_num][0]
-                                        
-                                        lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                            - domain_shape_level[level_num][1]
-                                        hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                            - domain_shape_level[level_num][1]
-                                        
-                                        lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                            + domain_shape_level[level_num][2]
-                                        hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                            + domain_shape_level[level_num][2]
-                                        
-                                        if self._data_order == 'C':
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                        else:
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the left-bottom-front corner.
-                                    
-                                    if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                                        lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                            + domain_shape_level[level_num][0]
-                                        hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                            + domain_shape_level[level_num][0]
-                                        
-                                        lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                            + domain_shape_level[level_num][1]
-                                        hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                            + domain_shape_level[level_num][1]
-                                        
-                                        lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                            - domain_shape_level[level_num][2]
-                                        hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                            - domain_shape_level[level_num][2]
-                                        
-                                        if self._data_order == 'C':
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                        else:
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the left-top-front corner.
-                                    
-                                    if (lo_subdomain_level[level_num][0] <= hi_patch[0] - domain_shape_level[level_num][0]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                                        lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                            + domain_shape_level[level_num][0]
-                                        hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                            + domain_shape_level[level_num][0]
-                                        
-                                        lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                            - domain_shape_level[level_num][1]
-                                        hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                            - domain_shape_level[level_num][1]
-                                        
-                                        lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                            - domain_shape_level[level_num][2]
-                                        hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                            - domain_shape_level[level_num][2]
-                                        
-                                        if self._data_order == 'C':
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                        else:
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the right-bottom-front corner.
-                                    
-                                    if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) \
-                                       and \
-                                       (lo_subdomain_level[level_num][1] <= hi_patch[1] - domain_shape_level[level_num][1]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                                        lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                            - domain_shape_level[level_num][0]
-                                        hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                            - domain_shape_level[level_num][0]
-                                        
-                                        lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                            + domain_shape_level[level_num][1]
-                                        hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                            + domain_shape_level[level_num][1]
-                                        
-                                        lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                            - domain_shape_level[level_num][2]
-                                        hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                            - domain_shape_level[level_num][2]
-                                        
-                                        if self._data_order == 'C':
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                        else:
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                                    
-                                    # Check the right-top-front corner.
-                                    
-                                    if (hi_subdomain_level[level_num][0] >= lo_patch[0] + domain_shape_level[level_num][0]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][1] >= lo_patch[1] + domain_shape_level[level_num][1]) \
-                                       and \
-                                       (hi_subdomain_level[level_num][2] >= lo_patch[2] + domain_shape_level[level_num][2]):
-                                        lo_subdomain_shifted[0] = lo_subdomain_level[level_num][0] \
-                                            - domain_shape_level[level_num][0]
-                                        hi_subdomain_shifted[0] = hi_subdomain_level[level_num][0] \
-                                            - domain_shape_level[level_num][0]
-                                        
-                                        lo_subdomain_shifted[1] = lo_subdomain_level[level_num][1] \
-                                            - domain_shape_level[level_num][1]
-                                        hi_subdomain_shifted[1] = hi_subdomain_level[level_num][1] \
-                                            - domain_shape_level[level_num][1]
-                                        
-                                        lo_subdomain_shifted[2] = lo_subdomain_level[level_num][2] \
-                                            - domain_shape_level[level_num][2]
-                                        hi_subdomain_shifted[2] = hi_subdomain_level[level_num][2] \
-                                            - domain_shape_level[level_num][2]
-                                        
-                                        if self._data_order == 'C':
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][component_idx, :, :, :], patch_data)
-                                        else:
-                                            self._loadDataFromPatchToSubdomain(lo_subdomain_shifted, hi_subdomain_shifted, \
-                                                lo_patch, hi_patch, \
-                                                level_data[var_name][level_num][:, :, :, component_idx], patch_data)
-                
-                f_input.close()
+        # Load the data from the overlapping patches.
         
-        else:
-            raise RuntimeError('Problem dimension < 1 or > 3 not supported!')
+        self._loadPatchOverlaps(patch_overlaps, var_names, var_component_names, level_data)
         
         # Combine data at all levels.
         
         for var_name in var_names:
             
+            # The data is already in the container of the combined data if there is only one level.
+            
+            if num_levels == 1:
+                self._data[var_name] = level_data[var_name][0]
+                continue
+            
             data_shape = hi_subdomain_level[-1][0:dim] - lo_subdomain_level[-1][0:dim] \
                 + numpy.ones(dim, dtype = lo_subdomain_level.dtype)
             
@@ -2601,7 +1210,7 @@ class SamraiDataReader(BaseReader):
             else:
                 data_shape = numpy.append(data_shape, var_num_components[var_name])
             
-            self._data[var_name] = numpy.empty(data_shape, dtype = numpy.float64, order = self._data_order)
+            self._data[var_name] = self._getCombinedDataContainer(var_name, data_shape, data_output)
             self._data[var_name][:] = numpy.NAN
             
             if self._data_order == 'C':
@@ -2796,199 +1405,305 @@ class SamraiDataReader(BaseReader):
         self._data_loaded = True
     
     
-    def _loadDataFromPatchToSubdomain(self, \
+    def _getCombinedDataContainer(self, \
+            var_name, \
+            data_shape, \
+            data_output):
+        """
+        Private method to get the container of the combined data of a variable. The array given by the user in
+        data_output is used if there is one.
+        """
+        
+        if data_output is None or var_name not in data_output:
+            return numpy.empty(data_shape, dtype = numpy.float64, order = self._data_order)
+        
+        data = data_output[var_name]
+        
+        if not isinstance(data, numpy.ndarray) or data.dtype != numpy.float64:
+            raise RuntimeError("Output data of variable '" + var_name + "' is not a float64 numpy array!")
+        
+        if data.shape != tuple(data_shape):
+            raise RuntimeError("Shape of output data of variable '" + var_name + "' is invalid!")
+        
+        return data
+    
+    
+    def _getPatchOverlapsAtOneLevel(self, \
+            level_num, \
             lo_subdomain, \
             hi_subdomain, \
-            lo_patch, \
-            hi_patch, \
-            subdomain_data, \
-            patch_data):
+            domain_shape):
         """
-        Private method to load data from patch to sub-domain.
+        Private method to get the patches at one level that overlap with a sub-domain, including the periodic
+        images of the patches, together with the windows to copy from the patches to the sub-domain. Only the
+        patches found by the spatial index of the level are checked.
+        
+        level_num : level number
+        lo_subdomain : lower indices of the sub-domain at the level
+        hi_subdomain : upper indices of the sub-domain at the level
+        domain_shape : shape of the domain at the level
+        
+        Return a tuple of the global indices of the overlapping patches and the lower and upper (exclusive) indices
+        of the copy windows in the sub-domain and in the patches. Each window array has one row per overlap and a
+        patch appears once for each of its images that overlaps with the sub-domain.
         """
         
-        dim = lo_subdomain.shape[0]
+        dim = self._basic_info['dim']
         
-        if dim == 1:
-            # Get the global start and end indices.
-            
-            x_global_start_idx = max(lo_patch[0], lo_subdomain[0])
-            x_global_end_idx = min(hi_patch[0] + 1, hi_subdomain[0] + 1)
-            
-            # Get the local start and end indices in the sub-domain.
-            
-            x_local_start_idx = x_global_start_idx - lo_subdomain[0]
-            x_local_start_idx = max(0, x_local_start_idx)
-            
-            x_local_end_idx = x_global_end_idx - lo_subdomain[0]
-            x_local_end_idx = min(hi_subdomain[0] - lo_subdomain[0] + 1, x_local_end_idx)
-            
-            # Get the local start and end indices in the current patch.
-            
-            x_patch_start_idx = x_global_start_idx - lo_patch[0]
-            x_patch_start_idx = max(0, x_patch_start_idx)
-            
-            x_patch_end_idx = patch_data.shape[0] - ((hi_patch[0] + 1) - x_global_end_idx)
-            x_patch_end_idx = min(patch_data.shape[0], x_patch_end_idx)
-            
-            if x_local_start_idx < x_local_end_idx:
-                subdomain_data[x_local_start_idx:x_local_end_idx] = \
-                    patch_data[x_patch_start_idx:x_patch_end_idx]
+        lo_subdomain = numpy.asarray(lo_subdomain)[0:dim]
+        hi_subdomain = numpy.asarray(hi_subdomain)[0:dim]
         
-        elif dim == 2:
-            # Get the global start and end indices.
-            
-            x_global_start_idx = max(lo_patch[0], lo_subdomain[0])
-            x_global_end_idx = min(hi_patch[0] + 1, hi_subdomain[0] + 1)
-            
-            y_global_start_idx = max(lo_patch[1], lo_subdomain[1])
-            y_global_end_idx = min(hi_patch[1] + 1, hi_subdomain[1] + 1)
-            
-            # Get the local start and end indices in the sub-domain.
-            
-            x_local_start_idx = x_global_start_idx - lo_subdomain[0]
-            x_local_start_idx = max(0, x_local_start_idx)
-            
-            x_local_end_idx = x_global_end_idx - lo_subdomain[0]
-            x_local_end_idx = min(hi_subdomain[0] - lo_subdomain[0] + 1, x_local_end_idx)
-            
-            y_local_start_idx = y_global_start_idx - lo_subdomain[1]
-            y_local_start_idx = max(0, y_local_start_idx)
-            
-            y_local_end_idx = y_global_end_idx - lo_subdomain[1]
-            y_local_end_idx = min(hi_subdomain[1] - lo_subdomain[1] + 1, y_local_end_idx)
-            
-            # Get the local start and end indices in the current patch.
-            
-            x_patch_start_idx = x_global_start_idx - lo_patch[0]
-            x_patch_start_idx = max(0, x_patch_start_idx)
-            
-            x_patch_end_idx = patch_data.shape[0] - ((hi_patch[0] + 1) - x_global_end_idx)
-            x_patch_end_idx = min(patch_data.shape[0], x_patch_end_idx)
-            
-            y_patch_start_idx = y_global_start_idx - lo_patch[1]
-            y_patch_start_idx = max(0, y_patch_start_idx)
-            
-            y_patch_end_idx = patch_data.shape[1] - ((hi_patch[1] + 1) - y_global_end_idx)
-            y_patch_end_idx = min(patch_data.shape[1], y_patch_end_idx)
-            
-            if (x_local_start_idx < x_local_end_idx) and (y_local_start_idx < y_local_end_idx):
-                subdomain_data[x_local_start_idx:x_local_end_idx, y_local_start_idx:y_local_end_idx] = \
-                    patch_data[x_patch_start_idx:x_patch_end_idx, y_patch_start_idx:y_patch_end_idx]
+        # Get the spatial index and the lower and upper indices of the patches at the level.
         
-        elif dim == 3:
-            # Get the global start and end indices.
-            
-            x_global_start_idx = max(lo_patch[0], lo_subdomain[0])
-            x_global_end_idx = min(hi_patch[0] + 1, hi_subdomain[0] + 1)
-            
-            y_global_start_idx = max(lo_patch[1], lo_subdomain[1])
-            y_global_end_idx = min(hi_patch[1] + 1, hi_subdomain[1] + 1)
-            
-            z_global_start_idx = max(lo_patch[2], lo_subdomain[2])
-            z_global_end_idx = min(hi_patch[2] + 1, hi_subdomain[2] + 1)
-            
-            # Get the local start and end indices in the sub-domain.
-            
-            x_local_start_idx = x_global_start_idx - lo_subdomain[0]
-            x_local_start_idx = max(0, x_local_start_idx)
-            
-            x_local_end_idx = x_global_end_idx - lo_subdomain[0]
-            x_local_end_idx = min(hi_subdomain[0] - lo_subdomain[0] + 1, x_local_end_idx)
-            
-            y_local_start_idx = y_global_start_idx - lo_subdomain[1]
-            y_local_start_idx = max(0, y_local_start_idx)
-            
-            y_local_end_idx = y_global_end_idx - lo_subdomain[1]
-            y_local_end_idx = min(hi_subdomain[1] - lo_subdomain[1] + 1, y_local_end_idx)
-            
-            z_local_start_idx = z_global_start_idx - lo_subdomain[2]
-            z_local_start_idx = max(0, z_local_start_idx)
-            
-            z_local_end_idx = z_global_end_idx - lo_subdomain[2]
-            z_local_end_idx = min(hi_subdomain[2] - lo_subdomain[2] + 1, z_local_end_idx)
-            
-            # Get the local start and end indices in the current patch.
-            
-            x_patch_start_idx = x_global_start_idx - lo_patch[0]
-            x_patch_start_idx = max(0, x_patch_start_idx)
-            
-            x_patch_end_idx = patch_data.shape[0] - ((hi_patch[0] + 1) - x_global_end_idx)
-            x_patch_end_idx = min(patch_data.shape[0], x_patch_end_idx)
+        patch_bin_grid, global_patch_idx, lo_patch, hi_patch = self._getPatchBinGridAtOneLevel(level_num)
+        
+        # Get the shifts of the periodic images of the patches.
+        
+        shifts = numpy.zeros((1, dim), dtype = numpy.int64)
+        
+        for dim_idx in range(dim):
+            if self._periodic_dimensions[dim_idx] == True:
+                shifts_left = shifts.copy()
+                shifts_left[:, dim_idx] = -domain_shape[dim_idx]
+                
+                shifts_right = shifts.copy()
+                shifts_right[:, dim_idx] = domain_shape[dim_idx]
+                
+                shifts = numpy.concatenate((shifts, shifts_left, shifts_right))
+        
+        # Get the candidate pairs of images and patches from the spatial index of the patches. The image of a patch
+        # with a shift overlaps with the sub-domain if the patch overlaps with the sub-domain shifted backward.
+        
+        candidates = [patch_bin_grid.query(lo_subdomain - shift, hi_subdomain - shift) for shift in shifts]
+        
+        shift_idx = numpy.repeat(numpy.arange(shifts.shape[0]), [c.shape[0] for c in candidates])
+        patch_idx = numpy.concatenate(candidates)
+        
+        # Compute the global start and end indices of the overlaps between the images of the patches and the
+        # sub-domain.
+        
+        lo_patch_image = lo_patch[patch_idx] + shifts[shift_idx]
+        hi_patch_image = hi_patch[patch_idx] + shifts[shift_idx]
+        
+        global_start_idx = numpy.maximum(lo_patch_image, lo_subdomain)
+        global_end_idx = numpy.minimum(hi_patch_image, hi_subdomain) + 1
+        
+        # Get the local start and end indices in the sub-domain and in the patches.
+        
+        local_start_idx = global_start_idx - lo_subdomain
+        local_end_idx = global_end_idx - lo_subdomain
+        
+        patch_start_idx = global_start_idx - lo_patch_image
+        patch_end_idx = global_end_idx - lo_patch_image
+        
+        return global_patch_idx[patch_idx], local_start_idx, local_end_idx, patch_start_idx, patch_end_idx
+    
+    
+    def _getPatchExtentsAtOneLevel(self, level_num):
+        """
+        Private method to get the global indices and the lower and upper indices of the patches at one level from
+        the loaded patch extents.
+        """
+        
+        dim = self._basic_info['dim']
+        num_patches = self._basic_info['num_patches']
+        
+        patch_level_start_idx = numpy.sum(num_patches[0:level_num], dtype = numpy.int64)
+        patch_level_end_idx = patch_level_start_idx + num_patches[level_num]
+        
+        global_patch_idx = numpy.arange(patch_level_start_idx, patch_level_end_idx)
+        
+        patch_extents_level = self._patch_extents[patch_level_start_idx:patch_level_end_idx]
+        lo_patch = numpy.array(patch_extents_level[patch_extents_level.dtype.names[0]])[:, 0:dim]
+        hi_patch = numpy.array(patch_extents_level[patch_extents_level.dtype.names[1]])[:, 0:dim]
+        
+        return global_patch_idx, lo_patch, hi_patch
+    
+    
+    def _updatePatchBinGrids(self, step):
+        """
+        Private method to check the cached spatial indices of the patches after the summary is loaded. The check is
+        only done once for each time step and modification time of the summary file. The index at a level is kept
+        if the patch layout at the level is unchanged and is dropped otherwise.
+        """
+        
+        summary_file_path = self._full_viz_folder_paths[step] + '/' + 'summary.samrai'
+        
+        patch_layout_key = (step, os.path.getmtime(summary_file_path))
+        
+        if patch_layout_key == self._patch_layout_key:
+            return
+        
+        self._patch_layout_key = patch_layout_key
+        
+        for level_num in self._patch_bin_grids.keys():
+            if level_num >= self._basic_info['num_levels']:
+                del self._patch_bin_grids[level_num]
+                continue
             
-            y_patch_start_idx = y_global_start_idx - lo_patch[1]
-            y_patch_start_idx = max(0, y_patch_start_idx)
+            global_patch_idx, lo_patch, hi_patch = self._getPatchExtentsAtOneLevel(level_num)
+            patch_bin_grid = self._patch_bin_grids[level_num][0]
             
-            y_patch_end_idx = patch_data.shape[1] - ((hi_patch[1] + 1) - y_global_end_idx)
-            y_patch_end_idx = min(patch_data.shape[1], y_patch_end_idx)
+            if patch_bin_grid.isSameBoxes(lo_patch, hi_patch):
+                self._patch_bin_grids[level_num] = (patch_bin_grid, global_patch_idx, lo_patch, hi_patch)
+            else:
+                del self._patch_bin_grids[level_num]
+    
+    
+    def _getPatchBinGridAtOneLevel(self, level_num):
+        """
+        Private method to get the spatial index of the patches at one level, together with the global indices and
+        the lower and upper indices of the patches. The index is built at the first query after the patch layout at
+        the level changes and is only looked up afterwards.
+        """
+        
+        if level_num not in self._patch_bin_grids:
+            global_patch_idx, lo_patch, hi_patch = self._getPatchExtentsAtOneLevel(level_num)
             
-            z_patch_start_idx = z_global_start_idx - lo_patch[2]
-            z_patch_start_idx = max(0, z_patch_start_idx)
+            self._patch_bin_grids[level_num] = (BoxBinGrid(lo_patch, hi_patch), global_patch_idx, lo_patch, hi_patch)
+        
+        return self._patch_bin_grids[level_num]
+    
+    
+    def _loadPatchOverlaps(self, \
+            patch_overlaps, \
+            var_names, \
+            var_component_names, \
+            level_data):
+        """
+        Private method to load the data of the overlapping patches at different levels into the containers of the
+        level data. The file clusters are loaded concurrently by a pool of workers if more than one worker is used.
+        
+        patch_overlaps : dictionary of the patch overlaps from _getPatchOverlapsAtOneLevel with level numbers as keys
+        var_names : names of the variables to load
+        var_component_names : dictionary of the names of the components of each variable
+        level_data : dictionary of the containers of the level data of each variable indexed by level numbers
+        """
+        
+        dim = self._basic_info['dim']
+        num_patches = self._basic_info['num_patches']
+        
+        patch_map_names = self._patch_map.dtype.names
+        patch_extents_names = self._patch_extents.dtype.names
+        
+        dataset_names = [component_name for var_name in var_names for component_name in var_component_names[var_name]]
+        
+        # Set up the requests of the patches to read from each file cluster and the destinations of the data.
+        
+        file_cluster_requests = {}
+        file_cluster_destinations = {}
+        
+        for level_num in sorted(patch_overlaps.keys()):
+            global_patch_idx, local_start_idx, local_end_idx, patch_start_idx, patch_end_idx = \
+                patch_overlaps[level_num]
             
-            z_patch_end_idx = patch_data.shape[2] - ((hi_patch[2] + 1) - z_global_end_idx)
-            z_patch_end_idx = min(patch_data.shape[2], z_patch_end_idx)
+            patch_level_start_idx = numpy.sum(num_patches[0:level_num], dtype = numpy.int64)
             
-            if (x_local_start_idx < x_local_end_idx) and \
-               (y_local_start_idx < y_local_end_idx) and \
-               (z_local_start_idx < z_local_end_idx):
-                subdomain_data[x_local_start_idx:x_local_end_idx, \
-                                      y_local_start_idx:y_local_end_idx, \
-                                      z_local_start_idx:z_local_end_idx] = \
-                    patch_data[x_patch_start_idx:x_patch_end_idx, \
-                               y_patch_start_idx:y_patch_end_idx, \
-                               z_patch_start_idx:z_patch_end_idx]
+            for patch_num in numpy.unique(global_patch_idx):
+                file_cluster_num = self._patch_map[patch_map_names[1]][patch_num]
+                processor_num = self._patch_map[patch_map_names[0]][patch_num]
+                
+                patch_path = 'processor.' + str(processor_num).zfill(5) + \
+                    '/level.' + str(level_num).zfill(5) + \
+                    '/patch.' + str(patch_num - patch_level_start_idx).zfill(5)
+                
+                # Get the shape of the patch.
+                
+                lo_patch = self._patch_extents[patch_extents_names[0]][patch_num][0:dim]
+                hi_patch = self._patch_extents[patch_extents_names[1]][patch_num][0:dim]
+                
+                patch_shape = tuple(hi_patch - lo_patch + numpy.ones(dim, dtype = lo_patch.dtype))
+                
+                # Get the copy windows of all the images of the patch.
+                
+                local_windows = []
+                patch_windows = []
+                
+                for overlap_idx in numpy.nonzero(global_patch_idx == patch_num)[0]:
+                    local_windows.append(tuple([slice(local_start_idx[overlap_idx][i], local_end_idx[overlap_idx][i]) \
+                        for i in range(dim)]))
+                    patch_windows.append(tuple([slice(patch_start_idx[overlap_idx][i], patch_end_idx[overlap_idx][i]) \
+                        for i in range(dim)]))
+                
+                file_cluster_requests.setdefault(file_cluster_num, []).append( \
+                    (patch_path, patch_shape, dataset_names, patch_windows))
+                file_cluster_destinations.setdefault(file_cluster_num, []).append((level_num, local_windows))
+        
+        file_cluster_requests = [(file_cluster_num, \
+            self._full_viz_folder_paths[self._step] + '/' + \
+            'processor_cluster.' + str(file_cluster_num).zfill(5) + '.samrai', \
+            file_cluster_requests[file_cluster_num]) for file_cluster_num in sorted(file_cluster_requests.keys())]
+        
+        # Read the file clusters and scatter the data into the containers.
+        
+        pool = None
         
+        if self._num_workers > 1 and len(file_cluster_requests) > 1:
+            if self._worker_type == 'process':
+                pool = multiprocessing.Pool(min(self._num_workers, len(file_cluster_requests)))
+            else:
+                pool = multiprocessing.pool.ThreadPool(min(self._num_workers, len(file_cluster_requests)))
+            
+            file_cluster_results = pool.imap_unordered(_readPatchWindowsFromFileCluster, file_cluster_requests)
         else:
-            raise RuntimeError('Problem dimension < 1 or > 3 not supported!')
+            file_cluster_results = (_readPatchWindowsFromFileCluster(file_cluster_request) \
+                for file_cluster_request in file_cluster_requests)
+        
+        try:
+            for file_cluster_num, file_cluster_data in file_cluster_results:
+                for patch_data, patch_destination in \
+                    zip(file_cluster_data, file_cluster_destinations[file_cluster_num]):
+                    level_num, local_windows = patch_destination
+                    
+                    dataset_idx = 0
+                    
+                    for var_name in var_names:
+                        for component_idx in range(len(var_component_names[var_name])):
+                            if self._data_order == 'C':
+                                subdomain_data = level_data[var_name][level_num][component_idx]
+                            else:
+                                subdomain_data = level_data[var_name][level_num][..., component_idx]
+                            
+                            for local_window, window_data in zip(local_windows, patch_data[dataset_idx]):
+                                subdomain_data[local_window] = window_data
+                            
+                            dataset_idx = dataset_idx + 1
+        
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
     
     
     def readCoordinates(self):
         """
         Get the coordinates of the stored sub-domain.
         Default to the full domain when the sub-domain is not set.
+        
+        The coordinates of 2D and 3D grids are returned as a RectilinearCoordinates object that stores the 1D axes of
+        the grid and can be unpacked like a tuple of the coordinate arrays. The coordinates are only broadcast to the
+        shape of the sub-domain on demand, and dense arrays are only created by calling toDense() on the object.
         """
         
         # Get the dimension of the problem.
         
         dim = self._basic_info['dim']
         
-        x_c = []
-        y_c = []
-        z_c = []
-        
         if dim == 1:
             return self.getCombinedCoordinatesInSubdomainFromAllLevels()
         
-        elif dim == 2:
-            x_coords, y_coords = self.getCombinedCoordinatesInSubdomainFromAllLevels()
-            
-            if self._data_order == 'C':
-                x_c, y_c = numpy.meshgrid(x_coords, y_coords, indexing = 'ij', sparse = False, copy=True)
-            else:
-                x_c, y_c = numpy.meshgrid(x_coords, y_coords, indexing = 'ij', sparse = False, copy=False)
-                x_c = numpy.asfortranarray(x_c)
-                y_c = numpy.asfortranarray(y_c)
-            
-            return x_c, y_c
-        
-        elif dim == 3:
-            x_coords, y_coords, z_coords = self.getCombinedCoordinatesInSubdomainFromAllLevels()
-            
-            if self._data_order == 'C':
-                x_c, y_c, z_c = numpy.meshgrid(x_coords, y_coords, z_coords, indexing = 'ij', sparse = False, copy=True)
-            else:
-                x_c, y_c, z_c = numpy.meshgrid(x_coords, y_coords, z_coords, indexing = 'ij', sparse = False, copy=False)
-                x_c = numpy.asfortranarray(x_c)
-                y_c = numpy.asfortranarray(y_c)
-                z_c = numpy.asfortranarray(z_c)
-            
-            return x_c, y_c, z_c
+        return RectilinearCoordinates(self.getCombinedCoordinatesInSubdomainFromAllLevels(), \
+                                      data_order = self._data_order)
     
     
     def readData(self, var_names, data=None):
         """
         Read the data of several variables in the stored sub-domain.
         Default to the full domain when the sub-domain is not set.
+        
+        data : optional list to store the data of the variables. The data is read into the float64 numpy arrays in
+               the list with the correct shapes instead of allocating new arrays. Other elements in the list are
+               replaced by the data
         """
         if self._data_loaded == True:
             self.clearData()
@@ -2997,36 +1712,49 @@ class SamraiDataReader(BaseReader):
         if isinstance(var_names, basestring):
             var_names = (var_names,)
         
-        self.readCombinedDataInSubdomainFromAllLevels(var_names)
-        
         dim = self._basic_info['dim']
         
-        if data == None:
-            _data = []
+        # Get the arrays given by the user to store the data. The component axis is added to the arrays of the
+        # variables with a single component.
+        
+        data_output = None
+        
+        if data is not None:
+            data_output = {}
+            
             for i in range(len(var_names)):
-                if self._data_order == 'C':
-                    if self._data[var_names[i]].shape[0] == 1:
-                        _data.append(numpy.squeeze(self._data[var_names[i]], 0))
+                if isinstance(data[i], numpy.ndarray) and data[i].dtype == numpy.float64:
+                    var_idx = numpy.where(self._basic_info['var_names'] == var_names[i])[0][0]
+                    
+                    if self._basic_info['num_var_components'][var_idx] == 1:
+                        if self._data_order == 'C':
+                            data_output[var_names[i]] = numpy.expand_dims(data[i], 0)
+                        else:
+                            data_output[var_names[i]] = numpy.expand_dims(data[i], dim)
                     else:
-                        _data.append(self._data[var_names[i]])
+                        data_output[var_names[i]] = data[i]
+        
+        self.readCombinedDataInSubdomainFromAllLevels(var_names, data_output = data_output)
+        
+        _data = []
+        for i in range(len(var_names)):
+            if self._data_order == 'C':
+                if self._data[var_names[i]].shape[0] == 1:
+                    _data.append(numpy.squeeze(self._data[var_names[i]], 0))
                 else:
-                    if self._data[var_names[i]].shape[-1] == 1:
-                        _data.append(numpy.squeeze(self._data[var_names[i]], dim))
-                    else:
-                        _data.append(self._data[var_names[i]])
+                    _data.append(self._data[var_names[i]])
+            else:
+                if self._data[var_names[i]].shape[-1] == 1:
+                    _data.append(numpy.squeeze(self._data[var_names[i]], dim))
+                else:
+                    _data.append(self._data[var_names[i]])
+        
+        if data is None:
             return tuple(_data)
         else:
             for i in range(len(var_names)):
-                if self._data_order == 'C':
-                    if self._data[var_names[i]].shape[0] == 1:
-                        data[i] = numpy.squeeze(self._data[var_names[i]], 0)
-                    else:
-                        data[i] = self._data[var_names[i]]
-                else:
-                    if self._data[var_names[i]].shape[-1] == 1:
-                        data[i] = numpy.squeeze(self._data[var_names[i]], dim)
-                    else:
-                        data[i] = self._data[var_names[i]]
+                if var_names[i] not in data_output:
+                    data[i] = _data[i]
 
 
 BaseReader.register(SamraiDataReader)
@@ -1,5 +1,7 @@
 import glob
+import multiprocessing
 import numpy
+import os
 
 import matplotlib
 from matplotlib import cm
@@ -8,17 +10,85 @@ import matplotlib.pyplot as plt
 
 from base_reader import BaseReader
 
+def _getCacheFilename(filename):
+    """
+    Return the name of the binary cache of a pencil file.
+    """
+    
+    return os.path.splitext(filename)[0] + '.npy'
+
+
+def _parsePencilFile(filename):
+    """
+    Parse all the columns of the numeric block after the two header lines of a pencil file in a single pass.
+    Return a 2D array with one row per point and one column per variable.
+    """
+    
+    f = open(filename)
+    f.readline()
+    f.readline()
+    
+    first_line = f.readline()
+    num_columns = len(first_line.split())
+    
+    pencil = numpy.fromstring(first_line + f.read(), dtype=numpy.float64, sep=' ')
+    f.close()
+    
+    if num_columns == 0 or pencil.size % num_columns != 0:
+        raise RuntimeError("Data in file '" + filename + "' is invalid!")
+    
+    return pencil.reshape((pencil.size // num_columns, num_columns))
+
+
+def _readPencilFile(pencil_request):
+    """
+    Read in the given columns of a pencil file and crop them to a window. The binary cache of the file is
+    memory-mapped if it is used and up to date. This is a module level function so that it can be run by a pool of
+    processes.
+    
+    pencil_request : tuple of the key of the pencil, the name of the pencil file, the columns to read, the shape of
+                     the pencil, the window (tuple of slices) to crop from the pencil and a boolean to use the binary
+                     cache
+    
+    Return a tuple of the key of the pencil and a list of the cropped Fortran ordered 3D arrays of the columns.
+    """
+    
+    key, filename, columns, pencil_size, pencil_window, use_binary_cache = pencil_request
+    
+    cachefile = _getCacheFilename(filename)
+    
+    if use_binary_cache and os.path.isfile(cachefile) and \
+       os.path.getmtime(cachefile) >= os.path.getmtime(filename):
+        pencil = numpy.load(cachefile, mmap_mode='r')
+        pencil_data = [ pencil[c].reshape(pencil_size, order='F') for c in columns ]
+    else:
+        pencil = _parsePencilFile(filename)
+        pencil_data = [ pencil[:,c].reshape(pencil_size, order='F') for c in columns ]
+    
+    return key, [ numpy.asarray(data[pencil_window]) for data in pencil_data ]
+
+
 class WchrAsciiReader(BaseReader):
     """
     Class to read in parallel ASCII data generated by the WCHR Regent code.
     """
     
-    def __init__(self, filename_prefix):
+    def __init__(self, filename_prefix, use_binary_cache=True, num_workers=1):
         """
         Constructor of the WCHR reader class.
+        
+        use_binary_cache : boolean to read the pencil files from their binary cache written by writeBinaryCache()
+                           with memory-mapped access when the cache exists and is up to date
+        num_workers : number of worker processes to read the pencil files concurrently. The pencil files are read one
+                      at a time if it is 1
         """
         
+        if num_workers < 1:
+            raise RuntimeError('Number of workers should be at least 1!')
+        
         self.filename_prefix = filename_prefix
+        self._use_binary_cache = use_binary_cache
+        self._num_workers = num_workers
         self.coord_files = glob.glob(filename_prefix + 'coords_*.dat')
         
         files = glob.glob(filename_prefix + '[0-9]*.dat')
@@ -275,51 +345,8 @@ class WchrAsciiReader(BaseReader):
         y_c = numpy.empty(chunk_size, order='F')
         z_c = numpy.empty(chunk_size, order='F')
         
-        ny = self._domain_size[1]
+        self._readPencilsToChunk(self.filename_prefix + 'coords_px%04d_pz%04d.dat', (0,1,2), (x_c, y_c, z_c))
         
-        for row in range(self.prow):
-            for col in range(self.pcol):
-                coordfile = self.filename_prefix + ('coords_px%04d_pz%04d.dat' % (row, col))
-                lo = self.pencil_lo[row,col]
-                hi = self.pencil_hi[row,col]
-                
-                # Skip this proc if it's lowest dimension is higher than max of chunk.
-                
-                if ( lo[0] >= self.chunk[0][1] or 0 >= self.chunk[1][1] or lo[1] >= self.chunk[2][1] ):
-                    continue
-                if ( hi[0] <  self.chunk[0][0] or ny < self.chunk[1][0] or hi[1] <  self.chunk[2][0] ):
-                    continue
-
-                # Read in proc's data if there is an overlap.
-                
-                this_x, this_y, this_z = numpy.loadtxt(coordfile, skiprows=2, unpack=True, usecols=(0,1,2))
-                this_x = this_x.reshape((hi[0]-lo[0], ny, hi[1]-lo[1]), order='F')
-                this_y = this_y.reshape((hi[0]-lo[0], ny, hi[1]-lo[1]), order='F')
-                this_z = this_z.reshape((hi[0]-lo[0], ny, hi[1]-lo[1]), order='F')
-
-                # Copy data into chunk arrays.
-                
-                x_c[ max(0,lo[0]-self.chunk[0][0]):min(self.chunk[0][1]-self.chunk[0][0],hi[0]-self.chunk[0][0]), 
-                     max(0,   0 -self.chunk[1][0]):min(self.chunk[1][1]-self.chunk[1][0],  ny -self.chunk[1][0]),    
-                     max(0,lo[1]-self.chunk[2][0]):min(self.chunk[2][1]-self.chunk[2][0],hi[1]-self.chunk[2][0]) ] = \
-                this_x[ max(0,self.chunk[0][0]-lo[0]):min(hi[0]-lo[0],self.chunk[0][1]-lo[0]),
-                        max(0,self.chunk[1][0]- 0   ):min(  ny -  0  ,self.chunk[1][1]- 0   ),
-                        max(0,self.chunk[2][0]-lo[1]):min(hi[1]-lo[1],self.chunk[2][1]-lo[1]) ]
-
-                y_c[ max(0,lo[0]-self.chunk[0][0]):min(self.chunk[0][1]-self.chunk[0][0],hi[0]-self.chunk[0][0]), 
-                     max(0,   0 -self.chunk[1][0]):min(self.chunk[1][1]-self.chunk[1][0],  ny -self.chunk[1][0]),    
-                     max(0,lo[1]-self.chunk[2][0]):min(self.chunk[2][1]-self.chunk[2][0],hi[1]-self.chunk[2][0]) ] = \
-                this_y[ max(0,self.chunk[0][0]-lo[0]):min(hi[0]-lo[0],self.chunk[0][1]-lo[0]),
-                        max(0,self.chunk[1][0]- 0   ):min(  ny -  0  ,self.chunk[1][1]- 0   ),
-                        max(0,self.chunk[2][0]-lo[1]):min(hi[1]-lo[1],self.chunk[2][1]-lo[1]) ]
-
-                z_c[ max(0,lo[0]-self.chunk[0][0]):min(self.chunk[0][1]-self.chunk[0][0],hi[0]-self.chunk[0][0]), 
-                     max(0,   0 -self.chunk[1][0]):min(self.chunk[1][1]-self.chunk[1][0],  ny -self.chunk[1][0]),    
-                     max(0,lo[1]-self.chunk[2][0]):min(self.chunk[2][1]-self.chunk[2][0],hi[1]-self.chunk[2][0]) ] = \
-                this_z[ max(0,self.chunk[0][0]-lo[0]):min(hi[0]-lo[0],self.chunk[0][1]-lo[0]),
-                        max(0,self.chunk[1][0]- 0   ):min(  ny -  0  ,self.chunk[1][1]- 0   ),
-                        max(0,self.chunk[2][0]-lo[1]):min(hi[1]-lo[1],self.chunk[2][1]-lo[1]) ]
-
         return x_c, y_c, z_c
     
     
@@ -333,48 +360,129 @@ class WchrAsciiReader(BaseReader):
             var_names = (var_names,)
         
         chunk_size = (self.chunk[0][1]-self.chunk[0][0], self.chunk[1][1]-self.chunk[1][0], self.chunk[2][1]-self.chunk[2][0])
-        if data == None:
+        if data is None:
             _data = [ numpy.zeros( chunk_size ) for i in range(len(var_names)) ]
         else:
             _data = data
         
-        ny = self._domain_size[1]
+        inds = [ self.inds[var] for var in var_names ]
+        
+        # Read in all the variables from each processor's file in a single pass.
+        
+        self._readPencilsToChunk(self.filename_prefix + ('%04d' % self._step) + '_px%04d_pz%04d.dat', inds, _data)
         
-        for i in range(len(var_names)):
-            var = var_names[i]
-            v   = _data[i]
+        if data is None:
+            return tuple(_data)
+    
+    
+    def writeBinaryCache(self, steps=None):
+        """
+        Method to convert the ASCII pencil files of the coordinates and of the data at the given steps into binary
+        NPY files next to them. The values of each column are stored contiguously so that the reader can memory-map
+        a single variable of a pencil.
+        
+        steps : iterable of the steps to convert. All steps are converted if it is not given
+        """
+        
+        if steps is None:
+            steps = self._steps
+        
+        filenames = []
+        for row in range(self.prow):
+            for col in range(self.pcol):
+                filenames.append(self.filename_prefix + ('coords_px%04d_pz%04d.dat' % (row, col)))
+                for step in steps:
+                    filenames.append(self.filename_prefix + ('%04d_px%04d_pz%04d.dat' % (step, row, col)))
+        
+        for filename in filenames:
+            pencil = _parsePencilFile(filename)
+            
+            # Write to a temporary file first and then rename it so that an incomplete cache is never read.
             
-            ind = self.inds[var]
+            cachefile = _getCacheFilename(filename)
             
-            for row in range(self.prow):
-                for col in range(self.pcol):
-                    filename = self.filename_prefix + ('%04d_px%04d_pz%04d.dat' % (self._step, row, col))
-                    lo = self.pencil_lo[row,col]
-                    hi = self.pencil_hi[row,col]
-                    
-                    # Skip this proc if it's lowest dimension is higher than max of chunk.
-                    
-                    if ( lo[0] >= self.chunk[0][1] or 0 >= self.chunk[1][1] or lo[1] >= self.chunk[2][1] ):
-                        continue
-                    if ( hi[0] <  self.chunk[0][0] or ny < self.chunk[1][0] or hi[1] <  self.chunk[2][0] ):
-                        continue
-                    
-                    # Read in processor's data if there is an overlap.
-                    
-                    this_var = numpy.loadtxt(filename, skiprows=2, unpack=True, usecols=(ind,))
-                    this_var = this_var.reshape((hi[0]-lo[0], ny, hi[1]-lo[1]), order='F')
+            f = open(cachefile + '.tmp', 'wb')
+            numpy.save(f, numpy.ascontiguousarray(pencil.T))
+            f.close()
+            
+            os.rename(cachefile + '.tmp', cachefile)
+    
+    
+    def _isPencilInChunk(self, row, col):
+        """
+        Return True if the pencil at the given row and column overlaps with the chunk.
+        """
+        
+        lo = self.pencil_lo[row,col]
+        hi = self.pencil_hi[row,col]
+        ny = self._domain_size[1]
+        
+        if ( lo[0] >= self.chunk[0][1] or 0 >= self.chunk[1][1] or lo[1] >= self.chunk[2][1] ):
+            return False
+        if ( hi[0] <  self.chunk[0][0] or ny < self.chunk[1][0] or hi[1] <  self.chunk[2][0] ):
+            return False
+        
+        return True
+    
+    
+    def _readPencilsToChunk(self, filename_format, columns, chunk_data):
+        """
+        Read in the given columns of all the pencil files overlapping with the chunk and copy them into the chunk
+        arrays. The pencil files are read by a pool of processes if more than one worker is used.
+        
+        filename_format : format of the names of the pencil files with the row and column of the pencil
+        columns : iterable of the columns to read
+        chunk_data : iterable of the chunk arrays of the columns
+        """
+        
+        ny = self._domain_size[1]
+        
+        # Get the requests of the pencils that overlap with the chunk.
+        
+        pencil_requests = []
+        chunk_windows = {}
+        
+        for row in range(self.prow):
+            for col in range(self.pcol):
+                if not self._isPencilInChunk(row, col):
+                    continue
                 
-                    # Copy data into chunk arrays.
-                    
-                    v[ max(0,lo[0]-self.chunk[0][0]):min(self.chunk[0][1]-self.chunk[0][0],hi[0]-self.chunk[0][0]), 
-                       max(0,   0 -self.chunk[1][0]):min(self.chunk[1][1]-self.chunk[1][0],  ny -self.chunk[1][0]),    
-                       max(0,lo[1]-self.chunk[2][0]):min(self.chunk[2][1]-self.chunk[2][0],hi[1]-self.chunk[2][0]) ] = \
-                    this_var[ max(0,self.chunk[0][0]-lo[0]):min(hi[0]-lo[0],self.chunk[0][1]-lo[0]),
-                              max(0,self.chunk[1][0]- 0   ):min(  ny -  0  ,self.chunk[1][1]- 0   ),
-                              max(0,self.chunk[2][0]-lo[1]):min(hi[1]-lo[1],self.chunk[2][1]-lo[1]) ]
-        
-        if data == None:
-            return tuple(_data)
+                lo = self.pencil_lo[row,col]
+                hi = self.pencil_hi[row,col]
+                pencil_size = (hi[0]-lo[0], ny, hi[1]-lo[1])
+                
+                chunk_windows[(row, col)] = \
+                    ( slice(max(0,lo[0]-self.chunk[0][0]), min(self.chunk[0][1]-self.chunk[0][0],hi[0]-self.chunk[0][0])),
+                      slice(max(0,   0 -self.chunk[1][0]), min(self.chunk[1][1]-self.chunk[1][0],  ny -self.chunk[1][0])),
+                      slice(max(0,lo[1]-self.chunk[2][0]), min(self.chunk[2][1]-self.chunk[2][0],hi[1]-self.chunk[2][0])) )
+                
+                pencil_window = \
+                    ( slice(max(0,self.chunk[0][0]-lo[0]), min(hi[0]-lo[0],self.chunk[0][1]-lo[0])),
+                      slice(max(0,self.chunk[1][0]- 0   ), min(  ny -  0  ,self.chunk[1][1]- 0   )),
+                      slice(max(0,self.chunk[2][0]-lo[1]), min(hi[1]-lo[1],self.chunk[2][1]-lo[1])) )
+                
+                pencil_requests.append(((row, col), filename_format % (row, col), tuple(columns), pencil_size,
+                                        pencil_window, self._use_binary_cache))
+        
+        # Read the pencil files and copy the data into the chunk arrays.
+        
+        pool = None
+        
+        if self._num_workers > 1 and len(pencil_requests) > 1:
+            pool = multiprocessing.Pool(min(self._num_workers, len(pencil_requests)))
+            pencil_results = pool.imap_unordered(_readPencilFile, pencil_requests)
+        else:
+            pencil_results = (_readPencilFile(pencil_request) for pencil_request in pencil_requests)
+        
+        try:
+            for key, pencil_data in pencil_results:
+                for i in range(len(pencil_data)):
+                    chunk_data[i][chunk_windows[key]] = pencil_data[i]
+        
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
     
     
     def plotThreeSlice(self, var, index):
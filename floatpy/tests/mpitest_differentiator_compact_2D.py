@@ -180,5 +180,27 @@ class TestDerivativesCompact(unittest.TestCase):
         self.assertLess(error[0], 5.0e-12, "Incorrect laplacian!")
 
 
+    def testHessian(self):
+        """
+        Test the Hessian function.
+        """
+
+        d2fdxdy_exact = -self.omega**2 * numpy.cos(self.omega*self.x) * numpy.sin(self.omega*self.y)
+
+        hessian = self.der.hessian(self.f)
+
+        myerror = numpy.zeros(1)
+        myerror[0] = max(numpy.absolute(self.d2fdx2_exact - hessian[:,:,0,0]).max(), \
+                         numpy.absolute(d2fdxdy_exact - hessian[:,:,0,1]).max(), \
+                         numpy.absolute(d2fdxdy_exact - hessian[:,:,1,0]).max(), \
+                         numpy.absolute(self.d2fdy2_exact - hessian[:,:,1,1]).max(), \
+                         numpy.absolute(d2fdxdy_exact - self.der.d2dxdy(self.f)).max())
+
+        error = numpy.zeros(1)
+        self.comm.Allreduce(myerror, error, op=MPI.MAX)
+
+        self.assertLess(error[0], 5.0e-12, "Incorrect Hessian!")
+
+
 if __name__ == '__main__':
     unittest.main()
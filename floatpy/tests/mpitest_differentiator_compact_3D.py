@@ -160,6 +160,30 @@ class TestDifferentiatorCompact(unittest.TestCase):
             self.assertLess(error[i], 5.0e-14, "Incorrect gradient!")
 
 
+    def testGradientVector(self):
+        """
+        Test the gradient function with all the components of a vector.
+        """
+
+        u = numpy.concatenate((self.f[..., numpy.newaxis], 2.*self.f[..., numpy.newaxis], \
+            3.*self.f[..., numpy.newaxis]), axis=3)
+        u = numpy.asfortranarray(u)
+
+        dudx, dudy, dudz = self.der.gradient(u)
+
+        myerror = numpy.zeros(3)
+        for i in range(3):
+            myerror[0] = max(myerror[0], numpy.absolute((i+1)*self.dfdx_exact - dudx[:,:,:,i]).max())
+            myerror[1] = max(myerror[1], numpy.absolute((i+1)*self.dfdy_exact - dudy[:,:,:,i]).max())
+            myerror[2] = max(myerror[2], numpy.absolute((i+1)*self.dfdz_exact - dudz[:,:,:,i]).max())
+
+        error = numpy.zeros(3)
+        self.comm.Allreduce(myerror, error, op=MPI.MAX)
+
+        for i in range(3):
+            self.assertLess(error[i], 5.0e-13, "Incorrect gradient of vector!")
+
+
     def testDivergence(self):
         """
         Test the divergence function.
@@ -201,6 +225,75 @@ class TestDifferentiatorCompact(unittest.TestCase):
             self.assertLess(error[i], 5.0e-14, "Incorrect curl!")
 
 
+    def testCurlVector(self):
+        """
+        Test the curl function with a vector that is not a gradient.
+        """
+
+        u = numpy.concatenate((self.f[..., numpy.newaxis], 2.*self.f[..., numpy.newaxis], \
+            3.*self.f[..., numpy.newaxis]), axis=3)
+        u = numpy.asfortranarray(u)
+
+        curl = self.der.curl(u)
+
+        myerror = numpy.zeros(3)
+        myerror[0] = numpy.absolute(3.*self.dfdy_exact - 2.*self.dfdz_exact - curl[:,:,:,0]).max()
+        myerror[1] = numpy.absolute(self.dfdz_exact - 3.*self.dfdx_exact - curl[:,:,:,1]).max()
+        myerror[2] = numpy.absolute(2.*self.dfdx_exact - self.dfdy_exact - curl[:,:,:,2]).max()
+
+        error = numpy.zeros(3)
+        self.comm.Allreduce(myerror, error, op=MPI.MAX)
+
+        for i in range(3):
+            self.assertLess(error[i], 5.0e-13, "Incorrect curl of vector!")
+
+
+    def testVelocityGradientTensor(self):
+        """
+        Test the velocity gradient tensor function and the derived quantities.
+        """
+
+        u = numpy.concatenate((self.f[..., numpy.newaxis], 2.*self.f[..., numpy.newaxis], \
+            3.*self.f[..., numpy.newaxis]), axis=3)
+        u = numpy.asfortranarray(u)
+
+        tensor = self.der.velocity_gradient_tensor(u)
+
+        df_exact = (self.dfdx_exact, self.dfdy_exact, self.dfdz_exact)
+
+        myerror = numpy.zeros(1)
+        for i in range(3):
+            for j in range(3):
+                myerror[0] = max(myerror[0], numpy.absolute((i+1)*df_exact[j] - tensor[:,:,:,i,j]).max())
+
+        # Compare the derived quantities with the ones computed from the full tensor.
+
+        q_tensor = -0.5*numpy.einsum('...ij,...ji->...', tensor, tensor)
+
+        curl = self.der.curl(u)
+        enstrophy_curl = 0.5*numpy.sum(curl*curl, axis=3)
+
+        strain = 0.5*(tensor + numpy.swapaxes(tensor, -1, -2))
+        rotation = 0.5*(tensor - numpy.swapaxes(tensor, -1, -2))
+        lambda2_tensor = numpy.linalg.eigvalsh(numpy.matmul(strain, strain) + numpy.matmul(rotation, rotation))[..., 1]
+
+        myerror_derived = numpy.zeros(3)
+        myerror_derived[0] = numpy.absolute(q_tensor - self.der.q_criterion(u)).max()
+        myerror_derived[1] = numpy.absolute(enstrophy_curl - self.der.enstrophy(u)).max()
+        myerror_derived[2] = numpy.absolute(lambda2_tensor - self.der.lambda2(u)).max()
+
+        error = numpy.zeros(1)
+        self.comm.Allreduce(myerror, error, op=MPI.MAX)
+
+        error_derived = numpy.zeros(3)
+        self.comm.Allreduce(myerror_derived, error_derived, op=MPI.MAX)
+
+        self.assertLess(error[0], 5.0e-13, "Incorrect velocity gradient tensor!")
+        self.assertLess(error_derived[0], 1.0e-12, "Incorrect Q-criterion!")
+        self.assertLess(error_derived[1], 1.0e-12, "Incorrect enstrophy!")
+        self.assertLess(error_derived[2], 1.0e-12, "Incorrect lambda2!")
+
+
     def testLaplacian(self):
         """
         Test the laplacian function.
@@ -217,5 +310,81 @@ class TestDifferentiatorCompact(unittest.TestCase):
         self.assertLess(error[0], 5.0e-12, "Incorrect laplacian!")
 
 
+    def testHessian(self):
+        """
+        Test the Hessian and the mixed second derivative functions.
+        """
+
+        d2fdxdy_exact = -self.omega**2 * numpy.cos(self.omega*self.x) * numpy.sin(self.omega*self.y) * numpy.cos(self.omega*self.z)
+        d2fdxdz_exact = -self.omega**2 * numpy.cos(self.omega*self.x) * numpy.cos(self.omega*self.y) * numpy.sin(self.omega*self.z)
+        d2fdydz_exact =  self.omega**2 * numpy.sin(self.omega*self.x) * numpy.sin(self.omega*self.y) * numpy.sin(self.omega*self.z)
+
+        hessian_exact = ((self.d2fdx2_exact, d2fdxdy_exact, d2fdxdz_exact), \
+                         (d2fdxdy_exact, self.d2fdy2_exact, d2fdydz_exact), \
+                         (d2fdxdz_exact, d2fdydz_exact, self.d2fdz2_exact))
+
+        hessian = self.der.hessian(self.f)
+
+        myerror = numpy.zeros(1)
+        for i in range(3):
+            for j in range(3):
+                myerror[0] = max(myerror[0], numpy.absolute(hessian_exact[i][j] - hessian[:,:,:,i,j]).max())
+
+        # The mixed derivatives should be the same as the ones in the Hessian, also for a component of a vector.
+
+        u = numpy.asfortranarray(numpy.concatenate((2.*self.f[..., numpy.newaxis], self.f[..., numpy.newaxis]), axis=3))
+
+        d2fdydz = numpy.empty(self.chunk_3d_size, dtype=numpy.float64, order='F')
+        self.der.d2dydz(u, d2fdydz, component_idx=1)
+
+        myerror_mixed = numpy.zeros(1)
+        myerror_mixed[0] = max(numpy.absolute(self.der.d2dxdy(self.f) - hessian[:,:,:,0,1]).max(), \
+                               numpy.absolute(self.der.d2dxdz(self.f) - hessian[:,:,:,0,2]).max(), \
+                               numpy.absolute(d2fdydz - hessian[:,:,:,1,2]).max(), \
+                               numpy.absolute(self.der.hessian(u, component_idx=0) - 2.*hessian).max())
+
+        error = numpy.zeros(1)
+        self.comm.Allreduce(myerror, error, op=MPI.MAX)
+
+        error_mixed = numpy.zeros(1)
+        self.comm.Allreduce(myerror_mixed, error_mixed, op=MPI.MAX)
+
+        self.assertLess(error[0], 5.0e-12, "Incorrect Hessian!")
+        self.assertEqual(error_mixed[0], 0.0, "Incorrect mixed second derivatives!")
+
+
+    def testNumThreads(self):
+        """
+        Test that the derivatives do not depend on the number of threads of the solves.
+        """
+
+        myerror = numpy.zeros(1)
+
+        for order, periodic in [((10, 10, 10), self.periodic), ((10, 10, 10), (False, False, False)), \
+                                ((6, 6, 6), self.periodic)]:
+            der_serial = CompactDifferentiator(self.grid_partition, (self.dx, self.dy, self.dz), order, 3, periodic, \
+                                               num_threads=1)
+            der_threaded = CompactDifferentiator(self.grid_partition, (self.dx, self.dy, self.dz), order, 3, periodic, \
+                                                 num_threads=3)
+
+            self.assertEqual(der_serial.num_threads, 1, "Incorrect number of threads!")
+
+            myerror[0] = max(myerror[0], numpy.absolute(numpy.array(der_serial.gradient(self.f)) - \
+                                                        numpy.array(der_threaded.gradient(self.f))).max())
+
+            if order[0] == 10:
+                myerror[0] = max(myerror[0], numpy.absolute(der_serial.laplacian(self.f) - \
+                                                            der_threaded.laplacian(self.f)).max())
+
+        error = numpy.zeros(1)
+        self.comm.Allreduce(myerror, error, op=MPI.MAX)
+
+        self.assertEqual(error[0], 0.0, "Derivatives depend on the number of threads!")
+
+        self.der.setNumThreads()
+        self.assertEqual(self.der.num_threads, None, "Incorrect number of threads!")
+        self.assertRaises(RuntimeError, self.der.setNumThreads, 0)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -133,6 +133,31 @@ class TestFilter(unittest.TestCase):
         self.comm.Allreduce(myerror, error, op=MPI.MAX)
 
         self.assertLess(error[0], 1.0e-13, "Incorrect 3D filter!")
+
+
+    def testNumThreads(self):
+        """
+        Test that the filters do not depend on the number of threads.
+        """
+
+        myerror = numpy.zeros(1)
+
+        for filter_type in [self.filter_type, ('gaussian', 'gaussian', 'gaussian')]:
+            for periodic in [self.periodic, (False, False, False)]:
+                fil_serial = Filter(self.grid_partition, filter_type, periodic_dimensions=periodic, num_threads=1)
+                fil_threaded = Filter(self.grid_partition, filter_type, periodic_dimensions=periodic, num_threads=3)
+
+                myerror[0] = max(myerror[0], numpy.absolute(fil_serial.filter_all(self.f) - \
+                                                            fil_threaded.filter_all(self.f)).max())
+
+        error = numpy.zeros(1)
+        self.comm.Allreduce(myerror, error, op=MPI.MAX)
+
+        self.assertEqual(error[0], 0.0, "Filters depend on the number of threads!")
+
+        self.fil.setNumThreads(2)
+        self.assertEqual(self.fil.num_threads, 2, "Incorrect number of threads!")
+        self.assertRaises(RuntimeError, self.fil.setNumThreads, 0)
     
     
 if __name__ == '__main__':
@@ -0,0 +1,118 @@
+from mpi4py import MPI
+import numpy
+import unittest
+
+from floatpy.parallel import pencil_workspace, t3dmod, transpose_wrapper
+from floatpy.derivatives.compact_differentiator import CompactDifferentiator
+from floatpy.filters.filter import Filter
+
+class TestPencilWorkspace(unittest.TestCase):
+
+    def setUp(self):
+        self.nx, self.ny, self.nz = 32, 16, 8
+
+        self.comm = MPI.COMM_WORLD
+        self.fcomm = self.comm.py2f()
+        self.periodic = numpy.array([True, True, True])
+
+        self.grid_partition = t3dmod.t3d(self.fcomm, self.nx, self.ny, self.nz, self.periodic)
+
+        self.chunk_3d_size = numpy.zeros(3, dtype=numpy.int32, order='F')
+        self.chunk_x_size = numpy.zeros(3, dtype=numpy.int32, order='F')
+        self.grid_partition.get_sz3d(self.chunk_3d_size)
+        self.grid_partition.get_szx(self.chunk_x_size)
+
+
+    def testBuffersCached(self):
+
+        workspace = pencil_workspace.PencilWorkspace(self.grid_partition)
+
+        buffer_x = workspace.getBuffer(0)
+        self.assertEqual(buffer_x.shape, tuple(self.chunk_x_size), "Incorrect shape of buffer in x-direction!")
+        self.assertTrue(buffer_x.flags.f_contiguous, "Buffer is not in Fortran order!")
+
+        self.assertTrue(workspace.getBuffer(0) is buffer_x, "Buffer is not reused!")
+        self.assertFalse(workspace.getBuffer(0, tag='output') is buffer_x, "Buffer with different tag is reused!")
+
+        buffer_3d = workspace.getBuffer(None, dtype=numpy.complex128, num_components=3)
+        self.assertEqual(buffer_3d.shape, tuple(self.chunk_3d_size) + (3,), "Incorrect shape of buffer in 3D!")
+        self.assertEqual(buffer_3d.dtype, numpy.complex128, "Incorrect type of buffer!")
+
+        self.assertEqual(workspace.num_buffers, 3, "Incorrect number of cached buffers!")
+
+        workspace.clear()
+        self.assertEqual(workspace.num_buffers, 0, "Buffers not freed!")
+
+        self.assertRaises(RuntimeError, workspace.getBuffer, 3)
+
+
+    def testWorkspaceShared(self):
+
+        der = CompactDifferentiator(self.grid_partition, (0.1, 0.1, 0.1), (10, 10, 10), 3, self.periodic)
+        fil = Filter(self.grid_partition, ('compact', 'compact', 'compact'), 3, self.periodic)
+
+        workspace = pencil_workspace.getPencilWorkspace(self.grid_partition)
+
+        data = numpy.asfortranarray(numpy.random.rand(*self.chunk_3d_size))
+
+        der.ddx(data)
+        num_buffers = workspace.num_buffers
+
+        # The filter should reuse the buffers of the differentiator and repeated calls should not add new buffers.
+
+        fil.filter_x(data)
+        der.ddx(data)
+
+        self.assertEqual(workspace.num_buffers, num_buffers, "Buffers are not shared!")
+
+        # The transposed data from the workspace should be the same as the newly allocated transposed data.
+
+        tw = transpose_wrapper.TransposeWrapper(self.grid_partition, direction=0, dimension=3)
+
+        data_p = tw.transposeToPencil(data)
+        data_p_ws = tw.transposeToPencil(data, use_workspace=True)
+
+        self.assertEqual(numpy.absolute(data_p - data_p_ws).max(), 0.0, "Incorrect transposed data with workspace!")
+        self.assertTrue(numpy.may_share_memory(tw.transposeToPencil(data, use_workspace=True), data_p_ws), \
+            "Workspace buffer is not reused for the transpose!")
+
+        # Clearing the workspace through any of the objects should free the shared buffers.
+
+        fil.clearWorkspace()
+        self.assertEqual(workspace.num_buffers, 0, "Shared buffers not freed by the filter!")
+
+        der.ddx(data)
+        der.clearWorkspace()
+        self.assertEqual(workspace.num_buffers, 0, "Shared buffers not freed by the differentiator!")
+
+
+
+    def testBuffersBounded(self):
+
+        der = CompactDifferentiator(self.grid_partition, (0.1, 0.1, 0.1), (10, 10, 10), 3, self.periodic)
+
+        workspace = pencil_workspace.getPencilWorkspace(self.grid_partition)
+
+        data = numpy.asfortranarray(numpy.random.rand(*self.chunk_3d_size))
+        data_vector = numpy.asfortranarray(numpy.random.rand(*(tuple(self.chunk_3d_size) + (3,))))
+
+        # Requests with different numbers of components should share the buffers with the same direction and tag.
+
+        der.ddx(data)
+        der.curl(data_vector)
+        der.velocity_gradient_tensor(data_vector)
+        der.hessian(data)
+        der.ddx(data)
+
+        pencil_sizes = [numpy.zeros(3, dtype=numpy.int32, order='F') for i in range(3)]
+        self.grid_partition.get_szx(pencil_sizes[0])
+        self.grid_partition.get_szy(pencil_sizes[1])
+        self.grid_partition.get_szz(pencil_sizes[2])
+
+        num_bytes = 8*3*(2*sum([numpy.prod(size) for size in pencil_sizes]) + 2*numpy.prod(self.chunk_3d_size))
+
+        self.assertEqual(workspace.num_buffers, 8, "Incorrect number of cached buffers!")
+        self.assertEqual(workspace.num_bytes, num_bytes, "Incorrect number of bytes of cached buffers!")
+
+if __name__ == '__main__':
+    unittest.main()
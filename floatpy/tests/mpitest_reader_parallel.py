@@ -1,10 +1,12 @@
 from mpi4py import MPI
+import h5py
 import numpy
 import os
 import unittest
 
 import floatpy.readers.padeops_reader as por
 import floatpy.readers.parallel_reader as pdr
+import floatpy.readers.samrai_reader as sdr
 
 class TestReaderParallel(unittest.TestCase):
     
@@ -85,6 +87,46 @@ class TestReaderParallel(unittest.TestCase):
         self.assertEqual(zerr, 0., "Incorrect chunked coordinate data reader in Z")
     
     
+    def testReadRectilinearCoordinatesChunkWithCommunication(self):
+        
+        # Read full coordinates with the serial SAMRAI reader.
+        
+        directory_name = os.path.join(os.path.dirname(__file__), 'test_data_samrai_3D')
+        
+        serial_reader = sdr.SamraiDataReader(directory_name, periodic_dimensions=(True,True,True))
+        x, y, z = serial_reader.readCoordinates()
+        
+        reader = pdr.ParallelDataReader( self.comm, \
+            sdr.SamraiDataReader(directory_name, periodic_dimensions=(True,True,True)), num_ghosts=self.num_ghosts )
+        lo, hi = reader.interior_chunk
+        
+        # Read chunked coordinates after reading the data. The data of the serial reader should be kept.
+        
+        reader.serial_reader.readData('density')
+        sub_domain = reader.serial_reader.sub_domain
+        
+        coords_c = reader.readCoordinates(communicate=True)
+        
+        try:
+            reader.serial_reader.getData('density')
+        except RuntimeError:
+            self.fail("Data of the serial reader is cleared!")
+        
+        self.assertEqual(reader.serial_reader.sub_domain, sub_domain, "Sub-domain of the serial reader is changed!")
+        
+        # Check that the chunked coordinates are equal to the corresponding full coordinates with ghost cells.
+        
+        indices_ghost = [ range(lo[i]-self.num_ghosts[i], hi[i]+self.num_ghosts[i]+1) for i in range(3) ]
+        
+        for coords, coords_chunk in zip((x, y, z), coords_c):
+            coords_ghost = coords.take(indices_ghost[0], axis=0, mode='wrap')
+            coords_ghost = coords_ghost.take(indices_ghost[1], axis=1, mode='wrap')
+            coords_ghost = coords_ghost.take(indices_ghost[2], axis=2, mode='wrap')
+            
+            self.assertEqual(numpy.absolute(coords_ghost - coords_chunk).max(), 0., \
+                "Incorrect chunked rectilinear coordinates!")
+    
+    
     def testReadDataChunk(self):
         
         # Read full data.
@@ -169,5 +211,136 @@ class TestReaderParallel(unittest.TestCase):
         self.assertEqual(perr, 0., "Incorrect chunked variable data reader for p  ")
 
 
+    def testReadDataSubDomainWithCommunication(self):
+        
+        # Read full data.
+        
+        self.serial_reader.sub_domain = (0,0,0), (self.serial_reader.domain_size[0]-1, self.serial_reader.domain_size[1]-1, self.serial_reader.domain_size[2]-1)
+        rho, = self.serial_reader.readData('rho')
+        
+        # Read in the data of a sub-domain cut in the x and z directions.
+        
+        sub_lo = (2, 0, 1)
+        sub_hi = (self.serial_reader.domain_size[0]-2, self.serial_reader.domain_size[1]-1, 4)
+        
+        reader = pdr.ParallelDataReader( self.comm, por.PadeopsReader(self.filename, periodic_dimensions=(True,True,True)), \
+                                         sub_domain=(sub_lo, sub_hi), num_ghosts=self.num_ghosts )
+        reader.step = 0
+        
+        self.assertEqual(reader.sub_domain, (sub_lo, sub_hi), "Incorrect sub-domain")
+        self.assertEqual(reader.periodic_dimensions, (False, True, False), "Incorrect periodicity of sub-domain")
+        
+        rho_c, = reader.readData('rho', communicate=True)
+        
+        # The full chunk is inside the sub-domain in the non-periodic directions and wraps around in the periodic one.
+        
+        lo, hi = reader.full_chunk
+        
+        for i in (0, 2):
+            self.assertTrue(lo[i] >= sub_lo[i] and hi[i] <= sub_hi[i], "Full chunk outside of sub-domain")
+        
+        rho_ghost = rho.take(range(lo[0], hi[0]+1), axis=0, mode='wrap')
+        rho_ghost = rho_ghost.take(range(lo[1], hi[1]+1), axis=1, mode='wrap')
+        rho_ghost = rho_ghost.take(range(lo[2], hi[2]+1), axis=2, mode='wrap')
+        
+        self.assertEqual(rho_c.shape, reader.full_chunk_size, "Incorrect shape of sub-domain data")
+        self.assertEqual(numpy.absolute(rho_ghost - rho_c).max(), 0., "Incorrect sub-domain data reader for rho")
+
+
+    def testBatchedHaloExchange(self):
+        
+        # Fill the halos of several fields at once and one field at a time, with and without periodicity.
+        
+        sub_reader = pdr.ParallelDataReader( self.comm, por.PadeopsReader(self.filename, periodic_dimensions=(True,True,True)), \
+                                             sub_domain=((1, 0, 1), (6, 6, 4)), num_ghosts=(2, 1, 1) )
+        
+        for reader in (self.reader, sub_reader):
+            numpy.random.seed(self.comm.rank)
+            
+            data = numpy.zeros(reader.full_chunk_size + (4, ), dtype=numpy.float64, order='F')
+            data[reader.interior] = numpy.random.rand(*(reader.interior_chunk_size + (4, )))
+            
+            data_single = [ data[:, :, :, i].copy(order='F') for i in range(4) ]
+            
+            reader.grid_partition.fill_halo_x_batched(data)
+            reader.grid_partition.fill_halo_y_batched(data)
+            reader.grid_partition.fill_halo_z_batched(data)
+            
+            for i in range(4):
+                reader.grid_partition.fill_halo_x(data_single[i])
+                reader.grid_partition.fill_halo_y(data_single[i])
+                reader.grid_partition.fill_halo_z(data_single[i])
+                
+                self.assertEqual(numpy.absolute(data[:, :, :, i] - data_single[i]).max(), 0., \
+                    "Incorrect batched halo exchange")
+
+
+    def testNonBlockingHaloExchange(self):
+        
+        # Read in the data with the ghost cells filled by the blocking halo exchange.
+        
+        u, v, w = self.reader.readData(('u','v','w'), communicate=True)
+        rho,    = self.reader.readData('rho', communicate=True)
+        
+        # Read in the data without communication and fill the ghost cells with the non-blocking exchange.
+        
+        u_c, v_c, w_c = self.reader.readData(('u','v','w'))
+        rho_c,        = self.reader.readData('rho')
+        
+        handle = self.reader.beginHaloExchange((u_c, v_c, w_c, rho_c))
+        rho_sum = rho_c[self.reader.interior].sum()
+        self.reader.finishHaloExchange(handle)
+        
+        self.assertEqual(rho_sum, rho[self.reader.interior].sum(), "Incorrect interior data during halo exchange")
+        
+        # Only the ghost cells next to the faces of the interior chunk are filled.
+        
+        num_outside = numpy.zeros(self.reader.full_chunk_size, dtype=numpy.int32)
+        for i in range(3):
+            outside = numpy.ones(self.reader.full_chunk_size[i], dtype=numpy.int32)
+            outside[self.reader.interior[i]] = 0
+            shape = [1, 1, 1]
+            shape[i] = -1
+            num_outside = num_outside + outside.reshape(shape)
+        
+        faces = num_outside <= 1
+        
+        self.assertEqual(numpy.absolute(u  [faces] - u_c  [faces]).max(), 0., "Incorrect non-blocking halo exchange for u  ")
+        self.assertEqual(numpy.absolute(v  [faces] - v_c  [faces]).max(), 0., "Incorrect non-blocking halo exchange for v  ")
+        self.assertEqual(numpy.absolute(w  [faces] - w_c  [faces]).max(), 0., "Incorrect non-blocking halo exchange for w  ")
+        self.assertEqual(numpy.absolute(rho[faces] - rho_c[faces]).max(), 0., "Incorrect non-blocking halo exchange for rho")
+
+
+    def testCollectiveReadsNotSupported(self):
+        
+        # The serial reader has to use the communicator of the parallel reader for collective reads.
+        
+        self.assertRaises(RuntimeError, pdr.ParallelDataReader, self.comm, \
+            por.PadeopsReader(self.filename, periodic_dimensions=(True,True,True)), num_ghosts=self.num_ghosts, \
+            collective_io=True)
+    
+    
+    @unittest.skipIf(not h5py.get_config().mpi, "h5py is not built with MPI support")
+    def testReadDataCollective(self):
+        
+        reader = pdr.ParallelDataReader( self.comm, \
+            por.PadeopsReader(self.filename, periodic_dimensions=(True,True,True), comm=self.comm), \
+            num_ghosts=self.num_ghosts, collective_io=True )
+        reader.step = 0
+        
+        self.assertTrue(reader.collective_io, "Collective reads not used!")
+        
+        rho,    = self.reader.readData('rho', communicate=True)
+        u, v, w = self.reader.readData(('u','v','w'), communicate=True)
+        
+        rho_c,        = reader.readData('rho', communicate=True)
+        u_c, v_c, w_c = reader.readData(('u','v','w'), communicate=True)
+        
+        self.assertEqual(numpy.absolute(rho - rho_c).max(), 0., "Incorrect collective data reader for rho")
+        self.assertEqual(numpy.absolute(u   - u_c  ).max(), 0., "Incorrect collective data reader for u  ")
+        self.assertEqual(numpy.absolute(v   - v_c  ).max(), 0., "Incorrect collective data reader for v  ")
+        self.assertEqual(numpy.absolute(w   - w_c  ).max(), 0., "Incorrect collective data reader for w  ")
+
+
 if __name__ == '__main__':
     unittest.main()
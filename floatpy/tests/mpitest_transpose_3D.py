@@ -122,6 +122,70 @@ class TestTranspose3D(unittest.TestCase):
         vel_err = numpy.absolute(vel[lo_c[0]:hi_c[0]+1, lo_c[1]:hi_c[1]+1, lo_c[2]:hi_c[2]+1, :] - vel_c).max()
         self.assertEqual(vel_err, 0.0, "Incorrect transposed data to pencil in z-direction for vector!")
 
+    
+    
+    def testTransposeBatched(self):
+        
+        # Stack the fields in the parallel region as a single field with multiple components.
+        
+        rho_c, vel_c = self.reader.readData(('density', 'velocity'))
+        
+        data_c = numpy.concatenate((rho_c[..., numpy.newaxis], vel_c), axis=3)
+        data_c = numpy.asfortranarray(data_c)
+        
+        for direction in range(3):
+            tw = transpose_wrapper.TransposeWrapper(self.reader.grid_partition, direction=direction, dimension=3)
+            
+            # Compare the batched transpose of all components with the transposes of the components one by one.
+            
+            data_p = tw.transposeToPencil(data_c)
+            
+            for ic in range(data_c.shape[3]):
+                data_p_ic = tw.transposeToPencil(numpy.asfortranarray(data_c[:, :, :, ic]))
+                self.assertEqual(numpy.absolute(data_p[:, :, :, ic] - data_p_ic).max(), 0.0, \
+                    "Incorrect batched transposed data to pencil in direction %d!" % direction)
+            
+            data_err = numpy.absolute(tw.transposeFromPencil(data_p) - data_c).max()
+            self.assertEqual(data_err, 0.0, "Incorrect batched transposed data from pencil in direction %d!" % direction)
+
+    
+    
+    def testTransposeComplex(self):
+        
+        # Read full data.
+        
+        self.serial_reader.sub_domain = (0, 0, 0), \
+            (self.serial_reader.domain_size[0]-1, self.serial_reader.domain_size[1]-1, self.serial_reader.domain_size[2]-1)
+        
+        rho, vel = self.serial_reader.readData(('density', 'velocity'))
+        
+        # Read data in parallel region and make it complex.
+        
+        rho_c, vel_c = self.reader.readData(('density', 'velocity'))
+        
+        rho_c = rho_c + 1j*vel_c[:, :, :, 0]
+        vel_c = numpy.asfortranarray(vel_c - 1j*rho_c.real[:, :, :, numpy.newaxis])
+        
+        for direction in range(3):
+            tw = transpose_wrapper.TransposeWrapper(self.reader.grid_partition, direction=direction, dimension=3)
+            lo_p, hi_p = tw.full_pencil
+            
+            rho_p = tw.transposeToPencil(rho_c)
+            self.assertEqual(rho_p.dtype, numpy.complex128, "Incorrect type of transposed complex data!")
+            
+            rho_err = numpy.absolute(rho[lo_p[0]:hi_p[0]+1, lo_p[1]:hi_p[1]+1, lo_p[2]:hi_p[2]+1] + \
+                                     1j*vel[lo_p[0]:hi_p[0]+1, lo_p[1]:hi_p[1]+1, lo_p[2]:hi_p[2]+1, 0] - rho_p).max()
+            self.assertEqual(rho_err, 0.0, "Incorrect transposed complex data to pencil in direction %d!" % direction)
+            
+            vel_p = tw.transposeToPencil(vel_c)
+            self.assertEqual(numpy.absolute(tw.transposeFromPencil(vel_p) - vel_c).max(), 0.0, \
+                "Incorrect transposed complex vector from pencil in direction %d!" % direction)
+            
+            self.assertEqual(numpy.absolute(tw.transposeFromPencil(rho_p) - rho_c).max(), 0.0, \
+                "Incorrect transposed complex data from pencil in direction %d!" % direction)
+        
+        self.assertRaises(ValueError, tw.transposeToPencil, rho_c.astype(numpy.complex64))
+
 
 if __name__ == '__main__':
     unittest.main()
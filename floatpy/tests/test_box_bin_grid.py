@@ -0,0 +1,62 @@
+import numpy
+import unittest
+
+from floatpy.utilities.box_bin_grid import BoxBinGrid
+
+class TestBoxBinGrid(unittest.TestCase):
+
+    def setUp(self):
+        numpy.random.seed(2017)
+
+
+    def bruteForceQuery(self, lo_boxes, hi_boxes, lo, hi):
+        intersect = numpy.all(numpy.logical_and(lo_boxes <= hi, hi_boxes >= lo), axis=1)
+        return numpy.nonzero(intersect)[0]
+
+
+    def testQueryRandomBoxes(self):
+        """
+        Test the queries of random boxes against a brute force search in 1D, 2D and 3D.
+        """
+
+        for dim in range(1, 4):
+            lo_boxes = numpy.random.randint(0, 100, size=(200, dim))
+            hi_boxes = lo_boxes + numpy.random.randint(0, 20, size=(200, dim))
+
+            grid = BoxBinGrid(lo_boxes, hi_boxes)
+
+            self.assertEqual(grid.num_boxes, 200, "Incorrect number of boxes in %dD!" % dim)
+
+            for query_idx in range(50):
+                lo = numpy.random.randint(-20, 120, size=dim)
+                hi = lo + numpy.random.randint(0, 40, size=dim)
+
+                self.assertTrue(numpy.array_equal(grid.query(lo, hi), \
+                                                  self.bruteForceQuery(lo_boxes, hi_boxes, lo, hi)), \
+                    "Incorrect query of boxes in %dD!" % dim)
+
+
+    def testQueryTiledBoxes(self):
+        """
+        Test the queries of boxes tiling a 2D domain, as the patches of a level in AMR data.
+        """
+
+        lo_boxes = numpy.array([[i, j] for i in range(0, 64, 16) for j in range(0, 32, 8)])
+        hi_boxes = lo_boxes + numpy.array([15, 7])
+
+        grid = BoxBinGrid(lo_boxes, hi_boxes, bin_size=(10, 10))
+
+        self.assertEqual(grid.bin_size, (10, 10), "Incorrect bin size!")
+
+        self.assertTrue(numpy.array_equal(grid.query((0, 0), (63, 31)), numpy.arange(16)), \
+            "Incorrect query of the full domain!")
+        self.assertTrue(numpy.array_equal(grid.query((15, 7), (16, 8)), numpy.array([0, 1, 4, 5])), \
+            "Incorrect query at a corner of the boxes!")
+        self.assertEqual(grid.query((64, 0), (70, 31)).shape[0], 0, "Incorrect query outside of the boxes!")
+
+        self.assertTrue(grid.isSameBoxes(lo_boxes, hi_boxes), "Incorrect comparison of the same boxes!")
+        self.assertFalse(grid.isSameBoxes(lo_boxes, hi_boxes + 1), "Incorrect comparison of different boxes!")
+
+
+if __name__ == '__main__':
+    unittest.main()
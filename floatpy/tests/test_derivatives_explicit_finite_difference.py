@@ -0,0 +1,97 @@
+import numpy
+import unittest
+
+import floatpy.derivatives.explicit.finite_difference as finite_difference
+from floatpy.derivatives import ExplicitDifferentiator
+
+class TestDerivativesFiniteDifference(unittest.TestCase):
+
+    def testFornbergWeights(self):
+        """
+        Test the generated coefficients of the stencils against the known coefficients.
+        """
+
+        weights = finite_difference.getFornbergWeights(0, range(-4, 5), 1)
+        weights_exact = numpy.array([1.0/280.0, -4.0/105.0, 1.0/5.0, -4.0/5.0, 0.0, 4.0/5.0, -1.0/5.0, 4.0/105.0, \
+                                     -1.0/280.0])
+        self.assertTrue(numpy.array_equal(weights, weights_exact), "Incorrect eighth order first derivative weights!")
+
+        weights = finite_difference.getFornbergWeights(0, range(3), 2)
+        self.assertTrue(numpy.array_equal(weights, numpy.array([1.0, -2.0, 1.0])), \
+            "Incorrect one-sided second derivative weights!")
+
+        coeffs_interior, coeffs_left, coeffs_right, num_ghosts = finite_difference.getStencilCoefficients(2, 10)
+
+        self.assertEqual(num_ghosts, 5, "Incorrect number of ghost cells!")
+        self.assertEqual(len(coeffs_interior), 11, "Incorrect width of interior stencil!")
+        self.assertEqual(len(coeffs_left), 5, "Incorrect number of left boundary stencils!")
+        self.assertEqual(len(coeffs_left[0]), 12, "Incorrect width of left boundary stencils!")
+
+        # The stencils at the right boundary should be the mirrored stencils at the left boundary.
+
+        for i in range(num_ghosts):
+            self.assertTrue(numpy.array_equal(coeffs_right[i], coeffs_left[num_ghosts - 1 - i][::-1]), \
+                "Right boundary stencils are not mirrored left boundary stencils!")
+
+        self.assertRaises(RuntimeError, finite_difference.getStencilCoefficients, 1, 3)
+        self.assertRaises(RuntimeError, finite_difference.getFornbergWeights, 0, [0, 1], 2)
+
+
+    def testConvergence(self):
+        """
+        Test the order of convergence of the eighth and tenth order derivatives in the interior of the domain.
+        """
+
+        for order in [8, 10]:
+            errors_first = []
+            errors_second = []
+
+            for n in [16, 32]:
+                x = numpy.linspace(0.0, 2.0*numpy.pi, n + 1)
+                dx = x[1] - x[0]
+
+                y = numpy.sin(x)
+
+                y_prime = finite_difference.differentiateFiniteDifference(y, dx, 0, 1, order, None, False, 1, 'C')
+                y_prime_prime = finite_difference.differentiateFiniteDifference(y, dx, 0, 2, order, None, False, 1, \
+                                                                                'C')
+
+                errors_first.append(numpy.nanmax(numpy.absolute(y_prime - numpy.cos(x))))
+                errors_second.append(numpy.nanmax(numpy.absolute(y_prime_prime + numpy.sin(x))))
+
+            self.assertGreater(numpy.log2(errors_first[0]/errors_first[1]), order - 0.5, \
+                "Incorrect order of convergence of order %d first derivative!" % order)
+            self.assertGreater(numpy.log2(errors_second[0]/errors_second[1]), order - 0.5, \
+                "Incorrect order of convergence of order %d second derivative!" % order)
+
+
+    def testDifferentiatorHighOrder(self):
+        """
+        Test the tenth order derivatives of the explicit differentiator in 2D.
+        """
+
+        x = numpy.linspace(0.0, 2.0*numpy.pi, 65)
+        y = numpy.linspace(0.0, 2.0*numpy.pi, 33)
+        dx, dy = x[1] - x[0], y[1] - y[0]
+
+        x, y = numpy.meshgrid(x, y, indexing='ij')
+        f = numpy.asfortranarray(numpy.sin(x)*numpy.cos(y))
+
+        der = ExplicitDifferentiator((dx, dy), (10, 10), dimension=2, data_order='F')
+
+        self.assertTrue(numpy.array_equal(der.num_ghosts, numpy.array([5, 5])), "Incorrect number of ghost cells!")
+
+        dfdx = der.ddx(f, use_one_sided=True)
+        d2fdy2 = der.d2dy2(f)
+
+        self.assertLess(numpy.absolute(dfdx - numpy.cos(x)*numpy.cos(y)).max(), 1.0e-8, \
+            "Incorrect tenth order first derivative in X direction!")
+        self.assertLess(numpy.nanmax(numpy.absolute(d2fdy2 + f)), 1.0e-8, \
+            "Incorrect tenth order second derivative in Y direction!")
+        self.assertTrue(numpy.all(numpy.isnan(d2fdy2[:, :5])), "Boundaries are not NAN!")
+
+        self.assertRaises(RuntimeError, ExplicitDifferentiator, (dx, dy), (12, 10), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
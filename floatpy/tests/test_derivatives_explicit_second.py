@@ -80,5 +80,47 @@ class TestDerivativesSecond(unittest.TestCase):
         self.assertLess(error_6, 1.0e-7, "Incorrect derivative in third direction for sixth order finite difference")
     
     
+    def testOutputArray(self):
+        """
+        Test the second derivatives written into a given output array.
+        """
+        
+        numpy.random.seed(2017)
+        
+        y = numpy.asfortranarray(numpy.random.rand(20, 18, 16))
+        dx = 0.1
+        
+        functions = [(second_der.differentiateSecondOrderFiniteDifference, 1), \
+                     (second_der.differentiateFourthOrderFiniteDifference, 2), \
+                     (second_der.differentiateSixthOrderFiniteDifference, 3)]
+        
+        for function, num_ghosts in functions:
+            for direction in range(3):
+                y_prime = function(y, dx, direction, None, True, 3, 'F')
+                
+                y_prime_out = numpy.empty(y.shape, order='F')
+                y_prime_returned = function(y, dx, direction, None, True, 3, 'F', diff_data=y_prime_out)
+                
+                self.assertTrue(y_prime_returned is y_prime_out, "Output array is not returned!")
+                self.assertTrue(numpy.array_equal(y_prime_out, y_prime), "Incorrect derivative in output array!")
+                
+                # Without the one-sided scheme only the points at the boundaries should be NAN.
+                
+                function(y, dx, direction, None, False, 3, 'F', diff_data=y_prime_out)
+                
+                is_boundary = numpy.zeros(y.shape[direction], dtype=bool)
+                is_boundary[:num_ghosts] = True
+                is_boundary[-num_ghosts:] = True
+                
+                is_nan = numpy.rollaxis(numpy.isnan(y_prime_out), direction)
+                self.assertTrue(numpy.all(is_nan[is_boundary]), "Points at the boundaries are not NAN!")
+                self.assertFalse(numpy.any(is_nan[~is_boundary]), "Points in the interior are NAN!")
+                self.assertTrue(numpy.array_equal(numpy.rollaxis(y_prime_out, direction)[~is_boundary], \
+                                                  numpy.rollaxis(y_prime, direction)[~is_boundary]), \
+                    "Incorrect derivative in the interior!")
+        
+        self.assertRaises(RuntimeError, functions[0][0], y, dx, 0, None, True, 3, 'F', numpy.empty((20, 18)))
+    
+    
 if __name__ == '__main__':
     unittest.main()
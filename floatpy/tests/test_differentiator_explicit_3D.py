@@ -2,6 +2,7 @@ import numpy
 import unittest
 
 from floatpy.derivatives import ExplicitDifferentiator
+from floatpy.derivatives.explicit import stencil
 
 class TestDifferentiatorExplicit(unittest.TestCase):
     
@@ -157,6 +158,76 @@ class TestDifferentiatorExplicit(unittest.TestCase):
             self.assertLess(error[i], 1.0e-6, "Incorrect curl!")
 
 
+    def testVelocityGradientTensor(self):
+        """
+        Test the velocity gradient tensor function.
+        """
+
+        u = numpy.concatenate((self.f[..., numpy.newaxis], 2.*self.f[..., numpy.newaxis], \
+            3.*self.f[..., numpy.newaxis]), axis=3)
+        u = numpy.asfortranarray(u)
+
+        tensor = self.der.velocity_gradient_tensor(u, use_one_sided=True)
+
+        self.assertEqual(tensor.shape, u.shape + (3,), "Incorrect shape of velocity gradient tensor!")
+
+        df_exact = (self.dfdx_exact, self.dfdy_exact, self.dfdz_exact)
+
+        for i in range(3):
+            for j in range(3):
+                error = numpy.absolute((i+1)*df_exact[j] - tensor[:,:,:,i,j]).max()
+                self.assertLess(error, 5.0e-6, "Incorrect velocity gradient tensor!")
+
+
+    def testHessian(self):
+        """
+        Test the Hessian and the mixed second derivative functions in both data layouts.
+        """
+
+        d2fdxdy_exact = -self.omega**2 * numpy.cos(self.omega*self.x) * numpy.sin(self.omega*self.y) * numpy.cos(self.omega*self.z)
+        d2fdxdz_exact = -self.omega**2 * numpy.cos(self.omega*self.x) * numpy.cos(self.omega*self.y) * numpy.sin(self.omega*self.z)
+        d2fdydz_exact =  self.omega**2 * numpy.sin(self.omega*self.x) * numpy.sin(self.omega*self.y) * numpy.sin(self.omega*self.z)
+
+        hessian_exact = ((self.d2fdx2_exact, d2fdxdy_exact, d2fdxdz_exact), \
+                         (d2fdxdy_exact, self.d2fdy2_exact, d2fdydz_exact), \
+                         (d2fdxdz_exact, d2fdydz_exact, self.d2fdz2_exact))
+
+        hessian = self.der.hessian(self.f, use_one_sided=True)
+
+        self.assertEqual(hessian.shape, self.f.shape + (3, 3), "Incorrect shape of Hessian!")
+
+        for i in range(3):
+            for j in range(3):
+                error = numpy.absolute(hessian_exact[i][j] - hessian[:,:,:,i,j]).max()
+                self.assertLess(error, 5.0e-5, "Incorrect Hessian!")
+
+        d2fdxdz = numpy.empty(self.f.shape, dtype=numpy.float64, order='F')
+        self.der.d2dxdz(self.f, d2fdxdz, use_one_sided=True)
+
+        self.assertTrue(numpy.array_equal(self.der.d2dxdy(self.f, use_one_sided=True), hessian[:,:,:,0,1]), \
+            "Incorrect mixed derivative in X and Y directions!")
+        self.assertTrue(numpy.array_equal(d2fdxdz, hessian[:,:,:,2,0]), \
+            "Incorrect mixed derivative in X and Z directions!")
+        self.assertTrue(numpy.array_equal(self.der.d2dydz(self.f, use_one_sided=True), hessian[:,:,:,1,2]), \
+            "Incorrect mixed derivative in Y and Z directions!")
+
+        # The Hessian of a component of C ordered data should be the same.
+
+        der_c = ExplicitDifferentiator((self.dx, self.dy, self.dz), self.order, 3, 'C')
+
+        u = numpy.ascontiguousarray(numpy.concatenate((self.f[numpy.newaxis, ...], 2.*self.f[numpy.newaxis, ...]), \
+                                                      axis=0))
+
+        hessian_c = der_c.hessian(u, component_idx=1, use_one_sided=True)
+
+        self.assertEqual(hessian_c.shape, (3, 3) + self.f.shape, "Incorrect shape of Hessian in C layout!")
+
+        for i in range(3):
+            for j in range(3):
+                self.assertLess(numpy.absolute(hessian_c[i, j] - 2.*hessian[:,:,:,i,j]).max(), 1.0e-10, \
+                    "Incorrect Hessian in C layout!")
+
+
     def testLaplacian(self):
         """
         Test the laplacian function.
@@ -170,5 +241,37 @@ class TestDifferentiatorExplicit(unittest.TestCase):
         self.assertLess(error[0], 5.0e-5, "Incorrect laplacian!")
 
 
+    @unittest.skipIf(not stencil.has_fortran_backend, "Fortran backend of the explicit stencils is not built")
+    def testFortranBackend(self):
+        """
+        Test the derivatives with the Fortran backend against the derivatives with the NumPy backend.
+        """
+
+        self.assertRaises(RuntimeError, ExplicitDifferentiator, (self.dx, self.dy, self.dz), self.order, 3, 'F', \
+            'cuda')
+
+        for data_order in ['F', 'C']:
+            f = numpy.asfortranarray(self.f) if data_order == 'F' else numpy.ascontiguousarray(self.f)
+
+            for order in [2, 4, 6]:
+                der_numpy = ExplicitDifferentiator((self.dx, self.dy, self.dz), (order, order, order), 3, data_order, \
+                    backend='numpy')
+                der_fortran = ExplicitDifferentiator((self.dx, self.dy, self.dz), (order, order, order), 3, \
+                    data_order, backend='fortran')
+
+                self.assertEqual(der_fortran.backend, 'fortran', "Fortran backend is not used!")
+
+                for method in ['ddx', 'ddy', 'ddz', 'd2dx2', 'd2dy2', 'd2dz2']:
+                    for use_one_sided in [True, False]:
+                        df_numpy = getattr(der_numpy, method)(f, use_one_sided=use_one_sided)
+                        df_fortran = getattr(der_fortran, method)(f, use_one_sided=use_one_sided)
+
+                        self.assertTrue(numpy.array_equal(numpy.isnan(df_numpy), numpy.isnan(df_fortran)), \
+                            "Incorrect boundaries of %s with Fortran backend!" % method)
+
+                        error = numpy.nanmax(numpy.absolute(df_numpy - df_fortran))
+                        self.assertLess(error, 1.0e-10, "Incorrect %s with Fortran backend!" % method)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,3 +1,4 @@
+import h5py
 import numpy
 import os
 import unittest
@@ -70,6 +71,57 @@ class TestReaderPadeops(unittest.TestCase):
         self.assertEqual(verr, 0., "Incorrect chunked variable data reader for v!")
         self.assertEqual(werr, 0., "Incorrect chunked variable data reader for w!")
         self.assertEqual(perr, 0., "Incorrect chunked variable data reader for p!")
+    
+    
+    def testReadDataInPlace(self):
+        
+        u, v = self.reader.readData(('u','v'))
+        
+        # Read data into given arrays in Fortran and C orders.
+        
+        chunk_size = tuple(numpy.array(self.hi) - numpy.array(self.lo) + 1)
+        
+        u_f = numpy.empty(chunk_size, dtype=numpy.float64, order='F')
+        v_c = numpy.empty(chunk_size, dtype=numpy.float64, order='C')
+        
+        data = [u_f, v_c]
+        self.reader.readData(('u','v'), data=data)
+        
+        self.assertTrue(data[0] is u_f, "Data not read into the given Fortran ordered array!")
+        self.assertTrue(data[1] is v_c, "Data not read into the given C ordered array!")
+        
+        self.assertEqual(numpy.absolute(u - u_f).max(), 0., "Incorrect data read into the given array for u!")
+        self.assertEqual(numpy.absolute(v - v_c).max(), 0., "Incorrect data read into the given array for v!")
+    
+    
+    def testReadDataKeepOpen(self):
+        
+        rho, = self.reader.readData('rho')
+        
+        # Read data with the file kept open inside a with statement.
+        
+        with por.PadeopsReader(self.filename, periodic_dimensions=(True,True,True)) as reader:
+            reader.sub_domain = self.lo, self.hi
+            
+            vizfile = h5py.File(self.filename, 'r')
+            for step in reader.steps:
+                reader.step = step
+                self.assertEqual(reader.time, vizfile['%04d' %step].attrs['Time'][0], "Incorrect time at step %d!" %step)
+            vizfile.close()
+            
+            reader.step = 0
+            rho_o, = reader.readData('rho')
+        
+        self.assertEqual(numpy.absolute(rho - rho_o).max(), 0., "Incorrect data read with the file kept open!")
+        
+        # Read data with the file kept open until it is closed explicitly.
+        
+        reader = por.PadeopsReader(self.filename, periodic_dimensions=(True,True,True), keep_open=True)
+        reader.sub_domain = self.lo, self.hi
+        rho_o, = reader.readData('rho')
+        reader.close()
+        
+        self.assertEqual(numpy.absolute(rho - rho_o).max(), 0., "Incorrect data read with the file kept open!")
 
 
 if __name__ == '__main__':
@@ -58,6 +58,37 @@ class TestSamraiDataReader2D(unittest.TestCase):
         self.assertEqual(rho_err, 0.0, "Incorrect sub-domain variable data reader for density!")
         self.assertEqual(vel_err, 0.0, "Incorrect sub-domain variable data reader for velocity!")
         self.assertEqual(p_err,   0.0, "Incorrect sub-domain variable data reader for pressure!")
+    
+    
+    def testReadDataPeriodicGhostCells(self):
+        
+        reader = samrai_reader.SamraiDataReader(self.directory_name, periodic_dimensions=(True, True, False))
+        reader.step = 0
+        
+        # Read full data.
+        
+        reader.sub_domain = (0, 0), (reader.domain_size[0]-1, reader.domain_size[1]-1)
+        
+        rho, = reader.readData(('density',))
+        
+        # Read data in a sub-domain touching the corner of the domain with ghost cells.
+        
+        num_ghosts = (3, 2)
+        
+        reader.sub_domain = (0, 0), self.hi
+        reader.readCombinedDataInSubdomainFromAllLevels(('density',), num_ghosts)
+        rho_s = reader.getData('density')[:, :, 0]
+        
+        # Check that the ghost cells are filled with the periodic images of the data.
+        
+        x_idx = numpy.arange(-num_ghosts[0], self.hi[0] + 1 + num_ghosts[0])
+        y_idx = numpy.arange(-num_ghosts[1], self.hi[1] + 1 + num_ghosts[1])
+        
+        rho_periodic = rho.take(x_idx, axis=0, mode='wrap').take(y_idx, axis=1, mode='wrap')
+        
+        rho_err = numpy.absolute(rho_periodic - rho_s).max()
+        
+        self.assertEqual(rho_err, 0.0, "Incorrect periodic ghost cell data reader for density!")
 
 
 if __name__ == '__main__':
@@ -41,6 +41,26 @@ class TestSamraiDataReader3D(unittest.TestCase):
         self.assertEqual(z_err, 0.0, "Incorrect sub-domain coordinate data reader in z direction!")
     
     
+    def testReadCoordinatesLazy(self):
+        
+        x_s, y_s, z_s = self.reader.readCoordinates()
+        
+        # The coordinates should only be broadcast from the 1D axes until dense arrays are requested.
+        
+        coords = self.reader.readCoordinates()
+        
+        self.assertTrue(all([numpy.ndim(axis) == 1 for axis in coords.axes]), "Coordinates not stored with 1D axes!")
+        self.assertEqual(coords.shape, x_s.shape, "Incorrect shape of the coordinates!")
+        
+        x_d, y_d, z_d = coords.toDense()
+        
+        self.assertTrue(x_d.flags['F_CONTIGUOUS'], "Dense coordinates not in Fortran order!")
+        
+        self.assertEqual(numpy.absolute(x_d - x_s).max(), 0.0, "Incorrect dense coordinates in x direction!")
+        self.assertEqual(numpy.absolute(y_d - y_s).max(), 0.0, "Incorrect dense coordinates in y direction!")
+        self.assertEqual(numpy.absolute(z_d - z_s).max(), 0.0, "Incorrect dense coordinates in z direction!")
+    
+    
     def testReadDataSubdomain(self):
         
         # Read full data.
@@ -65,6 +85,47 @@ class TestSamraiDataReader3D(unittest.TestCase):
         self.assertEqual(rho_err, 0.0, "Incorrect sub-domain variable data reader for density!")
         self.assertEqual(vel_err, 0.0, "Incorrect sub-domain variable data reader for velocity!")
         self.assertEqual(p_err,   0.0, "Incorrect sub-domain variable data reader for pressure!")
+    
+    
+    def testReadDataConcurrent(self):
+        
+        # Read data with file clusters loaded one at a time.
+        
+        rho, vel = self.reader.readData(('density', 'velocity'))
+        
+        # Read data with file clusters loaded concurrently by threads and processes.
+        
+        for worker_type in ('thread', 'process'):
+            reader = samrai_reader.SamraiDataReader(self.directory_name, num_workers=2, worker_type=worker_type)
+            reader.sub_domain = (self.lo, self.hi)
+            reader.step = 0
+            
+            rho_c, vel_c = reader.readData(('density', 'velocity'))
+            
+            rho_err = numpy.absolute(rho - rho_c).max()
+            vel_err = numpy.absolute(vel - vel_c).max()
+            
+            self.assertEqual(rho_err, 0.0, "Incorrect concurrent data reader with " + worker_type + "s for density!")
+            self.assertEqual(vel_err, 0.0, "Incorrect concurrent data reader with " + worker_type + "s for velocity!")
+    
+    
+    def testReadDataInPlace(self):
+        
+        rho, vel = self.reader.readData(('density', 'velocity'))
+        
+        # Read data into given arrays.
+        
+        rho_i = numpy.empty(rho.shape, dtype=numpy.float64, order='F')
+        vel_i = numpy.empty(vel.shape, dtype=numpy.float64, order='F')
+        
+        data = [rho_i, vel_i]
+        self.reader.readData(('density', 'velocity'), data=data)
+        
+        self.assertTrue(data[0] is rho_i, "Data not read into the given array for density!")
+        self.assertTrue(data[1] is vel_i, "Data not read into the given array for velocity!")
+        
+        self.assertEqual(numpy.absolute(rho - rho_i).max(), 0.0, "Incorrect data read into the given array for density!")
+        self.assertEqual(numpy.absolute(vel - vel_i).max(), 0.0, "Incorrect data read into the given array for velocity!")
 
 
 if __name__ == '__main__':
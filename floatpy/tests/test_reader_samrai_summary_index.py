@@ -0,0 +1,95 @@
+import numpy
+import os
+import shutil
+import tempfile
+import unittest
+
+from floatpy.readers import samrai_reader
+
+class TestSamraiDataReaderSummaryIndex(unittest.TestCase):
+
+    def setUp(self):
+        # Copy the data to a temporary directory since the summary index is written inside the dump folders.
+
+        self.temp_directory_name = tempfile.mkdtemp()
+        self.directory_name = os.path.join(self.temp_directory_name, 'test_data_samrai_AMR')
+        shutil.copytree(os.path.join(os.path.dirname(__file__), 'test_data_samrai_AMR'), self.directory_name)
+
+        self.reader = samrai_reader.SamraiDataReader(self.directory_name)
+        self.reader_index = samrai_reader.SamraiDataReader(self.directory_name, use_summary_index=True)
+
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_directory_name)
+
+
+    def testSummaryIndexWritten(self):
+
+        for step in self.reader_index.steps:
+            self.reader_index.step = step
+
+            index_directory_name = os.path.join(self.directory_name, 'visit_dump.%05d' % step, 'summary_index')
+
+            self.assertTrue(os.path.isfile(os.path.join(index_directory_name, 'basic_info.npz')), \
+                "Basic information of summary index not written!")
+            self.assertTrue(os.path.isfile(os.path.join(index_directory_name, 'patch_extents.npy')), \
+                "Patch extents of summary index not written!")
+            self.assertTrue(os.path.isfile(os.path.join(index_directory_name, 'patch_map.npy')), \
+                "Patch map of summary index not written!")
+
+
+    def testSummaryIndexMetadata(self):
+
+        for step in self.reader.steps:
+            # Write the index first and then load it with a new reader.
+
+            self.reader_index.step = step
+
+            reader_index = samrai_reader.SamraiDataReader(self.directory_name, use_summary_index=True)
+            reader_index.step = step
+            self.reader.step = step
+
+            self.assertTrue(isinstance(reader_index.getPatchExtents(), numpy.memmap), \
+                "Patch extents not loaded from summary index!")
+
+            basic_info = self.reader.getBasicInfo()
+            basic_info_index = reader_index.getBasicInfo()
+
+            self.assertEqual(sorted(basic_info.keys()), sorted(basic_info_index.keys()), \
+                "Incorrect keys of basic information from summary index!")
+
+            for key in basic_info:
+                self.assertTrue(numpy.all(numpy.asarray(basic_info[key]) == numpy.asarray(basic_info_index[key])), \
+                    "Incorrect basic information '" + key + "' from summary index!")
+
+            for field_idx in range(4):
+                self.assertTrue(numpy.all( \
+                    [numpy.all(self.reader.getPatchExtents()[i][field_idx] == reader_index.getPatchExtents()[i][field_idx]) \
+                     for i in range(self.reader.getPatchExtents().shape[0])]), \
+                    "Incorrect patch extents from summary index!")
+
+                self.assertTrue(numpy.all( \
+                    [self.reader.getPatchMap()[i][field_idx] == reader_index.getPatchMap()[i][field_idx] \
+                     for i in range(self.reader.getPatchMap().shape[0])]), \
+                    "Incorrect patch map from summary index!")
+
+
+    def testReadDataSummaryIndex(self):
+
+        # Write the index first and then read the data with a new reader.
+
+        self.reader_index.step = 100
+
+        reader_index = samrai_reader.SamraiDataReader(self.directory_name, use_summary_index=True)
+        reader_index.step = 100
+        self.reader.step = 100
+
+        rho, vel = self.reader.readData(('density', 'velocity'))
+        rho_i, vel_i = reader_index.readData(('density', 'velocity'))
+
+        self.assertEqual(numpy.absolute(rho - rho_i).max(), 0.0, "Incorrect density read with summary index!")
+        self.assertEqual(numpy.absolute(vel - vel_i).max(), 0.0, "Incorrect velocity read with summary index!")
+
+
+if __name__ == '__main__':
+    unittest.main()
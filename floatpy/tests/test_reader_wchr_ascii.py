@@ -1,5 +1,8 @@
+import glob
 import numpy
 import os
+import shutil
+import tempfile
 import unittest
 
 import floatpy.readers.wchr_ascii_reader as war
@@ -70,6 +73,95 @@ class TestReaderWchrAscii(unittest.TestCase):
         self.assertEqual(verr, 0., "Incorrect chunked variable data reader for v!")
         self.assertEqual(werr, 0., "Incorrect chunked variable data reader for w!")
         self.assertEqual(perr, 0., "Incorrect chunked variable data reader for p!")
+    
+    
+    def testReadDataSinglePass(self):
+        
+        # Read all the variables at once and check them against the ASCII files parsed one column at a time.
+        
+        self.reader.sub_domain = (0,0,0), \
+            (self.reader.domain_size[0]-1, self.reader.domain_size[1]-1, self.reader.domain_size[2]-1)
+        
+        var_names = ('rho', 'u', 'v', 'w', 'p')
+        data = self.reader.readData(var_names)
+        
+        for row in range(self.reader.prow):
+            for col in range(self.reader.pcol):
+                filename = self.filename_prefix + ('0000_px%04d_pz%04d.dat' % (row, col))
+                
+                lo = self.reader.pencil_lo[row,col]
+                hi = self.reader.pencil_hi[row,col]
+                
+                for i in range(len(var_names)):
+                    pencil = numpy.loadtxt(filename, skiprows=2, usecols=(i,))
+                    pencil = pencil.reshape((hi[0]-lo[0], self.reader.domain_size[1], hi[1]-lo[1]), order='F')
+                    
+                    err = numpy.absolute(data[i][lo[0]:hi[0], :, lo[1]:hi[1]] - pencil).max()
+                    self.assertEqual(err, 0., "Incorrect single pass data reader for " + var_names[i] + "!")
+    
+    
+    def testReadDataConcurrent(self):
+        
+        x, y, z = self.reader.readCoordinates()
+        rho, u, p = self.reader.readData(('rho','u','p'))
+        
+        # Read in the same chunk with a pool of worker processes.
+        
+        reader = war.WchrAsciiReader(self.filename_prefix, num_workers=3)
+        reader.sub_domain = self.lo, self.hi
+        reader.step = 0
+        
+        x_w, y_w, z_w = reader.readCoordinates()
+        rho_w, u_w, p_w = reader.readData(('rho','u','p'))
+        
+        self.assertEqual(numpy.absolute(x - x_w).max(), 0., "Incorrect concurrent coordinate reader in x direction!")
+        self.assertEqual(numpy.absolute(y - y_w).max(), 0., "Incorrect concurrent coordinate reader in y direction!")
+        self.assertEqual(numpy.absolute(z - z_w).max(), 0., "Incorrect concurrent coordinate reader in z direction!")
+        
+        self.assertEqual(numpy.absolute(rho - rho_w).max(), 0., "Incorrect concurrent data reader for rho!")
+        self.assertEqual(numpy.absolute(u   - u_w  ).max(), 0., "Incorrect concurrent data reader for u!")
+        self.assertEqual(numpy.absolute(p   - p_w  ).max(), 0., "Incorrect concurrent data reader for p!")
+    
+    
+    def testReadBinaryCache(self):
+        
+        x, y, z = self.reader.readCoordinates()
+        rho, u, p = self.reader.readData(('rho','u','p'))
+        
+        # Convert a copy of the data to the binary cache since the cache is written next to the ASCII files.
+        
+        temp_directory_name = tempfile.mkdtemp()
+        
+        try:
+            for filename in glob.glob(self.filename_prefix + '*.dat'):
+                shutil.copy2(filename, temp_directory_name)
+            
+            filename_prefix = os.path.join(temp_directory_name, 'WCHR_')
+            
+            war.WchrAsciiReader(filename_prefix).writeBinaryCache()
+            
+            self.assertEqual(len(glob.glob(filename_prefix + '*.npy')), len(glob.glob(filename_prefix + '*.dat')), \
+                "Binary cache not written for all files!")
+            
+            # Read in the data from the binary cache.
+            
+            reader = war.WchrAsciiReader(filename_prefix)
+            reader.sub_domain = self.lo, self.hi
+            reader.step = 0
+            
+            x_b, y_b, z_b = reader.readCoordinates()
+            rho_b, u_b, p_b = reader.readData(('rho','u','p'))
+        
+        finally:
+            shutil.rmtree(temp_directory_name)
+        
+        self.assertEqual(numpy.absolute(x - x_b).max(), 0., "Incorrect coordinates in x direction from binary cache!")
+        self.assertEqual(numpy.absolute(y - y_b).max(), 0., "Incorrect coordinates in y direction from binary cache!")
+        self.assertEqual(numpy.absolute(z - z_b).max(), 0., "Incorrect coordinates in z direction from binary cache!")
+        
+        self.assertEqual(numpy.absolute(rho - rho_b).max(), 0., "Incorrect data for rho from binary cache!")
+        self.assertEqual(numpy.absolute(u   - u_b  ).max(), 0., "Incorrect data for u from binary cache!")
+        self.assertEqual(numpy.absolute(p   - p_b  ).max(), 0., "Incorrect data for p from binary cache!")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,64 @@
+import numpy
+import unittest
+
+from floatpy.utilities.rectilinear_coordinates import RectilinearCoordinates
+
+class TestRectilinearCoordinates(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.linspace(0.0, 1.0, 5)
+        self.y = numpy.linspace(-1.0, 1.0, 7)
+        self.z = numpy.array([0.0, 0.1, 0.3, 0.6])
+
+
+    def testUnpack(self):
+        """
+        Test that the unpacked coordinates are equal to the dense meshgrid without allocating memory.
+        """
+
+        coords = RectilinearCoordinates((self.x, self.y, self.z))
+
+        self.assertEqual(coords.shape, (5, 7, 4), "Incorrect shape of the coordinates!")
+        self.assertEqual(coords.dimension, 3, "Incorrect dimension of the coordinates!")
+
+        x_c, y_c, z_c = coords
+        x_m, y_m, z_m = numpy.meshgrid(self.x, self.y, self.z, indexing='ij')
+
+        self.assertTrue(numpy.array_equal(x_c, x_m), "Incorrect coordinates in x direction!")
+        self.assertTrue(numpy.array_equal(y_c, y_m), "Incorrect coordinates in y direction!")
+        self.assertTrue(numpy.array_equal(z_c, z_m), "Incorrect coordinates in z direction!")
+
+        self.assertEqual(x_c.strides[1], 0, "Coordinates in x direction are not broadcast lazily!")
+        self.assertFalse(x_c.flags['WRITEABLE'], "Broadcast coordinates should be read-only!")
+
+
+    def testToDense(self):
+        """
+        Test the dense arrays of the coordinates in both data orders.
+        """
+
+        x_m, y_m = numpy.meshgrid(self.x, self.y, indexing='ij')
+
+        for data_order, flag in (('F', 'F_CONTIGUOUS'), ('C', 'C_CONTIGUOUS')):
+            x_d, y_d = RectilinearCoordinates((self.x, self.y), data_order=data_order).toDense()
+
+            self.assertTrue(numpy.array_equal(x_d, x_m), "Incorrect dense coordinates in x direction!")
+            self.assertTrue(numpy.array_equal(y_d, y_m), "Incorrect dense coordinates in y direction!")
+            self.assertTrue(x_d.flags[flag] and x_d.flags['WRITEABLE'], "Incorrect order of dense coordinates!")
+
+
+    def testGridSpacing(self):
+        """
+        Test the grid spacing of uniform and non-uniform grids.
+        """
+
+        dx, dy = RectilinearCoordinates((self.x, self.y)).getGridSpacing()
+
+        self.assertAlmostEqual(dx, 0.25, msg="Incorrect grid spacing in x direction!")
+        self.assertAlmostEqual(dy, 1.0/3.0, msg="Incorrect grid spacing in y direction!")
+
+        self.assertRaises(RuntimeError, RectilinearCoordinates((self.x, self.z)).getGridSpacing)
+
+
+if __name__ == '__main__':
+    unittest.main()
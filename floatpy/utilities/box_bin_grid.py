@@ -0,0 +1,143 @@
+import numpy
+
+class BoxBinGrid(object):
+    """
+    Class to find the boxes intersecting with a query box with a uniform grid of bins. Each box is registered in
+    all the bins that it covers so that a query only needs to check the boxes in the bins covered by the query box.
+    The lower and upper indices of the boxes are inclusive.
+    """
+
+    def __init__(self, lo_boxes, hi_boxes, bin_size=None):
+        """
+        Constructor of the class.
+
+        lo_boxes : 2D numpy array of the lower indices of the boxes with shape (number of boxes, dimension)
+        hi_boxes : 2D numpy array of the upper indices of the boxes with shape (number of boxes, dimension)
+        bin_size : optional iterable of the bin size in each dimension. The median size of the boxes is used if it is
+                   not given
+        """
+
+        lo_boxes = numpy.asarray(lo_boxes, dtype=numpy.int64)
+        hi_boxes = numpy.asarray(hi_boxes, dtype=numpy.int64)
+
+        if lo_boxes.ndim != 2 or lo_boxes.shape != hi_boxes.shape:
+            raise RuntimeError('Shapes of the lower and upper indices of the boxes are invalid!')
+
+        if numpy.any(hi_boxes < lo_boxes):
+            raise RuntimeError('Upper indices of the boxes are smaller than the lower indices!')
+
+        self._lo_boxes = lo_boxes
+        self._hi_boxes = hi_boxes
+
+        num_boxes, dim = lo_boxes.shape
+
+        if num_boxes == 0:
+            self._lo_grid = numpy.zeros(dim, dtype=numpy.int64)
+            self._num_bins = numpy.zeros(dim, dtype=numpy.int64)
+            self._bin_size = numpy.ones(dim, dtype=numpy.int64)
+            self._bin_offsets = numpy.zeros(1, dtype=numpy.int64)
+            self._bin_boxes = numpy.zeros(0, dtype=numpy.int64)
+            return
+
+        # Get the bin size and the number of bins in each dimension.
+
+        if bin_size is None:
+            bin_size = numpy.median(hi_boxes - lo_boxes + 1, axis=0)
+
+        self._bin_size = numpy.maximum(numpy.asarray(bin_size, dtype=numpy.int64), 1)
+
+        self._lo_grid = lo_boxes.min(axis=0)
+        self._num_bins = (hi_boxes.max(axis=0) - self._lo_grid)//self._bin_size + 1
+
+        # Get the range of bins covered by each box.
+
+        lo_bins = (lo_boxes - self._lo_grid)//self._bin_size
+        hi_bins = (hi_boxes - self._lo_grid)//self._bin_size
+
+        num_bins_boxes = hi_bins - lo_bins + 1
+        num_entries = numpy.prod(num_bins_boxes, axis=1)
+
+        # Enumerate all (bin, box) pairs at once.
+
+        box_idx = numpy.repeat(numpy.arange(num_boxes), num_entries)
+        entry_idx = numpy.arange(num_entries.sum()) - numpy.repeat(numpy.cumsum(num_entries) - num_entries, num_entries)
+
+        bin_idx = numpy.zeros(box_idx.shape, dtype=numpy.int64)
+        for i in range(dim):
+            bin_idx = bin_idx*self._num_bins[i] + lo_bins[box_idx, i] + entry_idx % num_bins_boxes[box_idx, i]
+            entry_idx = entry_idx // num_bins_boxes[box_idx, i]
+
+        # Sort the boxes by bins and store the offsets of the bins.
+
+        sort_idx = numpy.argsort(bin_idx, kind='mergesort')
+
+        self._bin_boxes = box_idx[sort_idx]
+        self._bin_offsets = numpy.zeros(numpy.prod(self._num_bins) + 1, dtype=numpy.int64)
+        self._bin_offsets[1:] = numpy.cumsum(numpy.bincount(bin_idx, minlength=numpy.prod(self._num_bins)))
+
+
+    @property
+    def num_boxes(self):
+        """
+        Return the number of boxes.
+        """
+
+        return self._lo_boxes.shape[0]
+
+
+    @property
+    def bin_size(self):
+        """
+        Return the bin size in each dimension.
+        """
+
+        return tuple(self._bin_size)
+
+
+    def isSameBoxes(self, lo_boxes, hi_boxes):
+        """
+        Return True if the given boxes are the same as the boxes in the grid.
+        """
+
+        return numpy.array_equal(self._lo_boxes, lo_boxes) and numpy.array_equal(self._hi_boxes, hi_boxes)
+
+
+    def query(self, lo, hi):
+        """
+        Return the sorted indices of the boxes intersecting with a query box.
+
+        lo : iterable of the lower indices of the query box
+        hi : iterable of the upper indices of the query box
+        """
+
+        lo = numpy.asarray(lo, dtype=numpy.int64)
+        hi = numpy.asarray(hi, dtype=numpy.int64)
+
+        # Get the range of bins covered by the query box.
+
+        lo_bins = numpy.maximum((lo - self._lo_grid)//self._bin_size, 0)
+        hi_bins = numpy.minimum((hi - self._lo_grid)//self._bin_size, self._num_bins - 1)
+
+        if numpy.any(hi_bins < lo_bins) or numpy.any(hi < lo):
+            return numpy.zeros(0, dtype=numpy.int64)
+
+        # Gather the boxes in the bins.
+
+        bin_idx = numpy.zeros(1, dtype=numpy.int64)
+        for i in range(lo.shape[0]):
+            bin_idx = (bin_idx[:, numpy.newaxis]*self._num_bins[i] + \
+                       numpy.arange(lo_bins[i], hi_bins[i] + 1)[numpy.newaxis, :]).ravel()
+
+        starts = self._bin_offsets[bin_idx]
+        counts = self._bin_offsets[bin_idx + 1] - starts
+
+        entry_idx = numpy.arange(counts.sum()) + numpy.repeat(starts - (numpy.cumsum(counts) - counts), counts)
+
+        candidates = numpy.unique(self._bin_boxes[entry_idx])
+
+        # Keep only the boxes that really intersect with the query box.
+
+        intersect = numpy.all(numpy.logical_and(self._lo_boxes[candidates] <= hi, self._hi_boxes[candidates] >= lo), \
+                              axis=1)
+
+        return candidates[intersect]
@@ -0,0 +1,125 @@
+import numpy
+
+class RectilinearCoordinates(object):
+    """
+    Class to store the coordinates of a rectilinear grid lazily with the 1D axes of the grid. The coordinates in each
+    direction are broadcast to the shape of the grid on demand as read-only views without allocating memory. Dense
+    arrays of the coordinates are only created when toDense() is called.
+
+    The object can be unpacked like a tuple of the coordinates in each direction, e.g. x, y, z = coordinates.
+    """
+
+    def __init__(self, axes, data_order='F'):
+        """
+        Constructor of the class.
+
+        axes : iterable of 1D numpy arrays of the coordinates along each direction
+        data_order : string of the order of the dense arrays. Can be 'C' or 'F'
+        """
+
+        if len(axes) < 1 or len(axes) > 3:
+            raise ValueError("Number of dimensions should be between 1 and 3!")
+
+        if data_order != 'C' and \
+           data_order != 'F':
+            raise RuntimeError("Invalid data order! Data order can only be 'C' or 'F'.")
+
+        self._axes = tuple([numpy.asarray(axis).ravel() for axis in axes])
+        self._data_order = data_order
+
+
+    @property
+    def axes(self):
+        """
+        Return a tuple of the 1D coordinates along each direction.
+        """
+
+        return self._axes
+
+
+    @property
+    def dimension(self):
+        """
+        Return the dimension of the grid.
+        """
+
+        return len(self._axes)
+
+
+    @property
+    def shape(self):
+        """
+        Return the shape of the grid.
+        """
+
+        return tuple([axis.shape[0] for axis in self._axes])
+
+
+    @property
+    def data_order(self):
+        """
+        Return the order of the dense arrays.
+        """
+
+        return self._data_order
+
+
+    def __len__(self):
+        return len(self._axes)
+
+
+    def __getitem__(self, direction):
+        """
+        Return a read-only view of the coordinates in a direction broadcast to the shape of the grid.
+        """
+
+        return numpy.broadcast_to(self.getSparse(direction), self.shape)
+
+
+    def __iter__(self):
+        for direction in range(len(self._axes)):
+            yield self[direction]
+
+
+    def getSparse(self, direction):
+        """
+        Return the coordinates in a direction as an array that can be broadcast to the shape of the grid, with the
+        size of the axis in the given direction and size 1 in the other directions.
+        """
+
+        shape = [1]*len(self._axes)
+        shape[direction] = -1
+
+        return self._axes[direction].reshape(shape)
+
+
+    def getGridSpacing(self):
+        """
+        Return a tuple of the grid spacing in each direction. Only valid for uniform grids.
+        """
+
+        grid_spacing = []
+
+        for axis in self._axes:
+            if axis.shape[0] < 2:
+                grid_spacing.append(0.0)
+                continue
+
+            spacing = numpy.diff(axis)
+            if not numpy.allclose(spacing, spacing[0]):
+                raise RuntimeError('Grid spacing is not uniform!')
+
+            grid_spacing.append(spacing[0])
+
+        return tuple(grid_spacing)
+
+
+    def toDense(self):
+        """
+        Return a tuple of dense arrays of the coordinates in each direction in the data order.
+        """
+
+        if self._data_order == 'C':
+            return tuple([numpy.ascontiguousarray(coords) for coords in self])
+        else:
+            return tuple([numpy.asfortranarray(coords) for coords in self])
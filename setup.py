@@ -28,38 +28,51 @@ version = '1.0'
 # Build the fortran extension modules.
 obj_compact_6th_order = BuildFortranObjects(['floatpy/derivatives/compact/kind_parameters.F90',
                                              'floatpy/derivatives/compact/constants.F90',
-                                             'floatpy/derivatives/compact/cd06.F90'])
+                                             'floatpy/derivatives/compact/cd06.F90'], use_openmp=True)
 
 ext_compact_6th_order = Extension('_pycd06',
                                     sources = ['floatpy/derivatives/compact/f90wrap_cd06.f90'],
                                     extra_objects = obj_compact_6th_order,
+                                    extra_link_args = ['-fopenmp'],
                                     f2py_options = [])
 
 obj_compact_10th_order = BuildFortranObjects(['floatpy/derivatives/compact/kind_parameters.F90',
                                               'floatpy/derivatives/compact/constants.F90',
-                                              'floatpy/derivatives/compact/cd10.F90'])
+                                              'floatpy/derivatives/compact/cd10.F90'], use_openmp=True)
 
 ext_compact_10th_order = Extension('_pycd10',
                                      sources = ['floatpy/derivatives/compact/f90wrap_cd10.f90'],
                                      extra_objects = obj_compact_10th_order,
+                                     extra_link_args = ['-fopenmp'],
                                      f2py_options = [])
 
+obj_explicit_stencil = BuildFortranObjects(['floatpy/derivatives/explicit/kind_parameters.F90',
+                                            'floatpy/derivatives/explicit/explicit_stencil.F90'], use_openmp=True)
+
+ext_explicit_stencil = Extension('_pyexplicit_stencil',
+                                 sources = ['floatpy/derivatives/explicit/f90wrap_explicit_stencil.f90'],
+                                 extra_objects = obj_explicit_stencil,
+                                 extra_link_args = ['-fopenmp'],
+                                 f2py_options = [])
+
 obj_filter_cf90 = BuildFortranObjects(['floatpy/filters/kind_parameters.F90',
                                        'floatpy/filters/constants.F90',
-                                       'floatpy/filters/cf90.F90'])
+                                       'floatpy/filters/cf90.F90'], use_openmp=True)
 
 ext_filter_cf90 = Extension('_pycf90',
                               sources = ['floatpy/filters/f90wrap_cf90.f90'],
                               extra_objects = obj_filter_cf90,
+                              extra_link_args = ['-fopenmp'],
                               f2py_options = [])
 
 obj_filter_gaussian = BuildFortranObjects(['floatpy/filters/kind_parameters.F90',
                                            'floatpy/filters/constants.F90',
-                                           'floatpy/filters/gaussian.F90'])
+                                           'floatpy/filters/gaussian.F90'], use_openmp=True)
 
 ext_filter_gaussian = Extension('_pygaussian',
                                   sources = ['floatpy/filters/f90wrap_gaussian.f90'],
                                   extra_objects = obj_filter_gaussian,
+                                  extra_link_args = ['-fopenmp'],
                                   f2py_options = [])
 
 obj_pyt3d = BuildFortranObjects(['floatpy/parallel/pyt3d/kind_parameters.F90',
@@ -92,7 +105,7 @@ setup(name = 'FloATPy',
       description = 'Postprocessing utilities for codes in FPAL',
       author = 'Flow Physics and Aeroacoustics Laboratory of Stanford University',
       author_email = 'wongml@stanford.edu, akshays@stanford.edu',
-      ext_modules = [ext_compact_6th_order, ext_compact_10th_order,
+      ext_modules = [ext_compact_6th_order, ext_compact_10th_order, ext_explicit_stencil,
                      ext_filter_cf90, ext_filter_gaussian,
                      ext_pyt3d],
       packages = ['floatpy'] + modules,
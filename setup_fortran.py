@@ -3,9 +3,15 @@ import subprocess
 
 compiler_flags = '-Wall -Wconversion -Wextra -Waliasing -ffree-form -ffree-line-length-none -ffast-math -march=native -funroll-loops -fno-protect-parens'
 
-def BuildFortranObjects(sources, compiler='gfortran'):
+openmp_flags = '-fopenmp'
+
+def BuildFortranObjects(sources, compiler='gfortran', use_openmp=False):
     objects = []
     
+    flags = compiler_flags
+    if use_openmp:
+        flags = flags + ' ' + openmp_flags
+    
     for source in sources:
         path_dir, name = source.rsplit(os.path.sep, 1)
         
@@ -16,7 +22,7 @@ def BuildFortranObjects(sources, compiler='gfortran'):
         objects.append(os.path.relpath(path_object))
         
         command_compile_fortran_mod = (
-            compiler + ' -O3 -fPIC ' + compiler_flags + ' -J' + path_dir + ' '
+            compiler + ' -O3 -fPIC ' + flags + ' -J' + path_dir + ' '
             + source + ' -c -o ' + path_object)
         
         print(command_compile_fortran_mod)